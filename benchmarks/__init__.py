@@ -0,0 +1,13 @@
+"""
+Offline benchmarks for the fact-check functions and the crew pipeline.
+
+Run from the repository root with ``python -m benchmarks``.
+"""
+
+import os
+import sys
+
+# Make the package importable when the project is not installed
+_SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
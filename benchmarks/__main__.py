@@ -0,0 +1,155 @@
+"""
+Run the benchmark suite and compare against a baseline.
+
+    python -m benchmarks                      # micro + crew, default scale
+    python -m benchmarks --scale full         # up to 1M URLs and 1 MB articles
+    python -m benchmarks --only micro --output results.json
+    python -m benchmarks --baseline benchmarks/baseline.json --tolerance 0.25
+    python -m benchmarks --only startup       # CLI import time against its budget
+    python -m benchmarks --only service       # burst throughput of the report service
+    python -m benchmarks --only ratelimit     # recovery from 429s of a throttling stand-in
+    python -m benchmarks --only stream        # time to the report's first byte on disk
+    python -m benchmarks --only publish       # incremental HTML/PDF publishing of an archive
+
+Exits with status 1 when any benchmark is slower than the baseline by more
+than the tolerance, or when CLI start-up goes over its budget.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from . import micro, publish, startup
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Compare median timings by benchmark name.
+
+    Returns one entry per benchmark present in both runs, with the baseline
+    and current seconds, their ratio and a ``regression`` flag set when the
+    current run is slower by more than ``tolerance`` (0.2 = 20%).
+    """
+    previous = {entry["name"]: entry for entry in baseline.get("results", [])}
+    comparison = []
+    for entry in results["results"]:
+        before = previous.get(entry["name"])
+        if before is None or not before["seconds"]:
+            continue
+        ratio = entry["seconds"] / before["seconds"]
+        comparison.append({
+            "name": entry["name"],
+            "baseline_seconds": before["seconds"],
+            "seconds": entry["seconds"],
+            "ratio": ratio,
+            "regression": ratio > 1 + tolerance,
+        })
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Offline performance benchmarks")
+    parser.add_argument("--scale", choices=sorted(micro.SCALES), default="default")
+    parser.add_argument("--only", choices=("micro", "crew", "startup", "service", "ratelimit", "stream", "publish"), help="Run one group of benchmarks")
+    parser.add_argument("--crew-runs", type=int, default=3, help="Crew kickoffs to take the median of")
+    parser.add_argument("--output", help="Where to write the JSON results "
+                                         "(default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    entries: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+    if args.only in (None, "micro"):
+        for entry in micro.run_micro(args.scale):
+            print(f"{entry['name']:<50} {entry['seconds'] * 1000:>10.1f} ms")
+            entries.append(entry)
+    if args.only in (None, "startup"):
+        for entry in startup.run_startup():
+            status = ""
+            if "within_budget" in entry:
+                status = "ok" if entry["within_budget"] else f"OVER BUDGET ({entry['budget_seconds']:.1f} s)"
+            print(f"{entry['name']:<50} {entry['seconds'] * 1000:>10.1f} ms {status}")
+            entries.append(entry)
+    if args.only in (None, "crew"):
+        from .crew_e2e import run_crew_benchmark
+        entry = run_crew_benchmark(runs=args.crew_runs)
+        print(f"{entry['name']:<50} {entry['seconds'] * 1000:>10.1f} ms "
+              f"(overhead {entry['overhead_seconds'] * 1000:.0f} ms, {entry['llm_calls']} LLM calls)")
+        entries.append(entry)
+    if args.only == "service":
+        from .crew_e2e import run_service_benchmark
+        for entry in run_service_benchmark():
+            print(f"{entry['name']:<50} {entry['seconds'] * 1000:>10.1f} ms "
+                  f"({entry['jobs_per_minute']:.1f} jobs/min, {entry['failed']} failed)")
+            entries.append(entry)
+    if args.only == "ratelimit":
+        from .crew_e2e import run_rate_limit_benchmark
+        for entry in run_rate_limit_benchmark():
+            print(f"{entry['name']:<50} {entry['seconds'] * 1000:>10.1f} ms "
+                  f"({entry['server_429s']} 429s, {entry['retries']} retries, {entry['failed']} failed)")
+            entries.append(entry)
+    if args.only == "publish":
+        for entry in publish.run_publish():
+            print(f"{entry['name']:<50} {entry['seconds'] * 1000:>10.1f} ms "
+                  f"({entry['built']} built, {entry['failed']} failed)")
+            entries.append(entry)
+    if args.only == "stream":
+        from .crew_e2e import run_stream_benchmark
+        for entry in run_stream_benchmark():
+            print(f"{entry['name']:<50} {entry['seconds'] * 1000:>10.1f} ms "
+                  f"(report done after {entry['total_seconds'] * 1000:.0f} ms)")
+            entries.append(entry)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "scale": args.scale,
+            "total_seconds": time.perf_counter() - started,
+        },
+        "results": entries,
+    }
+
+    exit_code = 0
+    if any(entry.get("within_budget") is False for entry in entries):
+        exit_code = 1
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            comparison = compare(results, json.load(handle), args.tolerance)
+        results["comparison"] = comparison
+        print()
+        for item in comparison:
+            flag = "REGRESSION" if item["regression"] else ""
+            print(f"{item['name']:<50} {item['ratio']:>6.2f}x {flag}")
+        if any(item["regression"] for item in comparison):
+            exit_code = 1
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results",
+                                         f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2)
+    print(f"\nResults: {output}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Deterministic synthetic corpora for the benchmarks
+"""
+
+import itertools
+import random
+from typing import Dict, List
+
+from ai_news_agents.tools.domain_reputation import (
+    DEFAULT_HIGH_CREDIBILITY_DOMAINS,
+    DEFAULT_LOW_CREDIBILITY_INDICATORS,
+)
+
+
+_SYLLABLES = ("ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "qu", "ex", "an", "or", "el")
+
+_CUES = (
+    "according to", "shocking", "reported by", "experts say", "cover-up", "studies",
+    "on the other hand", "research", "bombshell", "however",
+)
+
+
+def vocabulary(size: int = 5000, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4))) for _ in range(size)]
+
+
+def synthetic_urls(count: int, hosts: int = 0, seed: int = 0) -> List[str]:
+    """
+    URLs spread over ``hosts`` hosts (default: one per 20 URLs): a quarter on
+    reputable domains, a tenth on hosts with low-credibility indicators and
+    the rest on unknown sites.
+    """
+    rng = random.Random(seed)
+    words = vocabulary(2000, seed)
+    hosts = hosts or max(count // 20, 1)
+    pool = []
+    for index in range(hosts):
+        roll = rng.random()
+        if roll < 0.25:
+            host = rng.choice(DEFAULT_HIGH_CREDIBILITY_DOMAINS)
+            host = host if rng.random() < 0.5 else f"{rng.choice(words)}.{host}"
+        elif roll < 0.35:
+            host = f"{rng.choice(words)}{rng.choice(DEFAULT_LOW_CREDIBILITY_INDICATORS).strip('.')}{index}.com"
+        else:
+            host = f"{rng.choice(words)}{index}.{rng.choice(('com', 'net', 'org', 'io', 'news'))}"
+        pool.append(host)
+    return [
+        f"https://{rng.choice(pool)}/{rng.choice(words)}/{rng.choice(words)}-{index}"
+        for index in range(count)
+    ]
+
+
+def synthetic_article(size: int, seed: int = 0) -> str:
+    """About ``size`` characters of paragraphs, with bias and attribution cues mixed in."""
+    rng = random.Random(seed)
+    words = vocabulary(5000, seed)
+    paragraphs = []
+    length = 0
+    while length < size:
+        sentence_count = rng.randint(3, 7)
+        sentences = []
+        for _ in range(sentence_count):
+            sentence = [rng.choice(words) for _ in range(rng.randint(8, 22))]
+            if rng.random() < 0.3:
+                sentence.insert(rng.randrange(len(sentence)), rng.choice(_CUES))
+            sentences.append(" ".join(sentence).capitalize() + ".")
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 1
+    return "\n".join(paragraphs)[:size]
+
+
+def syndicated_documents(count: int, stories: int = 0, seed: int = 0) -> List[dict]:
+    """
+    Scraped-page documents where about a third are lightly edited copies of
+    shared wire stories and another third quote one wire paragraph.
+    """
+    rng = random.Random(seed)
+    stories = stories or max(count // 8, 1)
+    wires = [synthetic_article(4000, seed * 1000 + index).split("\n") for index in range(stories)]
+    documents = []
+    for index in range(count):
+        kind = index % 3
+        if kind == 0:
+            paragraphs = list(rng.choice(wires))
+            paragraphs[0] += " Updated."
+        else:
+            paragraphs = synthetic_article(4000, seed * 1000 + stories + index).split("\n")
+            if kind == 1:
+                paragraphs.insert(1, rng.choice(rng.choice(wires)))
+        documents.append({"url": f"https://site{index}.example/story", "text": "\n".join(paragraphs),
+                          "score": rng.randint(30, 95)})
+    return documents
+
+
+def claim_corpus(sources: int, sentences: int = 60, seed: int = 0) -> Dict[str, str]:
+    """
+    Text per source URL, ``sentences`` sentences each, drawn from a Zipf-like
+    vocabulary as in real prose. About a quarter of the sentences restate a
+    shared fact (lightly edited) and a few restate one with another figure.
+    """
+    rng = random.Random(seed)
+    words = vocabulary(20_000, seed)
+    cumulative = list(itertools.accumulate(1.0 / rank ** 1.05 for rank in range(1, len(words) + 1)))
+
+    def sentence() -> List[str]:
+        return rng.choices(words, cum_weights=cumulative, k=rng.randint(10, 25))
+
+    facts = [sentence() + [str(rng.randint(2, 99)), "percent"] for _ in range(max(sources * sentences // 20, 1))]
+    texts = {}
+    for index in range(sources):
+        lines = []
+        for _ in range(sentences):
+            roll = rng.random()
+            if roll < 0.25:
+                sentence_words = list(rng.choice(facts))
+                sentence_words[rng.randrange(len(sentence_words) - 2)] = rng.choice(words)
+            elif roll < 0.28:
+                sentence_words = list(rng.choice(facts))
+                sentence_words[-2] = str(int(sentence_words[-2]) + rng.randint(1, 50))
+            else:
+                sentence_words = sentence()
+            lines.append(" ".join(sentence_words).capitalize() + ".")
+        texts[f"https://source{index}.example/story"] = " ".join(lines)
+    return texts
@@ -0,0 +1,421 @@
+"""
+End-to-end crew benchmark against local stand-ins for the LLM, Serper and
+the scraped websites, so only orchestration and local processing are timed
+"""
+
+import contextlib
+import io
+import json
+import os
+import re
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .corpus import synthetic_article
+
+
+QUERY = "AI LLMs news"
+
+_TOOL_NAME = re.compile(r"^Tool Name: (.+)$", re.MULTILINE)
+_ARTICLE_URL = re.compile(r"http://127\.0\.0\.1:\d+/article-\d+\.html")
+
+
+def _stub_reply(messages: List[Dict[str, Any]]) -> str:
+    """
+    Answer like a ReAct agent: call the agent's tool once, then give a final
+    answer built from the observation.
+    """
+    system = messages[0]["content"] if messages else ""
+    tools = _TOOL_NAME.findall(system)
+    rest = "\n".join(str(message.get("content") or "") for message in messages[1:])
+    observation = rest.rsplit("Observation:", 1)[1] if "Observation:" in rest else None
+
+    if "Search the internet with Serper" in tools:
+        if observation is None:
+            return ("Thought: I should search for the latest news\nAction: Search the internet with Serper\n"
+                    f"Action Input: {json.dumps({'search_query': QUERY})}")
+        urls = list(dict.fromkeys(_ARTICLE_URL.findall(observation)))
+        return "Thought: I now know the final answer\nFinal Answer: " + "\n".join(
+            f"{index}. {url}" for index, url in enumerate(urls, 1))
+
+    if "Read websites content" in tools:
+        if observation is None:
+            urls = sorted(set(_ARTICLE_URL.findall(rest)))
+            return ("Thought: I should read every approved source\nAction: Read websites content\n"
+                    f"Action Input: {json.dumps({'urls': urls})}")
+        return f"Thought: I now know the final answer\nFinal Answer: {observation.strip()}"
+
+    report = "\n\n".join(synthetic_article(1500, seed) for seed in range(5))
+    return f"Thought: I now know the final answer\nFinal Answer: # AI LLM News\n\n{report}"
+
+
+class _LLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    calls = 0
+    latency = 0.0
+    # Generation speed: replies are produced ``chunk_size`` characters per
+    # ``chunk_delay`` seconds, streamed as they are produced when the client
+    # asks for a stream (0 returns them at once)
+    chunk_size = 200
+    chunk_delay = 0.0
+    # Provider quota enforced like the real APIs, as a bucket of ``quota``
+    # requests refilled over ``quota_window`` seconds; requests beyond it get
+    # 429 with Retry-After (0 disables the quota)
+    quota = 0
+    quota_window = 60.0
+    rejected = 0
+    _level = 0.0
+    _updated = 0.0
+    _quota_lock = threading.Lock()
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        retry_after = self._over_quota()
+        if retry_after is not None:
+            payload = json.dumps({"error": {"message": "Rate limit reached", "type": "requests",
+                                            "code": "rate_limit_exceeded"}}).encode()
+            self.send_response(429)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Retry-After", f"{retry_after:.2f}")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        type(self).calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        reply = _stub_reply(body.get("messages", []))
+        usage = {"prompt_tokens": sum(len(str(m.get("content") or "")) // 4 for m in body.get("messages", [])),
+                 "completion_tokens": len(reply) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        pieces = [reply[start:start + self.chunk_size] for start in range(0, len(reply), self.chunk_size)]
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            chunks = [{"index": 0, "delta": {"content": piece}, "finish_reason": None} for piece in pieces]
+            chunks.append({"index": 0, "delta": {}, "finish_reason": "stop"})
+            for number, choice in enumerate(chunks):
+                chunk = {"id": "bench", "object": "chat.completion.chunk", "created": 0,
+                         "model": body["model"], "choices": [choice]}
+                if number == len(chunks) - 1:
+                    chunk["usage"] = usage
+                elif self.chunk_delay:
+                    time.sleep(self.chunk_delay)
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+            return
+        if self.chunk_delay:
+            time.sleep(self.chunk_delay * len(pieces))
+        payload = json.dumps({
+            "id": "bench", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": reply}, "finish_reason": "stop"}],
+            "usage": usage,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    @classmethod
+    def _over_quota(cls) -> Optional[float]:
+        if not cls.quota:
+            return None
+        with cls._quota_lock:
+            now = time.monotonic()
+            rate = cls.quota / cls.quota_window
+            cls._level = min(cls.quota, cls._level + (now - cls._updated) * rate)
+            cls._updated = now
+            if cls._level >= 1:
+                cls._level -= 1
+                return None
+            cls.rejected += 1
+            return (1 - cls._level) / rate
+
+    @classmethod
+    def reset_quota(cls, quota: int, window: float) -> None:
+        with cls._quota_lock:
+            cls.quota, cls.quota_window, cls.rejected = quota, window, 0
+            cls._level, cls._updated = float(quota), time.monotonic()
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    article_size = 20_000
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        match = re.match(r"/article-(\d+)\.html$", self.path)
+        if not match:
+            self.send_error(404)
+            return
+        text = synthetic_article(self.article_size, int(match.group(1)))
+        body = "".join(f"<p>{paragraph}</p>" for paragraph in text.split("\n"))
+        payload = f"<html><head><title>Article</title></head><body>{body}</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def _serve(handler: type) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@contextlib.contextmanager
+def _stand_ins(articles: int, article_size: int, llm_latency: float) -> Iterator[str]:
+    """Start the LLM and site stand-ins, point the crew at them and chdir into a scratch directory."""
+    _LLMHandler.latency = llm_latency
+    _SiteHandler.article_size = article_size
+    llm_server, site_server = _serve(_LLMHandler), _serve(_SiteHandler)
+    workdir = tempfile.mkdtemp(prefix="ai-news-bench-")
+    fixtures = os.path.join(workdir, "fixtures")
+    os.makedirs(fixtures)
+
+    site = f"http://127.0.0.1:{site_server.server_port}"
+    with open(os.path.join(fixtures, "ai-llms-news.json"), "w", encoding="utf-8") as handle:
+        json.dump({"organic": [
+            {"title": f"Article {index}", "link": f"{site}/article-{index}.html", "snippet": "", "position": index}
+            for index in range(articles)
+        ]}, handle)
+    reputation_list = os.path.join(workdir, "reputation.txt")
+    with open(reputation_list, "w", encoding="utf-8") as handle:
+        handle.write("127.0.0.1, high, established_media\n")
+
+    os.environ.update({
+        "OPENAI_API_KEY": "sk-benchmark",
+        "OPENAI_API_BASE": f"http://127.0.0.1:{llm_server.server_port}/v1",
+        "MODEL": "gpt-4o-mini",
+        "SERPER_API_KEY": "benchmark",
+        "AI_NEWS_SEARCH_MODE": "offline",
+        "AI_NEWS_SEARCH_FIXTURES": fixtures,
+        "AI_NEWS_LLM_CACHE": "passthrough",
+        "AI_NEWS_CACHE_DIR": os.path.join(workdir, "cache"),
+        "AI_NEWS_REPUTATION_LIST": reputation_list,
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "CREWAI_TRACING_ENABLED": "false",
+        "OTEL_SDK_DISABLED": "true",
+    })
+
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        yield workdir
+    finally:
+        os.chdir(previous)
+        llm_server.shutdown()
+        site_server.shutdown()
+
+
+def run_crew_benchmark(runs: int = 3, articles: int = 6, article_size: int = 20_000,
+                       llm_latency: float = 0.0) -> Dict[str, Any]:
+    """
+    Kick off the full crew ``runs`` times against the stand-ins.
+
+    The LLM replies after ``llm_latency`` seconds; with the default of zero
+    the measured time is crewAI orchestration plus this package's own work
+    (pre-scoring, fetching, deduplication, context compression).
+    """
+    timings: List[float] = []
+    summaries = []
+    with _stand_ins(articles, article_size, llm_latency):
+        from ai_news_agents.crew import AiNewsAgents
+        from ai_news_agents.tracing import disable_tracing, enable_tracing, summarize
+
+        for _ in range(runs):
+            calls_before = _LLMHandler.calls
+            enable_tracing()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                AiNewsAgents().crew().kickoff(inputs={"topic": "AI LLMs", "date": "2026-01-01"})
+            timings.append(time.perf_counter() - started)
+            summary = summarize(disable_tracing().spans)
+            summary["llm"]["stub_calls"] = _LLMHandler.calls - calls_before
+            summaries.append(summary)
+
+    last = summaries[-1]
+    seconds = statistics.median(timings)
+    llm_seconds = statistics.median(summary["llm"]["latency_ms"] / 1000 for summary in summaries)
+    return {
+        "name": f"crew_kickoff[{articles} articles x {article_size} chars]",
+        "seconds": seconds,
+        "best": min(timings),
+        "repeat": runs,
+        "items": 1,
+        "per_item_us": seconds * 1e6,
+        "first_run_seconds": timings[0],
+        "llm_seconds": llm_seconds,
+        "overhead_seconds": seconds - llm_seconds,
+        "llm_calls": last["llm"]["stub_calls"],
+        "bytes_scraped": last["bytes_scraped"],
+        "tasks_ms": {name: round(entry["total_ms"], 1) for name, entry in last["totals"].items()
+                     if entry["kind"] == "task"},
+    }
+
+
+def run_service_benchmark(jobs: int = 6, workers: Sequence[int] = (1, 3), articles: int = 6,
+                          article_size: int = 20_000, llm_latency: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Push a burst of ``jobs`` report requests through the report service with
+    each worker count in ``workers`` and time until the last one finishes.
+    Crews are warmed before the clock starts, as in a running service.
+    """
+    from ai_news_agents.service import ReportService
+
+    results = []
+    with _stand_ins(articles, article_size, llm_latency) as workdir:
+        for count in workers:
+            service = ReportService(workers=count, queue_size=jobs,
+                                    output_root=os.path.join(workdir, f"jobs-{count}")).start()
+            with contextlib.redirect_stdout(io.StringIO()):
+                while service.stats()["warm_workers"] < count:
+                    time.sleep(0.05)
+                started = time.perf_counter()
+                submitted = [service.submit("AI LLMs", date="2026-01-01") for _ in range(jobs)]
+                finished = [service.wait(job.id) for job in submitted]
+                seconds = time.perf_counter() - started
+                service.stop()
+            failed = [job.error for job in finished if job.status != "succeeded"]
+            results.append({
+                "name": f"service_burst[{jobs} jobs, {count} workers]",
+                "seconds": seconds,
+                "best": seconds,
+                "repeat": 1,
+                "items": jobs,
+                "per_item_us": seconds / jobs * 1e6,
+                "jobs_per_minute": jobs / seconds * 60,
+                "failed": len(failed),
+                "errors": failed[:3],
+            })
+    return results
+
+
+def run_rate_limit_benchmark(jobs: int = 3, quota: int = 5, quota_window: float = 5.0,
+                             llm_latency: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Run a burst of jobs, one worker each, against an LLM stand-in that allows
+    ``quota`` requests per ``quota_window`` seconds and answers 429 beyond
+    it: once with only the adaptive backoff, once with a requests-per-minute
+    budget at 90% of the quota. Every job should still succeed; the budget
+    should avoid most 429s.
+    """
+    from ai_news_agents.rate_limit import RATE_LIMITS_ENV, rate_limit_stats, reset_rate_limiters
+    from ai_news_agents.service import ReportService
+
+    results = []
+    with _stand_ins(6, 5_000, llm_latency) as workdir:
+        for label, budget in (("adaptive", ""), ("budget", f"openai={0.9 * quota * 60 / quota_window:g}rpm")):
+            os.environ[RATE_LIMITS_ENV] = budget
+            reset_rate_limiters()
+            _LLMHandler.reset_quota(0, quota_window)
+            service = ReportService(workers=jobs, queue_size=jobs,
+                                    output_root=os.path.join(workdir, f"jobs-{label}")).start()
+            with contextlib.redirect_stdout(io.StringIO()):
+                while service.stats()["warm_workers"] < jobs:
+                    time.sleep(0.05)
+                # The quota starts with the burst, so warming up is not throttled
+                _LLMHandler.reset_quota(quota, quota_window)
+                started = time.perf_counter()
+                submitted = [service.submit("AI LLMs", date="2026-01-01") for _ in range(jobs)]
+                finished = [service.wait(job.id) for job in submitted]
+                seconds = time.perf_counter() - started
+                service.stop()
+            limiter = rate_limit_stats().get("openai", {})
+            results.append({
+                "name": f"rate_limited_burst[{jobs} jobs, {quota}/{quota_window:g}s quota, {label}]",
+                "seconds": seconds,
+                "best": seconds,
+                "repeat": 1,
+                "items": jobs,
+                "per_item_us": seconds / jobs * 1e6,
+                "server_429s": _LLMHandler.rejected,
+                "throttled": limiter.get("throttled", 0),
+                "retries": limiter.get("retries", 0),
+                "failed": sum(job.status != "succeeded" for job in finished),
+                "errors": [job.error for job in finished if job.error][:3],
+            })
+        _LLMHandler.reset_quota(0, quota_window)
+        os.environ.pop(RATE_LIMITS_ENV, None)
+        reset_rate_limiters()
+    return results
+
+
+def run_stream_benchmark(chunk_delay: float = 0.05, articles: int = 4,
+                         article_size: int = 5_000) -> List[Dict[str, Any]]:
+    """
+    Time when the first bytes of the report reach the disk, with the report
+    written once at the end and with it streamed, against an LLM stand-in
+    that generates ``chunk_size`` characters every ``chunk_delay`` seconds.
+    """
+    from ai_news_agents.crew import AiNewsAgents
+    from ai_news_agents.report_stream import PARTIAL_SUFFIX
+    from ai_news_agents.service import _skip_trace_prompt
+
+    def kickoff(mode: str) -> Dict[str, Any]:
+        crew_instance = AiNewsAgents()
+        crew_instance.report_stream = mode
+        crew = crew_instance.crew()
+        report = crew.tasks[-1].output_file
+        done = threading.Event()
+        first_byte: List[float] = []
+
+        def watch() -> None:
+            while not done.is_set():
+                if any(os.path.exists(path) and os.path.getsize(path) for path in (report, report + PARTIAL_SUFFIX)):
+                    first_byte.append(time.perf_counter())
+                    return
+                time.sleep(0.005)
+
+        watcher = threading.Thread(target=watch, daemon=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            watcher.start()
+            crew.kickoff(inputs={"topic": "AI LLMs", "date": "2026-01-01"})
+            seconds = time.perf_counter() - started
+        done.set()
+        watcher.join()
+        with open(report, "r", encoding="utf-8") as handle:
+            size = len(handle.read())
+        partial_left = os.path.exists(report + PARTIAL_SUFFIX)
+        os.remove(report)
+        return {"first_byte": (first_byte[0] - started) if first_byte else seconds, "seconds": seconds,
+                "report_chars": size, "partial_left": partial_left}
+
+    results = []
+    with _stand_ins(articles, article_size, 0.0):
+        _skip_trace_prompt()
+        _LLMHandler.chunk_delay = chunk_delay
+        try:
+            kickoff("off")
+            for mode in ("off", "file"):
+                run = kickoff(mode)
+                results.append({
+                    "name": f"report_first_byte[stream={mode}]",
+                    "seconds": run["first_byte"],
+                    "best": run["first_byte"],
+                    "repeat": 1,
+                    "items": 1,
+                    "per_item_us": run["first_byte"] * 1e6,
+                    "total_seconds": run["seconds"],
+                    "report_chars": run["report_chars"],
+                    "partial_left": run["partial_left"],
+                })
+        finally:
+            _LLMHandler.chunk_delay = 0.0
+    return results
@@ -0,0 +1,145 @@
+"""
+Micro-benchmarks of the deterministic pipeline stages
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from ai_news_agents.context_budget import compress_sources
+from ai_news_agents.dedup import deduplicate_documents
+from ai_news_agents.tools.fact_check_cache import FactCheckCache
+from ai_news_agents.tools.fact_check_functions import (
+    _analyze_content_bias,
+    fact_check_source,
+    fact_check_sources,
+    validate_sources,
+)
+
+from .corpus import claim_corpus, synthetic_article, synthetic_urls, syndicated_documents
+
+
+# URL counts, article sizes (characters), document counts and claim source counts per scale
+SCALES: Dict[str, Dict[str, List[int]]] = {
+    "quick": {"urls": [1_000], "articles": [1_000, 100_000], "documents": [100], "claim_sources": [50]},
+    "default": {"urls": [1_000, 100_000], "articles": [1_000, 100_000, 1_000_000], "documents": [300],
+                "claim_sources": [50, 300]},
+    "full": {"urls": [1_000, 100_000, 1_000_000], "articles": [1_000, 100_000, 1_000_000], "documents": [300, 1_000],
+             "claim_sources": [50, 300, 500]},
+}
+
+
+def measure(function: Callable[[], Any], repeat: int = 3) -> Dict[str, float]:
+    """Run ``function`` ``repeat`` times and return the median and best wall time."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return {"seconds": statistics.median(timings), "best": min(timings), "repeat": repeat}
+
+
+def _result(name: str, timing: Dict[str, float], items: int, **extra: Any) -> Dict[str, Any]:
+    result = {"name": name, "items": items, **timing, **extra}
+    result["per_item_us"] = timing["seconds"] / items * 1e6 if items else 0.0
+    return result
+
+
+def _repeat_for(items: int) -> int:
+    return 1 if items >= 100_000 else 3
+
+
+def bench_fact_check_source(urls: List[str]) -> Dict[str, Any]:
+    def run():
+        for url in urls:
+            fact_check_source(url)
+    return _result(f"fact_check_source[{len(urls)} urls]", measure(run, _repeat_for(len(urls))), len(urls))
+
+
+def bench_fact_check_sources(urls: List[str]) -> Dict[str, Any]:
+    def run():
+        for _ in fact_check_sources((url, "") for url in urls):
+            pass
+    return _result(f"fact_check_sources[{len(urls)} urls]", measure(run, _repeat_for(len(urls))), len(urls))
+
+
+def bench_validate_sources(urls: List[str]) -> Dict[str, Any]:
+    timing = measure(lambda: validate_sources(urls, "AI LLMs"), _repeat_for(len(urls)))
+    return _result(f"validate_sources[{len(urls)} urls]", timing, len(urls))
+
+
+def bench_claim_consensus(sources: int, sentences: int = 60) -> Dict[str, Any]:
+    contents = claim_corpus(sources, sentences, seed=sources)
+    urls = list(contents)
+    results = []
+    timing = measure(lambda: results.append(validate_sources(urls, "AI LLMs", contents=contents)), 3)
+    return _result(f"validate_sources+claims[{sources}x{sentences} sentences]", timing, sources * sentences,
+                   labels=results[-1].get("claim_labels"))
+
+
+def bench_bias_analysis(article: str) -> Dict[str, Any]:
+    timing = measure(lambda: _analyze_content_bias(article), 1 if len(article) >= 1_000_000 else 3)
+    return _result(f"bias_analysis[{len(article)} chars]", timing, 1,
+                   mb_per_second=len(article) / 1e6 / timing["seconds"] if timing["seconds"] else 0.0)
+
+
+def bench_fact_check_content(article: str) -> Dict[str, Any]:
+    timing = measure(lambda: fact_check_source("https://www.reuters.com/technology/story", article),
+                     1 if len(article) >= 1_000_000 else 3)
+    return _result(f"fact_check_source+content[{len(article)} chars]", timing, 1)
+
+
+def bench_fact_check_cache(urls: List[str]) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        cache = FactCheckCache(os.path.join(directory, "bench.sqlite"), memory_entries=len(urls) // 4)
+        results = [fact_check_source(url) for url in urls]
+
+        def run():
+            for url, result in zip(urls, results):
+                if cache.get(url) is None:
+                    cache.put(url, "", result)
+        cold = measure(run, 1)
+        warm = measure(run, 3)
+        cache.close()
+    return _result(f"fact_check_cache[{len(urls)} urls]", warm, len(urls), cold_seconds=cold["seconds"])
+
+
+def bench_deduplicate(count: int) -> Dict[str, Any]:
+    documents = syndicated_documents(count)
+    canonical = []
+    timing = measure(lambda: canonical.append(deduplicate_documents(documents)), 3)
+    return _result(f"deduplicate_documents[{count} docs]", timing, count, canonical=len(canonical[-1]))
+
+
+def bench_compress(article_size: int, sources: int = 8) -> Dict[str, Any]:
+    text = "\n\n".join(
+        f"## Source: https://source{index}.example/story\n{synthetic_article(article_size, index)}"
+        for index in range(sources)
+    )
+    scores = {f"https://source{index}.example/story": 40 + index * 7 for index in range(sources)}
+    timing = measure(lambda: compress_sources(text, 6000, scores, "AI LLMs"), 3)
+    return _result(f"compress_sources[{sources}x{article_size} chars]", timing, sources)
+
+
+def run_micro(scale: str = "default") -> List[Dict[str, Any]]:
+    sizes = SCALES[scale]
+    results = []
+    for count in sizes["urls"]:
+        urls = synthetic_urls(count, seed=count)
+        if count <= 100_000:
+            results.append(bench_fact_check_source(urls))
+        results.append(bench_fact_check_sources(urls))
+        results.append(bench_validate_sources(urls))
+    results.append(bench_fact_check_cache(synthetic_urls(min(sizes["urls"][-1], 20_000), seed=7)))
+    for count in sizes["claim_sources"]:
+        results.append(bench_claim_consensus(count))
+    for size in sizes["articles"]:
+        article = synthetic_article(size, seed=size)
+        results.append(bench_bias_analysis(article))
+        results.append(bench_fact_check_content(article))
+    for count in sizes["documents"]:
+        results.append(bench_deduplicate(count))
+    results.append(bench_compress(20_000))
+    return results
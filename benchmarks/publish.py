@@ -0,0 +1,70 @@
+"""
+Publishing of a synthetic report archive: cold build, unchanged rebuild and
+a rebuild after one report changed
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from ai_news_agents.cache import JsonDiskCache
+from ai_news_agents.publish import publish
+
+from .corpus import synthetic_article
+
+
+def synthetic_report(size: int, seed: int) -> str:
+    """A report laid out like the writer agent's: headline, sections, credibility table."""
+    paragraphs = synthetic_article(size, seed).split("\n")
+    sections = ["Executive Summary", "Key Developments", "Industry Impact & Analysis", "Future Outlook & Trends"]
+    per_section = max(len(paragraphs) // len(sections), 1)
+    lines = [f"# Report {seed}: {paragraphs[0][:60]}", ""]
+    for index, section in enumerate(sections):
+        lines += [f"## {section}", ""]
+        lines += [f"{paragraph}\n" for paragraph in paragraphs[index * per_section:(index + 1) * per_section]]
+    lines += ["## Source Credibility Assessment", "", "| Source | Score | Reputation |", "|---|---|---|"]
+    lines += [f"| https://source-{seed}-{index}.example/ | {60 + index * 7}/100 | Medium |" for index in range(5)]
+    return "\n".join(lines) + "\n"
+
+
+def run_publish(reports: int = 200, report_size: int = 8_000, workers: Optional[int] = None,
+                formats: tuple = ("html",)) -> List[Dict[str, Any]]:
+    """
+    Publish ``reports`` synthetic reports three times: from scratch, again
+    with nothing changed, and after editing one report.
+    """
+    workdir = tempfile.mkdtemp(prefix="ai-news-publish-")
+    try:
+        news = os.path.join(workdir, "news")
+        os.makedirs(news)
+        for seed in range(reports):
+            with open(os.path.join(news, f"2026-01-01_topic-{seed}_news_report.md"), "w", encoding="utf-8") as handle:
+                handle.write(synthetic_report(report_size, seed))
+        manifest = JsonDiskCache("publish", root=os.path.join(workdir, "manifest"))
+
+        def timed(label: str) -> Dict[str, Any]:
+            started = time.perf_counter()
+            results = publish(news, formats=formats, workers=workers, manifest=manifest)
+            seconds = time.perf_counter() - started
+            return {
+                "name": f"publish[{label}, {reports} reports, {'+'.join(formats)}]",
+                "seconds": seconds,
+                "best": seconds,
+                "repeat": 1,
+                "items": reports,
+                "per_item_us": seconds / reports * 1e6,
+                "built": sum(result["status"] == "built" for result in results),
+                "failed": sum(result["status"] == "failed" for result in results),
+                "errors": sorted({result["error"] for result in results if result["error"]})[:3],
+            }
+
+        entries = [timed("cold")]
+        entries.append(timed("unchanged"))
+        with open(os.path.join(news, "2026-01-01_topic-0_news_report.md"), "a", encoding="utf-8") as handle:
+            handle.write("\nCorrection: one figure was updated.\n")
+        entries.append(timed("one changed"))
+        return entries
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
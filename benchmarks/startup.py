@@ -0,0 +1,51 @@
+"""
+CLI start-up time, measured in fresh interpreters so nothing is pre-imported
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+# Seconds a bare ``python -m ai_news_agents.main`` may take. Importing
+# crewAI alone takes several seconds, so going over this means a heavy
+# import has crept back onto the start-up path.
+STARTUP_BUDGET = 1.5
+
+_SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def _time_command(args: List[str], repeat: int) -> List[float]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_SRC, env.get("PYTHONPATH")]))
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *args], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run_startup(repeat: int = 3, budget: float = STARTUP_BUDGET) -> List[Dict[str, Any]]:
+    """
+    Time the interpreter alone, ``import ai_news_agents.main`` and the bare
+    CLI invocation (which prints its usage), and check the last two against
+    ``budget`` seconds.
+    """
+    commands = [
+        ("startup[python]", ["-c", "pass"], False),
+        ("startup[import ai_news_agents.main]", ["-c", "import ai_news_agents.main"], True),
+        ("startup[ai_news_agents.main usage]", ["-m", "ai_news_agents.main"], True),
+    ]
+    results = []
+    for name, args, budgeted in commands:
+        timings = _time_command(args, repeat)
+        seconds = statistics.median(timings)
+        entry = {"name": name, "seconds": seconds, "best": min(timings), "repeat": repeat, "items": 1,
+                 "per_item_us": seconds * 1e6}
+        if budgeted:
+            entry.update(budget_seconds=budget, within_budget=seconds <= budget)
+        results.append(entry)
+    return results
@@ -0,0 +1,86 @@
+"""
+Multi-topic batch runs: one report per topic from concurrently running crews
+"""
+
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from .cache import cache_dir
+from .fetcher import get_fetcher
+from .service import ReportService
+
+
+BATCH_CONCURRENCY_ENV = "AI_NEWS_BATCH_CONCURRENCY"
+
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Pages fetched earlier in a batch are reused without revalidation for this
+# long, so topics that share sources fetch each page once per cycle
+BATCH_PAGE_MAX_AGE = 3600.0
+
+
+def topic_slug(topic: str) -> str:
+    """Lowercase, dash-separated file name fragment for a topic."""
+    return re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-") or "topic"
+
+
+def load_topics(source: str) -> List[str]:
+    """
+    Read topics from a file (one per line, ``#`` starts a comment) or, when
+    ``source`` is not a file, from a comma-separated list.
+    """
+    if os.path.isfile(source):
+        with open(source, "r", encoding="utf-8") as handle:
+            lines = [line.split("#", 1)[0] for line in handle]
+    else:
+        lines = source.split(",")
+    return list(dict.fromkeys(line.strip() for line in lines if line.strip()))
+
+
+def report_path(topic: str, date: str, output_dir: str = "news") -> str:
+    return os.path.join(output_dir, f"{date}_{topic_slug(topic)}_news_report.md")
+
+
+def run_batch(topics: Iterable[str], concurrency: Optional[int] = None, date: Optional[str] = None,
+              output_dir: str = "news", page_max_age: float = BATCH_PAGE_MAX_AGE) -> List[Dict[str, Any]]:
+    """
+    Write a report for every topic, running up to ``concurrency`` crews at once.
+
+    Crews run on a :class:`ReportService` worker pool, so the search, page,
+    LLM and fact-check caches are shared: a source that turns up under
+    several topics is fetched and scored once. Each report is written to
+    ``<output_dir>/<date>_<topic-slug>_news_report.md``.
+
+    Returns one summary per topic, in input order, with ``topic``,
+    ``status``, ``seconds``, ``report_file`` and ``error``.
+    """
+    topics = list(dict.fromkeys(topics))
+    concurrency = concurrency or int(os.getenv(BATCH_CONCURRENCY_ENV, DEFAULT_BATCH_CONCURRENCY))
+    date = date or datetime.now().strftime("%Y-%m-%d")
+
+    # The fetcher is shared by the whole process: only this batch reuses
+    # pages without revalidation
+    fetcher = get_fetcher()
+    max_age = fetcher.max_age
+    fetcher.max_age = max(max_age, page_max_age)
+    try:
+        service = ReportService(workers=min(concurrency, len(topics)) or 1, queue_size=len(topics) or 1,
+                                output_root=cache_dir("batch", date)).start()
+        try:
+            jobs = [service.submit(topic, date=date, report_file=report_path(topic, date, output_dir))
+                    for topic in topics]
+            finished = [service.wait(job.id) for job in jobs]
+        finally:
+            service.stop()
+    finally:
+        fetcher.max_age = max_age
+
+    return [{
+        "topic": topic,
+        "status": job.status,
+        "seconds": round(job.finished_at - job.started_at, 3) if job.started_at else None,
+        "report_file": job.report_file if job.status == "succeeded" and os.path.exists(job.report_file) else None,
+        "error": job.error,
+    } for topic, job in zip(topics, finished)]
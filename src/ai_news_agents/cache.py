@@ -0,0 +1,156 @@
+"""
+Shared helpers for the on-disk caches used by the crew
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Optional, Union
+
+
+CACHE_DIR_ENV = "AI_NEWS_CACHE_DIR"
+
+DEFAULT_CACHE_DIR = ".cache"
+
+# Writes between two trims of a bounded JsonDiskCache
+TRIM_EVERY = 200
+
+
+def cache_dir(*parts: str) -> str:
+    """
+    Return a path inside the cache directory, creating its parent folder.
+
+    The cache lives in ``AI_NEWS_CACHE_DIR`` or ``.cache`` under the working
+    directory, next to the ``news/`` output folder.
+    """
+    path = os.path.join(os.getenv(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path) if parts else path, exist_ok=True)
+    return path
+
+
+def write_atomic(path: str, data: Union[str, bytes]) -> None:
+    """Write ``data`` to ``path`` through a temporary file and an atomic rename."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data.encode("utf-8") if isinstance(data, str) else data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def cache_key(*parts: Any) -> str:
+    """Return a stable hex key for JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JsonDiskCache:
+    """
+    Directory of JSON entries, one file per key.
+
+    Writes go through a temporary file and an atomic rename, so concurrent
+    readers never see a partial entry. Entries older than ``ttl`` seconds are
+    treated as missing unless ``allow_stale`` is passed to :meth:`get`.
+
+    With ``max_age`` or ``max_entries`` set the directory is bounded: on the
+    first write and every ``TRIM_EVERY`` writes after it, entries written
+    more than ``max_age`` seconds ago are deleted, then the oldest entries
+    beyond ``max_entries``.
+    """
+
+    def __init__(self, namespace: str, ttl: Optional[float] = None, root: Optional[str] = None,
+                 max_age: Optional[float] = None, max_entries: Optional[int] = None):
+        self.root = root or os.path.join(cache_dir(), namespace)
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._writes_until_trim = 1
+        self._trim_lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Return the stored value for a key, or None if missing or expired."""
+        try:
+            with open(self.path(key), "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if not allow_stale and self.ttl is not None and time.time() - entry["stored_at"] > self.ttl:
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"stored_at": time.time(), "value": value}, handle)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        if self.max_age is not None or self.max_entries is not None:
+            with self._trim_lock:
+                self._writes_until_trim -= 1
+                due = self._writes_until_trim <= 0
+                if due:
+                    self._writes_until_trim = TRIM_EVERY
+            if due:
+                self.trim()
+
+    def trim(self) -> int:
+        """Delete expired entries and the oldest ones beyond ``max_entries``; returns how many went."""
+        entries = []
+        try:
+            shards = [entry.path for entry in os.scandir(self.root) if entry.is_dir()]
+        except OSError:
+            return 0
+        for shard in shards:
+            try:
+                with os.scandir(shard) as files:
+                    for entry in files:
+                        if entry.name.endswith(".json"):
+                            try:
+                                entries.append((entry.stat().st_mtime, entry.path))
+                            except OSError:
+                                pass
+            except OSError:
+                continue
+        entries.sort()
+        cutoff = time.time() - self.max_age if self.max_age is not None else float("-inf")
+        expired = sum(1 for written, _ in entries if written < cutoff)
+        overflow = len(entries) - expired - self.max_entries if self.max_entries is not None else 0
+        removed = 0
+        for _, path in entries[:expired + max(overflow, 0)]:
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self.path(key))
+        except OSError:
+            pass
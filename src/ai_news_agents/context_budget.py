@@ -0,0 +1,257 @@
+"""
+Token budgeting for the context handed to the report writer
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .tracing import span
+
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_BUDGET_ENV = "AI_NEWS_CONTEXT_BUDGET"
+
+# Tokens the writer's context (all upstream task outputs) may use in total
+DEFAULT_CONTEXT_BUDGET = 12000
+
+# Share of the budget scraped content keeps even when upstream outputs are large
+MIN_SCRAPE_SHARE = 0.25
+
+# Passages longer than this are split on sentence boundaries
+MAX_PASSAGE_TOKENS = 160
+
+# Passages with fewer words are usually navigation or captions
+MIN_PASSAGE_WORDS = 6
+
+# Credibility assumed for sources without a pre-score
+DEFAULT_SOURCE_SCORE = 50
+
+_SOURCE_HEADER = re.compile(r"^## Source: (\S+)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+_WORD = re.compile(r"\w+")
+
+_encoding: Any = None
+_encoding_lock = threading.Lock()
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens with tiktoken's ``cl100k_base`` encoding. When tiktoken or
+    its encoding file is unavailable (e.g. offline), fall back to the usual
+    estimate of four characters per token.
+    """
+    global _encoding
+    if not text:
+        return 0
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+
+def context_budget() -> int:
+    """The configured writer context budget, from ``AI_NEWS_CONTEXT_BUDGET``."""
+    return int(os.getenv(CONTEXT_BUDGET_ENV, DEFAULT_CONTEXT_BUDGET))
+
+
+def split_sources(text: str) -> List[Tuple[Optional[str], List[str], List[str]]]:
+    """
+    Split scraped content into ``(url, header_lines, passages)`` per source.
+
+    Sections start at ``## Source: <url>`` lines; the header keeps that line
+    and an "Also reported by" line. Text before the first header forms a
+    section with url None. Overlong passages are split into sentence groups.
+    """
+    sections: List[Tuple[Optional[str], List[str], List[str]]] = []
+    url, header, passages = None, [], []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        match = _SOURCE_HEADER.match(line)
+        if match:
+            if header or passages:
+                sections.append((url, header, passages))
+            url, header, passages = match.group(1), [line], []
+        elif line.startswith("Also reported by:") and header and not passages:
+            header.append(line)
+        elif line:
+            passages.extend(_chunk(line))
+    if header or passages:
+        sections.append((url, header, passages))
+    return sections
+
+
+def _chunk(line: str) -> List[str]:
+    if count_tokens(line) <= MAX_PASSAGE_TOKENS:
+        return [line]
+    chunks: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(line):
+        candidate = f"{current} {sentence}".strip()
+        if current and count_tokens(candidate) > MAX_PASSAGE_TOKENS:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _passage_value(passage: str, position: int, topic_terms: set) -> float:
+    words = [word.lower() for word in _WORD.findall(passage)]
+    if len(words) < MIN_PASSAGE_WORDS:
+        return 0.1
+    topic_hits = sum(1 for word in words if word in topic_terms)
+    numbers = sum(1 for word in words if word.isdigit())
+    quoted = 1 if '"' in passage or "“" in passage else 0
+    # Leads carry the news; later paragraphs gradually matter less
+    lead = 1.0 / (1.0 + 0.15 * position)
+    return lead * (1.0 + 0.5 * topic_hits + 0.2 * min(numbers, 5) + 0.5 * quoted)
+
+
+def compress_sources(text: str, budget: int, scores: Optional[Dict[str, float]] = None,
+                     topic: str = "") -> Tuple[str, Dict[str, Any]]:
+    """
+    Extractively shrink scraped content to at most ``budget`` tokens.
+
+    Every source keeps its header. The remaining budget is shared between
+    sources in proportion to their credibility score, and each source fills
+    its share with its highest-value passages (topic terms, figures, quotes
+    and lead paragraphs score higher). Budget a source cannot use is handed
+    to the best remaining passages of any source. Kept passages stay in
+    their original order.
+
+    Args:
+        text (str): Scraped content with ``## Source: <url>`` sections
+        budget (int): Maximum number of tokens of the result
+        scores (Dict[str, float]): Credibility score (0-100) per source URL
+        topic (str): Topic of the run, used to rank passages
+
+    Returns:
+        The compressed text and a usage dict with ``budget``,
+        ``input_tokens``, ``output_tokens`` and per-source ``sources``
+    """
+    scores = scores or {}
+    input_tokens = count_tokens(text)
+    usage: Dict[str, Any] = {"budget": budget, "input_tokens": input_tokens,
+                             "output_tokens": input_tokens, "sources": []}
+    if input_tokens <= budget:
+        return text, usage
+
+    topic_terms = {word.lower() for word in _WORD.findall(topic) if len(word) > 2}
+    sections = split_sources(text)
+
+    # Headers are always kept. Every kept passage also costs the line break
+    # before it, and blocks are separated by a blank line.
+    remaining = budget - sum(count_tokens("\n".join(header)) for _, header, _ in sections) - len(sections) + 1
+
+    candidates = []
+    weights = []
+    for index, (url, _, passages) in enumerate(sections):
+        weight = max(scores.get(url, DEFAULT_SOURCE_SCORE) if url else DEFAULT_SOURCE_SCORE, 1) / 100.0
+        weights.append(weight)
+        for position, passage in enumerate(passages):
+            value = weight * _passage_value(passage, position, topic_terms)
+            candidates.append((value, index, position, count_tokens(passage) + 1))
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1], candidate[2]))
+
+    total_weight = sum(weights) or 1.0
+    shares = [max(remaining, 0) * weight / total_weight for weight in weights]
+    kept: List[set] = [set() for _ in sections]
+    used = 0
+
+    # First pass: each source fills its credibility-weighted share
+    for value, index, position, tokens in candidates:
+        if tokens <= shares[index] and used + tokens <= remaining:
+            kept[index].add(position)
+            shares[index] -= tokens
+            used += tokens
+
+    # Second pass: leftover budget goes to the best passages anywhere
+    for value, index, position, tokens in candidates:
+        if position not in kept[index] and used + tokens <= remaining:
+            kept[index].add(position)
+            used += tokens
+
+    def assemble() -> str:
+        return "\n\n".join(
+            "\n".join(list(header) + [passage for position, passage in enumerate(passages)
+                                      if position in kept[index]])
+            for index, (url, header, passages) in enumerate(sections))
+
+    # Tokens of the joined text can still differ slightly from the sum of
+    # the parts: drop the least valuable passages until it fits
+    compressed = assemble()
+    output_tokens = count_tokens(compressed)
+    for value, index, position, tokens in reversed(candidates):
+        if output_tokens <= budget:
+            break
+        if position in kept[index]:
+            kept[index].discard(position)
+            compressed = assemble()
+            output_tokens = count_tokens(compressed)
+
+    for index, (url, header, passages) in enumerate(sections):
+        usage["sources"].append({
+            "url": url,
+            "passages": len(passages),
+            "kept": len(kept[index]),
+        })
+    usage["output_tokens"] = output_tokens
+    return compressed, usage
+
+
+class ContextBudget:
+    """
+    Tracks how much of the writer's context budget each upstream task uses.
+
+    ``record`` is called with every finished task output; ``fit`` compresses
+    scraped content into whatever the earlier outputs left over.
+    """
+
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = budget if budget is not None else context_budget()
+        self.usage: Dict[str, Dict[str, Any]] = {}
+
+    def reset(self) -> None:
+        self.usage = {}
+
+    @property
+    def used(self) -> int:
+        return sum(entry["tokens"] for entry in self.usage.values())
+
+    def record(self, task_name: str, text: str) -> int:
+        tokens = count_tokens(text)
+        entry = self.usage.setdefault(task_name, {})
+        if entry.get("tokens") == tokens:
+            return tokens
+        entry["tokens"] = tokens
+        logger.info("Context budget: %s uses %d tokens (%d of %d in total)",
+                    task_name, tokens, self.used, self.budget)
+        return tokens
+
+    def fit(self, task_name: str, text: str, scores: Optional[Dict[str, float]] = None,
+            topic: str = "") -> str:
+        """Compress ``text`` to the budget left by the other tasks and record it."""
+        others = sum(entry["tokens"] for name, entry in self.usage.items() if name != task_name)
+        available = max(self.budget - others, int(self.budget * MIN_SCRAPE_SHARE))
+        with span("context.compress", task=task_name, allowed=available) as current:
+            compressed, usage = compress_sources(text, available, scores, topic)
+            current.set(input_tokens=usage["input_tokens"], output_tokens=usage["output_tokens"])
+        if usage["output_tokens"] < usage["input_tokens"]:
+            logger.info("Context budget: compressed %s from %d to %d tokens (allowed %d)",
+                        task_name, usage["input_tokens"], usage["output_tokens"], available)
+        self.record(task_name, compressed)
+        self.usage[task_name].update(input_tokens=usage["input_tokens"], allowed=available)
+        return compressed
@@ -1,7 +1,23 @@
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, after_kickoff, agent, before_kickoff, crew, task
+from crewai.tasks.conditional_task import ConditionalTask
+from crewai.tasks.task_output import TaskOutput
 from dotenv import load_dotenv
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool, FileWriterTool
+
+from .context_budget import ContextBudget
+from .fetcher import get_fetcher, html_to_text
+from .llm_cache import build_llm
+from .report_stream import STREAM_ENV, ReportTask, install_stream_listeners
+from .seen_index import get_seen_index, incremental_from_env, text_digest
+from .tracing import event, span
+from .tools.fact_check_cache import get_fact_check_cache, normalize_url
+from .tools.lazy import lazy_file_writer_tool, lazy_search_tool
+from .tools.prescore import extract_urls, format_verdict, needs_llm_review, prescore_sources
+from .tools.scrape_tool import BatchScrapeTool
 
 load_dotenv()
 
@@ -9,13 +25,69 @@ load_dotenv()
 class AiNewsAgents():
     """AiNewsAgents crew"""
 
+    # Inputs of the current kickoff
+    inputs: Dict[str, Any] = {}
+
+    # Deterministic verdict on the news agent's sources, set once
+    # generate_news_task finishes
+    prescore_verdict: Optional[Dict[str, Any]] = None
+
+    # Token usage of the outputs that make up the report writer's context
+    context_budget: Optional[ContextBudget] = None
+
+    # Incremental mode: sources whose content already went into a report are
+    # dropped before fact-checking, and the run stops early when nothing is
+    # new. None follows AI_NEWS_INCREMENTAL, read at each kickoff;
+    # incremental_run is the mode of the current kickoff.
+    incremental: Optional[bool] = None
+    incremental_run: bool = False
+
+    # Raw output of webscraping_task in the current kickoff
+    scraped_output: str = ""
+
+    # Content digest per source URL fetched for the incremental check
+    source_digests: Dict[str, str] = {}
+
+    # Fact-check cache counters at kickoff, to trace this run's hit rate
+    fact_check_stats: Dict[str, int] = {}
+
+    # Streaming mode of the final report (off, file or stdout, see
+    # report_stream) and an optional callback receiving each streamed chunk
+    report_stream: str = "off"
+    report_stream_callback: Optional[Callable[[str], None]] = None
+
+    def __init__(self) -> None:
+        # The report task is built with the crew, so the streaming mode is
+        # read from the environment when the instance is created
+        self.report_stream = os.getenv(STREAM_ENV, "off").lower() or "off"
+
+    @before_kickoff
+    def remember_inputs(self, inputs: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        self.inputs = dict(inputs or {})
+        self.incremental_run = incremental_from_env() if self.incremental is None else self.incremental
+        self.scraped_output = ""
+        self.prescore_verdict = None
+        self.context_budget = ContextBudget()
+        self.source_digests = {}
+        self.fact_check_stats = dict(get_fact_check_cache().stats)
+        return inputs
+
+    @after_kickoff
+    def trace_cache_usage(self, output: Any) -> Any:
+        stats = get_fact_check_cache().stats
+        hits = sum(stats[name] - self.fact_check_stats.get(name, 0) for name in ("memory_hits", "disk_hits"))
+        misses = stats["misses"] - self.fact_check_stats.get("misses", 0)
+        event("crew.caches", cache_stats={"fact_check": {"hits": hits, "lookups": hits + misses}})
+        return output
+
     @agent
     def news_agent(self) -> Agent:
         return Agent(
             role='{topic} News Retriever',
             goal='Uncover cutting-edge developments in {topic}',
             backstory="You're a seasoned researcher with a knack for uncovering the latest developments in {topic}. Known for your ability to find the most relevant information and present it in a clear and concise manner.",
-            tools=[SerperDevTool()],
+            tools=[lazy_search_tool()],
+            llm=build_llm(),
             verbose=True
         )
 
@@ -25,7 +97,8 @@ class AiNewsAgents():
             role='News Website Scraper',
             goal='Scrape the website for latest news and information',
             backstory="You're a skilled scraper with a knack for extracting the latest developments in {topic}. Known for your ability to find the most relevant information and present it in a clear and concise manner.",
-            tools=[ScrapeWebsiteTool()],
+            tools=[BatchScrapeTool()],
+            llm=build_llm(),
             verbose=True
         )
     
@@ -41,6 +114,7 @@ class AiNewsAgents():
                 "You analyze domain reputation, check for bias indicators, and provide credibility scores for sources."
             ),
             tools=[],  # Using agent reasoning instead of external tools
+            llm=build_llm(),
             verbose=True
         )
     
@@ -58,24 +132,29 @@ class AiNewsAgents():
                 "are ready for immediate publication, sharing on social media, or distribution to stakeholders "
                 "without any additional editing required."
             ),
-            tools=[FileWriterTool()],
+            tools=[lazy_file_writer_tool()],
+            llm=build_llm(),
             verbose=True
         )
 
     @task
     def generate_news_task(self) -> Task:
         return Task(
-            description='Generate news about AI LLMs.',
+            description='Generate news about {topic}.',
             expected_output='A list with 4 websites of the most relevant information about {topic}',
-            agent=self.news_agent()
+            agent=self.news_agent(),
+            guardrail=self._prescore_news_sources
         )
 
     @task
     def fact_checking_task(self) -> Task:
-        return Task(
+        # Only runs when the pre-scored verdict has sources in the ambiguous band
+        return ConditionalTask(
+            condition=self._needs_fact_check_review,
             description=(
-                'Verify the credibility and reliability of sources found by the news agent. '
-                'For each source URL, analyze:\n'
+                'The news agent\'s sources have already been scored deterministically; the verdict is the '
+                'PRE-SCORED SOURCE VERDICT block in your context. Verify the credibility and reliability of '
+                'the sources whose decision is "review" only. For each of those source URLs, analyze:\n'
                 '1. Domain reputation (check if from reputable sources like Reuters, BBC, AP, NYT, etc.)\n'
                 '2. Source type (established media, academic, government, blog, etc.)\n'
                 '3. Potential bias indicators\n'
@@ -93,26 +172,42 @@ class AiNewsAgents():
                 '- Final list of approved sources for scraping\n'
                 '- Summary of fact-checking methodology used'
             ),
-            agent=self.fact_checker_agent()
+            agent=self.fact_checker_agent(),
+            context=[self.generate_news_task()]
         )
 
     @task
     def webscraping_task(self) -> Task:
-        return Task(
+        # Skipped in incremental mode when no source is new or changed
+        return ConditionalTask(
+            condition=self._has_new_sources,
             description=(
-                'Scrape only the verified and credible websites approved by the fact-checking agent. '
+                'Scrape only the verified and credible websites: sources marked "approved" in the '
+                'PRE-SCORED SOURCE VERDICT, plus any "review" sources the fact-checking agent approved. '
                 'Focus on sources with high credibility scores and avoid those flagged as unreliable. '
+                'Skip sources listed as "unchanged": an earlier report already covered them. '
+                'Read all of the chosen websites with a single tool call that lists every URL. '
                 'Extract comprehensive information while maintaining awareness of any bias indicators noted in the fact-check report.'
             ),
             expected_output='Fully scraped content from verified sources with credibility context and bias awareness',
             agent=self.webscrapper_agent(),
-            context=[self.fact_checking_task()],  # Depends on fact-checking results
+            context=[self.generate_news_task(), self.fact_checking_task()],  # Depends on fact-checking results
+            guardrail=self._fit_scraped_content,
             output_file='report.md'
         )
     
     @task
     def filegenerate_task(self) -> Task:
-        return Task(
+        writer = self.filegenerate_analyst()
+        if self._streams_report():
+            # crewAI only publishes the reply chunk by chunk when the LLM streams
+            writer.llm.stream = True
+            install_stream_listeners()
+        return ReportTask(
+            condition=self._has_new_sources,
+            stream_mode=self.report_stream,
+            stream_callback=self.report_stream_callback,
+            saved_callback=self._on_report_saved,
             description=(
                 'Create a comprehensive, publication-ready news report that synthesizes all information '
                 'from verified sources into a polished article. Follow this exact structure:\n\n'
@@ -150,11 +245,85 @@ class AiNewsAgents():
                 '✓ Ready for publication/sharing\n\n'
                 'File: news/{date}_comprehensive_ai_news_report.md'
             ),
-            agent=self.filegenerate_analyst(),
-            context=[self.fact_checking_task(), self.webscraping_task()],
+            agent=writer,
+            context=[self.generate_news_task(), self.fact_checking_task(), self.webscraping_task()],
             output_file='news/comprehensive_ai_news_report.md'
         )
 
+    def _prescore_news_sources(self, output: TaskOutput) -> Tuple[bool, Any]:
+        """Guardrail on generate_news_task: score the found URLs and append the verdict."""
+        urls = extract_urls(output.raw)
+        topic = self.inputs.get("topic", "")
+        contents = None
+        unchanged: List[str] = []
+        with span("prescore", sources=len(urls), incremental=self.incremental_run) as current:
+            if self.incremental_run:
+                contents = self._fetch_source_texts(urls)
+                self.source_digests = {url: text_digest(text) for url, text in contents.items()}
+                status = get_seen_index().classify(self.source_digests)
+                unchanged = [url for url in urls if status.get(url) == "unchanged"]
+                urls = [url for url in urls if url not in unchanged]
+            self.prescore_verdict = prescore_sources(urls, topic, contents=contents, cache=get_fact_check_cache())
+            current.set(approved=len(self.prescore_verdict["approved"]), review=len(self.prescore_verdict["review"]),
+                        unchanged=len(unchanged))
+        if self.incremental_run:
+            self.prescore_verdict["unchanged"] = unchanged
+        return True, f"{output.raw}\n\n{format_verdict(self.prescore_verdict)}"
+
+    def _fetch_source_texts(self, urls: List[str]) -> Dict[str, str]:
+        # Conditional requests against the response cache keep this cheap
+        # for pages that have not changed
+        return {page["url"]: html_to_text(page["text"])
+                for page in get_fetcher().fetch(urls) if not page.get("error")}
+
+    def _needs_fact_check_review(self, output: TaskOutput) -> bool:
+        return self._has_new_sources(output) and needs_llm_review(self.prescore_verdict)
+
+    def _streams_report(self) -> bool:
+        return self.report_stream != "off" or self.report_stream_callback is not None
+
+    def _has_new_sources(self, output: TaskOutput) -> bool:
+        if not self.incremental_run or self.prescore_verdict is None:
+            return True
+        return bool(self.prescore_verdict["approved"] or self.prescore_verdict["review"])
+
+    def _fit_scraped_content(self, output: TaskOutput) -> Tuple[bool, Any]:
+        """Guardrail on webscraping_task: shrink the scraped content to the writer's token budget."""
+        scores = {source["url"]: source["score"] for source in (self.prescore_verdict or {}).get("sources", [])}
+        topic = self.inputs.get("topic", "")
+        return True, self._get_context_budget().fit("webscraping_task", output.raw, scores, topic)
+
+    def _on_task_completed(self, output: TaskOutput) -> None:
+        """Task callback: track context budget usage."""
+        if output.name in {task.name for task in self.filegenerate_task().context}:
+            self._get_context_budget().record(output.name, output.raw)
+            if output.name == self.webscraping_task().name:
+                self.scraped_output = output.raw
+
+    def _on_report_saved(self, report_file: str, report: Any) -> None:
+        """Called by the report task once its file is written: remember reported sources."""
+        # The file of the task that ran, which differs from the template's
+        # in service and batch runs
+        if self.incremental_run:
+            self._record_reported_sources(report_file, str(report))
+
+    def _record_reported_sources(self, report_file: Optional[str], report: str = "") -> None:
+        # Only sources that were scraped or cited count as reported; the rest
+        # (rejected at pre-scoring or passed over) are checked again next run
+        used = {normalize_url(url) for url in extract_urls(f"{self.scraped_output}\n{report}")}
+        sources = [
+            (source["url"], self.source_digests[source["url"]], source["decision"])
+            for source in (self.prescore_verdict or {}).get("sources", [])
+            if source["url"] in self.source_digests and source["decision"] != "rejected"
+            and normalize_url(source["url"]) in used
+        ]
+        get_seen_index().record_report(f"{report_file}@{datetime.now().isoformat(timespec='seconds')}", sources)
+
+    def _get_context_budget(self) -> ContextBudget:
+        if self.context_budget is None:
+            self.context_budget = ContextBudget()
+        return self.context_budget
+
     @crew
     def crew(self) -> Crew:
         """Creates the AiNewsAgents crew"""
@@ -162,5 +331,6 @@ class AiNewsAgents():
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
+            task_callback=self._on_task_completed,
             verbose=True,
         )
@@ -0,0 +1,208 @@
+"""
+Near-duplicate detection for scraped articles and paragraphs
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+_WORD = re.compile(r"\w+")
+
+_MASK64 = (1 << 64) - 1
+
+# Odd 64-bit multiplier used to mix shingle hashes before binning
+_MIX = 0x9E3779B97F4A7C15
+
+# Signature layout: NUM_BINS one-permutation MinHash bins split into bands of
+# BAND_ROWS rows for locality-sensitive bucketing
+NUM_BINS = 64
+BAND_ROWS = 4
+
+
+def shingle_set(text: str, size: int = 5) -> Set[int]:
+    """
+    Hash the lowercased word ``size``-grams of a text. Texts shorter than
+    ``size`` words yield a single shingle. Hashes are only comparable within
+    one process.
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return set()
+    if len(words) <= size:
+        return {hash(tuple(words))}
+    return set(map(hash, zip(*(words[offset:] for offset in range(size)))))
+
+
+def minhash_signature(shingles: Iterable[int], num_bins: int = NUM_BINS) -> Tuple[Optional[int], ...]:
+    """
+    One-permutation MinHash: mix each shingle once, route it to a bin by its
+    top bits and keep the minimum of the remaining bits per bin. Empty bins
+    are None.
+    """
+    bins: List[Optional[int]] = [None] * num_bins
+    shift = 64 - (num_bins - 1).bit_length()
+    for shingle in _sample(shingles):
+        mixed = (shingle * _MIX) & _MASK64
+        index = mixed >> shift
+        value = mixed & 0xFFFFFFFFFFFF
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+    return tuple(bins)
+
+
+def _sample(shingles: Iterable[int]) -> Iterable[int]:
+    # Keeping the same quarter of the hash space for every text preserves the
+    # expected Jaccard similarity while cutting the signature cost
+    shingles = shingles if isinstance(shingles, (set, frozenset)) else set(shingles)
+    sample = {shingle for shingle in shingles if not shingle & 3}
+    return sample if len(sample) >= 8 else shingles
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    intersection = len(a & b)
+    return intersection / (len(a) + len(b) - intersection)
+
+
+def near_duplicate_pairs(shingle_sets: List[Set[int]], threshold: float,
+                         groups: Optional[List[Any]] = None) -> List[Tuple[int, int]]:
+    """
+    Find index pairs whose Jaccard similarity is at least ``threshold``.
+
+    Candidates come from banded MinHash buckets and are confirmed with the
+    exact Jaccard similarity of the shingle sets. When ``groups`` is given,
+    pairs within the same group are skipped.
+    """
+    starts = range(0, NUM_BINS, BAND_ROWS)
+    empty_band = (None,) * BAND_ROWS
+    buckets: Dict[Tuple[int, Tuple[Optional[int], ...]], List[int]] = defaultdict(list)
+    for index, shingles in enumerate(shingle_sets):
+        if not shingles:
+            continue
+        signature = minhash_signature(shingles)
+        for start in starts:
+            band = signature[start:start + BAND_ROWS]
+            if band != empty_band:
+                buckets[(start, band)].append(index)
+
+    candidates = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                if groups is None or groups[first] != groups[second]:
+                    candidates.add((first, second))
+
+    return sorted(
+        (first, second) for first, second in candidates
+        if jaccard(shingle_sets[first], shingle_sets[second]) >= threshold
+    )
+
+
+def deduplicate_documents(documents: List[Dict[str, Any]], doc_threshold: float = 0.6,
+                          paragraph_threshold: float = 0.5,
+                          min_paragraph_words: int = 8) -> List[Dict[str, Any]]:
+    """
+    Collapse near-duplicate articles and repeated paragraphs.
+
+    Articles whose 5-word shingles overlap by at least ``doc_threshold`` are
+    clustered; each cluster keeps one canonical copy (highest ``score``, then
+    longest text) and lists every member URL under ``sources``. Across the
+    remaining articles, a paragraph of at least ``min_paragraph_words`` words
+    that near-duplicates an earlier kept paragraph is dropped and its URL is
+    added to that paragraph's ``sources``.
+
+    Args:
+        documents (List[Dict]): Dicts with ``url`` and ``text`` (one paragraph
+            per line) and an optional credibility ``score``
+        doc_threshold (float): Jaccard similarity for article clustering
+        paragraph_threshold (float): Jaccard similarity for paragraph matching
+        min_paragraph_words (int): Shorter paragraphs are never deduplicated
+
+    Returns:
+        Canonical documents in input order, each with ``url``, ``text``,
+        ``score``, ``sources``, ``paragraphs`` (dicts with ``text`` and
+        ``sources``) and ``dropped_paragraphs``
+    """
+    # Shingle every paragraph once; an article's shingles are their union
+    paragraphs: List[List[Tuple[str, Set[int]]]] = []
+    doc_shingles: List[Set[int]] = []
+    for doc in documents:
+        blocks = [line.strip() for line in (doc.get("text") or "").split("\n")]
+        shingled = [(block, shingle_set(block, 5)) for block in blocks if block]
+        paragraphs.append(shingled)
+        doc_shingles.append(set().union(*(shingles for _, shingles in shingled)))
+
+    # Article level: cluster near-duplicates with union-find
+    parent = list(range(len(documents)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for first, second in near_duplicate_pairs(doc_shingles, doc_threshold):
+        root_first, root_second = find(first), find(second)
+        if root_first != root_second:
+            parent[max(root_first, root_second)] = min(root_first, root_second)
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for index in range(len(documents)):
+        clusters[find(index)].append(index)
+
+    canonical = []
+    canonical_paragraphs = []
+    for root in sorted(clusters):
+        members = clusters[root]
+        best = max(members, key=lambda i: (documents[i].get("score") or 0, len(documents[i].get("text") or ""), -i))
+        url = documents[best]["url"]
+        canonical.append({
+            "url": url,
+            "score": documents[best].get("score"),
+            "sources": [url] + [documents[i]["url"] for i in members if i != best],
+            "paragraphs": [{"text": block, "sources": [url]} for block, _ in paragraphs[best]],
+        })
+        canonical_paragraphs.append(paragraphs[best])
+
+    # Paragraph level: drop repeats across the canonical articles
+    paragraph_refs: List[Tuple[int, int]] = []
+    paragraph_shingles: List[Set[int]] = []
+    for doc_index, shingled in enumerate(canonical_paragraphs):
+        for paragraph_index, (block, shingles) in enumerate(shingled):
+            if block.count(" ") + 1 >= min_paragraph_words:
+                paragraph_refs.append((doc_index, paragraph_index))
+                paragraph_shingles.append(shingles)
+
+    groups = [doc_index for doc_index, _ in paragraph_refs]
+    duplicate_of: Dict[int, int] = {}
+    for first, second in near_duplicate_pairs(paragraph_shingles, paragraph_threshold, groups):
+        # Pairs are ordered, so the earlier paragraph is the one kept
+        original = duplicate_of.get(first, first)
+        if original < duplicate_of.get(second, second):
+            duplicate_of[second] = original
+
+    dropped: Dict[int, Set[int]] = defaultdict(set)
+    for copy, original in sorted(duplicate_of.items()):
+        while original in duplicate_of:
+            original = duplicate_of[original]
+        copy_doc, copy_paragraph = paragraph_refs[copy]
+        original_doc, original_paragraph = paragraph_refs[original]
+        if copy_doc == original_doc:
+            continue
+        kept = canonical[original_doc]["paragraphs"][original_paragraph]
+        if canonical[copy_doc]["url"] not in kept["sources"]:
+            kept["sources"].append(canonical[copy_doc]["url"])
+        dropped[copy_doc].add(copy_paragraph)
+
+    for doc_index, doc in enumerate(canonical):
+        skip = dropped.get(doc_index, set())
+        doc["paragraphs"] = [paragraph for i, paragraph in enumerate(doc["paragraphs"]) if i not in skip]
+        doc["dropped_paragraphs"] = len(skip)
+        doc["text"] = "\n".join(paragraph["text"] for paragraph in doc["paragraphs"])
+
+    return canonical
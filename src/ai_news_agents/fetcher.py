@@ -0,0 +1,253 @@
+"""
+Concurrent page fetcher for the scraping stage
+"""
+
+import asyncio
+import contextvars
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from .cache import JsonDiskCache, cache_key
+from .http_utils import parse_retry_after
+from .tracing import span
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Bounds of the response cache: pages not fetched or revalidated for this
+# long are dropped, then the least recently stored beyond the entry cap
+HTTP_CACHE_MAX_AGE = 30 * 24 * 3600.0
+HTTP_CACHE_MAX_ENTRIES = 20_000
+
+# Transient request errors worth retrying; the rest (invalid or unsupported
+# URLs, certificate errors, ...) fail on the first attempt
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+class ConcurrentFetcher:
+    """
+    Fetch many URLs concurrently over pooled keep-alive connections.
+
+    Requests run on a thread pool driven by asyncio, with a global cap on
+    in-flight requests and a separate cap per host; the host cap holds
+    across concurrent :meth:`fetch` calls, e.g. from several crews sharing
+    :func:`get_fetcher`. Connection errors, timeouts and retryable statuses
+    are retried with exponential backoff (honouring ``Retry-After``); other
+    errors fail at once. Successful
+    responses are stored in a local response cache and revalidated with
+    ``If-None-Match``/``If-Modified-Since`` on later fetches; a 304 reply is
+    served from the cache. Responses younger than ``max_age`` seconds are
+    served without touching the network. Concurrent fetches of the same URL,
+    from any thread, share one request.
+    """
+
+    def __init__(self, max_concurrency: int = 16, per_host_limit: int = 4, timeout: float = 15.0,
+                 retries: int = 2, backoff: float = 0.5, max_age: float = 0.0,
+                 response_cache: Optional[JsonDiskCache] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_age = max_age
+        self.response_cache = response_cache if response_cache is not None else JsonDiskCache(
+            "http", ttl=HTTP_CACHE_MAX_AGE, max_age=HTTP_CACHE_MAX_AGE, max_entries=HTTP_CACHE_MAX_ENTRIES)
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="fetcher")
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+
+    def fetch(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch URLs concurrently from synchronous code.
+
+        Args:
+            urls (Iterable[str]): URLs to fetch
+
+        Returns:
+            One result dict per URL, in input order, with ``url``, ``status``,
+            ``text``, ``content_type``, ``from_cache``, ``attempts``,
+            ``elapsed`` (seconds) and, on failure, ``error``
+        """
+        urls = list(urls)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch_all(urls))
+        # Called from inside an event loop: run on a private loop instead
+        with ThreadPoolExecutor(max_workers=1) as runner:
+            context = contextvars.copy_context()
+            return runner.submit(context.run, asyncio.run, self.fetch_all(urls)).result()
+
+    async def fetch_all(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        """Async variant of :meth:`fetch`."""
+        overall = asyncio.Semaphore(self.max_concurrency)
+        per_host: Dict[str, asyncio.Semaphore] = {}
+
+        async def fetch_one(url: str) -> Dict[str, Any]:
+            host = urlparse(url).netloc.lower()
+            host_limit = per_host.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+            with self._inflight_lock:
+                pending = self._inflight.get(url)
+                if pending is None:
+                    pending = self._inflight[url] = Future()
+                    owner = True
+                else:
+                    owner = False
+            if not owner:
+                # Another crew is already fetching this page: wait for its result
+                started = time.perf_counter()
+                with span("fetch", "http", url=url, cache="shared"):
+                    result = await asyncio.wrap_future(pending)
+                return dict(result, from_cache=True, elapsed=time.perf_counter() - started)
+            try:
+                async with host_limit, overall:
+                    with span("fetch", "http", url=url) as current:
+                        result = await self._fetch(url)
+                        current.set(status=result["status"], bytes=len(result["text"].encode("utf-8")),
+                                    cache="hit" if result["from_cache"] else "miss",
+                                    attempts=result["attempts"], error=result.get("error"))
+            except BaseException as e:
+                pending.set_exception(e)
+                raise
+            else:
+                pending.set_result(result)
+                return result
+            finally:
+                with self._inflight_lock:
+                    del self._inflight[url]
+
+        return list(await asyncio.gather(*(fetch_one(url) for url in urls)))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    async def _fetch(self, url: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        key = cache_key("http", url)
+        cached = self.response_cache.get(key)
+        result: Dict[str, Any] = {
+            "url": url,
+            "status": None,
+            "text": "",
+            "content_type": "",
+            "from_cache": False,
+            "attempts": 0,
+        }
+
+        if cached and self.max_age > 0 and time.time() - cached["fetched_at"] < self.max_age:
+            result.update(status=cached["status"], text=cached["text"],
+                          content_type=cached["content_type"], from_cache=True)
+            result["elapsed"] = time.perf_counter() - started
+            return result
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            result["attempts"] = attempt + 1
+            delay = self.backoff * (2 ** attempt)
+            try:
+                status, response_headers, text = await loop.run_in_executor(
+                    self._executor, self._request, url, headers)
+            except requests.RequestException as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+                if not isinstance(e, RETRY_ERRORS) or isinstance(e, requests.exceptions.SSLError):
+                    break
+            else:
+                result["status"] = status
+                if status == 304 and cached:
+                    cached["fetched_at"] = time.time()
+                    self.response_cache.set(key, cached)
+                    result.update(text=cached["text"], content_type=cached["content_type"],
+                                  status=cached["status"], from_cache=True)
+                    result.pop("error", None)
+                    break
+                if status < 400:
+                    result.update(text=text, content_type=response_headers.get("Content-Type", ""))
+                    result.pop("error", None)
+                    self.response_cache.set(key, {
+                        "status": status,
+                        "text": text,
+                        "content_type": result["content_type"],
+                        "etag": response_headers.get("ETag"),
+                        "last_modified": response_headers.get("Last-Modified"),
+                        "fetched_at": time.time(),
+                    })
+                    break
+                result["error"] = f"HTTP {status}"
+                if status not in RETRY_STATUSES:
+                    break
+                delay = parse_retry_after(response_headers.get("Retry-After"), delay)
+            if attempt < self.retries:
+                await asyncio.sleep(delay)
+
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, Mapping[str, str], str]:
+        # Runs on a pool thread, so decoding doesn't block the event loop.
+        # The host slot is shared by every fetch call on this fetcher.
+        with self._host_slot(urlparse(url).netloc.lower()):
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.encoding is None or response.encoding.lower() == "iso-8859-1":
+                response.encoding = response.apparent_encoding
+            return response.status_code, response.headers, response.text
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
+
+
+def html_to_text(html: str) -> str:
+    """Extract readable text from an HTML page, one block per line."""
+    parsed = BeautifulSoup(html, "html.parser")
+    for element in parsed(["script", "style", "noscript", "template", "svg"]):
+        element.decompose()
+    text = parsed.get_text("\n")
+    text = re.sub("[ \t\r\f\v]+", " ", text)
+    text = re.sub("\\s*\n\\s*", "\n", text)
+    return text.strip()
+
+
+_default_fetcher: Optional[ConcurrentFetcher] = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> ConcurrentFetcher:
+    """Return the process-wide fetcher, creating it on first use."""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = ConcurrentFetcher()
+        return _default_fetcher
@@ -0,0 +1,29 @@
+"""
+Helpers shared by the HTTP clients: the page fetcher and the rate limiter
+"""
+
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+# Longest Retry-After honoured, in seconds
+MAX_RETRY_AFTER = 30.0
+
+
+def parse_retry_after(value: Optional[str], default: float = 0.0, limit: float = MAX_RETRY_AFTER) -> float:
+    """
+    Seconds to wait according to a ``Retry-After`` header, given as a number
+    of seconds or an HTTP date, clamped to ``[0, limit]``. Returns
+    ``default`` when the header is missing or malformed.
+    """
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return default
+    return min(max(seconds, 0.0), limit)
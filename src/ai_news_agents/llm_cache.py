@@ -0,0 +1,183 @@
+"""
+Record/replay cache for LLM calls made by the crew
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import LLM
+from crewai.utilities.llm_utils import create_llm
+import litellm
+from litellm.integrations.custom_logger import CustomLogger
+
+from .cache import JsonDiskCache, cache_key
+from .rate_limit import ProviderLimiter, get_rate_limiter
+from .tracing import span
+
+
+LLM_CACHE_ENV = "AI_NEWS_LLM_CACHE"
+
+# passthrough: always call the model, never touch the cache
+# record:      serve cached responses, call the model and store the reply on a miss
+# replay:      only serve cached responses; a miss raises LookupError
+LLM_CACHE_MODES = ("passthrough", "record", "replay")
+
+# Parameters that change what the model returns. Credentials and endpoint URLs
+# are left out so recordings replay against any server hosting the same model
+_KEY_PARAMS = (
+    "temperature", "top_p", "n", "stop", "max_tokens", "max_completion_tokens",
+    "presence_penalty", "frequency_penalty", "logit_bias", "seed", "logprobs",
+    "top_logprobs", "reasoning_effort",
+)
+
+# Completion tokens charged up front when the model has no max_tokens; the
+# token budget is corrected once the reply is in
+DEFAULT_COMPLETION_ESTIMATE = 1000
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0}
+
+
+def llm_cache_stats() -> Dict[str, int]:
+    """Process-wide hit/miss counters of every CachedLLM."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+class CachedLLM(LLM):
+    """
+    LLM whose text completions are content-addressed on disk.
+
+    The cache key covers the model, the messages, the tool schemas and every
+    generation parameter, so a byte-identical prompt is answered from
+    ``.cache/llm`` without a network call. Calls that hand the model
+    ``available_functions`` to execute are never cached.
+
+    Calls that reach the model go through the provider's rate limiter, which
+    is shared with every other crew in the process and retries after 429s.
+    """
+
+    def __init__(self, model: str, cache_mode: Optional[str] = None,
+                 cache: Optional[JsonDiskCache] = None, **kwargs: Any):
+        super().__init__(model=model, **kwargs)
+        self._setup_cache(cache_mode, cache)
+
+    @classmethod
+    def from_llm(cls, llm: LLM, cache_mode: Optional[str] = None,
+                 cache: Optional[JsonDiskCache] = None) -> "CachedLLM":
+        """Wrap an already configured LLM, keeping all of its settings."""
+        cached = cls.__new__(cls)
+        cached.__dict__.update(vars(llm))
+        cached._setup_cache(cache_mode, cache)
+        return cached
+
+    def _setup_cache(self, cache_mode: Optional[str], cache: Optional[JsonDiskCache]) -> None:
+        self.cache_mode = cache_mode or os.getenv(LLM_CACHE_ENV, "passthrough")
+        if self.cache_mode not in LLM_CACHE_MODES:
+            raise ValueError(
+                f"Invalid LLM cache mode: {self.cache_mode}. Must be one of: {', '.join(LLM_CACHE_MODES)}"
+            )
+        self.response_cache = cache if cache is not None else JsonDiskCache("llm")
+        self.rate_limiter: ProviderLimiter = get_rate_limiter(_provider(self.model))
+        # The limiter retries 429s with the provider paused for every crew;
+        # the client retrying on its own would bypass it
+        self.additional_params = {"max_retries": 0, **self.additional_params}
+
+    def cache_key(self, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None) -> str:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        params = {name: getattr(self, name, None) for name in _KEY_PARAMS}
+        if self.response_format is not None:
+            params["response_format"] = getattr(self.response_format, "__name__", str(self.response_format))
+        extra = {name: value for name, value in self.additional_params.items()
+                 if "key" not in name.lower() and name not in ("base_url", "api_base", "max_retries")}
+        return cache_key("llm", self.model, messages, tools, params, extra)
+
+    def call(self, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None,
+             **kwargs: Any) -> Union[str, Any]:
+        with span("llm.call", "llm", model=self.model, cache_mode=self.cache_mode) as current:
+            if current:
+                callbacks = list(callbacks or []) + [_UsageRecorder(current)]
+            if self.cache_mode == "passthrough" or available_functions:
+                return self._call_model(messages, tools=tools, callbacks=callbacks,
+                                        available_functions=available_functions, **kwargs)
+
+            key = self.cache_key(messages, tools)
+            entry = self.response_cache.get(key)
+            if entry is not None:
+                _count("hits")
+                current.set(cache="hit")
+                return entry["response"]
+            _count("misses")
+            current.set(cache="miss")
+            if self.cache_mode == "replay":
+                raise LookupError(f"No recorded LLM response for this prompt (model {self.model}, key {key[:12]})")
+
+            response = self._call_model(messages, tools=tools, callbacks=callbacks,
+                                        available_functions=available_functions, **kwargs)
+            if isinstance(response, str):
+                self.response_cache.set(key, {"model": self.model, "response": response})
+                _count("stores")
+            return response
+
+    def _call_model(self, messages: Union[str, List[Dict[str, Any]]], **kwargs: Any) -> Union[str, Any]:
+        call = super().call
+        prompt = _estimate_tokens(messages)
+        estimate = prompt + (self.max_tokens or self.max_completion_tokens or DEFAULT_COMPLETION_ESTIMATE)
+        response = self.rate_limiter.call(lambda: call(messages, **kwargs), tokens=estimate)
+        if isinstance(response, str):
+            self.rate_limiter.settle(estimate, prompt + _estimate_tokens(response))
+        return response
+
+
+def _provider(model: str) -> str:
+    try:
+        return litellm.get_llm_provider(model)[1]
+    except Exception:
+        return "llm"
+
+
+def _estimate_tokens(messages: Union[str, List[Dict[str, Any]]]) -> int:
+    if isinstance(messages, str):
+        return len(messages) // 4
+    return sum(len(str(message.get("content") or "")) for message in messages) // 4
+
+
+class _UsageRecorder(CustomLogger):
+    """LLM callback copying the provider's token usage onto a trace span."""
+
+    def __init__(self, current: Any, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.span = current
+
+    def log_success_event(self, kwargs: Dict[str, Any], response_obj: Dict[str, Any],
+                          start_time: Any, end_time: Any) -> None:
+        # crewAI reports usage as {"usage": ...}; litellm's own logging
+        # passes the full response object, which is skipped to avoid
+        # counting a call twice
+        if not isinstance(response_obj, dict):
+            return
+        usage = response_obj.get("usage")
+        for name in ("prompt_tokens", "completion_tokens"):
+            value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+            if value:
+                self.span.add(name, value)
+
+
+def build_llm(cache_mode: Optional[str] = None) -> CachedLLM:
+    """
+    Create the crew's LLM from the usual crewAI environment variables
+    (``MODEL``, ``OPENAI_API_BASE``, ...) with the response cache in front.
+    Point ``OPENAI_API_BASE`` at a local stand-in server to run offline.
+    """
+    llm = create_llm(None)
+    if llm is None:
+        raise ValueError("Could not configure an LLM from the environment")
+    return CachedLLM.from_llm(llm, cache_mode=cache_mode)
@@ -4,14 +4,35 @@ import sys
 from datetime import datetime
 import os
 
-try:
-    from .crew import AiNewsAgents
-except ImportError as e:
-    print(f"ImportError: {e}. Make sure 'crew.py' exists in the ai_news_agents package and is accessible.")
-    raise
+from dotenv import load_dotenv
+
+load_dotenv()
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+def load_crew():
+    """
+    Import the crew class on demand. Importing crewAI takes seconds, so
+    commands only pay for it once they actually need a crew.
+    """
+    try:
+        from .crew import AiNewsAgents
+    except ImportError as e:
+        print(f"ImportError: {e}. Make sure 'crew.py' exists in the ai_news_agents package and is accessible.")
+        raise
+    return AiNewsAgents
+
+def command_args(*names):
+    """
+    Return the arguments that follow the command.
+
+    ``python main.py batch a,b`` puts the command name at ``sys.argv[1]``,
+    while the installed ``batch a,b`` script runs as ``sys.argv[0]`` and its
+    arguments start right after it.
+    """
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    return sys.argv[1:] if script in names else sys.argv[2:]
+
 def run():
     """
     Run the crew.
@@ -28,9 +49,17 @@ def run():
         'topic': 'AI LLMs',
         'date': datetime.now().strftime('%Y-%m-%d')
     }
+    args = command_args("run", "run_crew", "ai_news_agents")
     try:
         print("Creating AiNewsAgents crew...")
-        crew_instance = AiNewsAgents()
+        crew_instance = load_crew()()
+        from .seen_index import incremental_from_env
+        if "--incremental" in args:
+            crew_instance.incremental = True
+        if crew_instance.incremental or (crew_instance.incremental is None and incremental_from_env()):
+            print("Incremental mode: sources already covered by earlier reports are skipped.")
+        if "--stream" in args:
+            crew_instance.report_stream = "stdout"
         print("Starting crew execution...")
         result = crew_instance.crew().kickoff(inputs=inputs)
         print("Crew execution completed!")
@@ -45,7 +74,8 @@ def train():
     """
     Train the crew for a given number of iterations.
     """
-    if len(sys.argv) < 4:
+    args = command_args("train")
+    if len(args) < 2:
         print("Usage: python main.py train <n_iterations> <filename>")
         return
     inputs = {
@@ -53,9 +83,9 @@ def train():
         'current_year': str(datetime.now().year)
     }
     try:
-        AiNewsAgents().crew().train(
-            n_iterations=int(sys.argv[2]),
-            filename=sys.argv[3],
+        load_crew()().crew().train(
+            n_iterations=int(args[0]),
+            filename=args[1],
             inputs=inputs
         )
     except Exception as e:
@@ -65,11 +95,12 @@ def replay():
     """
     Replay the crew execution from a specific task.
     """
-    if len(sys.argv) < 3:
+    args = command_args("replay")
+    if not args:
         print("Usage: python main.py replay <task_id>")
         return
     try:
-        AiNewsAgents().crew().replay(task_id=sys.argv[2])
+        load_crew()().crew().replay(task_id=args[0])
     except Exception as e:
         print(f"An error occurred while replaying the crew: {e}")
 
@@ -77,7 +108,8 @@ def test():
     """
     Test the crew execution and returns the results.
     """
-    if len(sys.argv) < 4:
+    args = command_args("test")
+    if len(args) < 2:
         print("Usage: python main.py test <n_iterations> <eval_llm>")
         return
     inputs = {
@@ -85,26 +117,140 @@ def test():
         "current_year": str(datetime.now().year)
     }
     try:
-        AiNewsAgents().crew().test(
-            n_iterations=int(sys.argv[2]),
-            eval_llm=sys.argv[3],
+        load_crew()().crew().test(
+            n_iterations=int(args[0]),
+            eval_llm=args[1],
             inputs=inputs
         )
     except Exception as e:
         print(f"An error occurred while testing the crew: {e}")
 
+def profile():
+    """
+    Run the crew with tracing on and print where the time went.
+    Pass the path of an earlier trace to summarize it instead.
+    """
+    from .cache import cache_dir
+    from .tracing import disable_tracing, enable_tracing, format_summary, load_trace, summarize
+
+    args = command_args("profile")
+    if args:
+        spans = load_trace(args[0])
+        trace_path = args[0]
+    else:
+        trace_path = cache_dir("traces", f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl")
+        enable_tracing(trace_path)
+        try:
+            run()
+        finally:
+            spans = disable_tracing().spans
+    print()
+    print(format_summary(summarize(spans)))
+    print(f"\nTrace: {trace_path}")
+
+def batch():
+    """
+    Write one dated report per topic, running several crews at once.
+    Topics come from a file (one per line) or a comma-separated list.
+    """
+    args = command_args("batch")
+    if not args:
+        print("Usage: python main.py batch <topics-file|topic,topic,...> [--concurrency N]")
+        return
+    from .batch import load_topics, run_batch
+
+    topics = load_topics(args[0])
+    args = args[1:]
+    concurrency = None
+    if "--concurrency" in args and args.index("--concurrency") + 1 < len(args):
+        try:
+            concurrency = int(args[args.index("--concurrency") + 1])
+        except ValueError as e:
+            print(f"Invalid option: {e}")
+            return
+    print(f"Running {len(topics)} topics...")
+    results = run_batch(topics, concurrency=concurrency)
+    print()
+    for result in results:
+        outcome = result["report_file"] or result["error"] or "no new sources"
+        seconds = f"{result['seconds']:.1f} s" if result["seconds"] is not None else "-"
+        print(f"{result['status']:<10} {seconds:>9}  {result['topic']}: {outcome}")
+    return results
+
+def publish():
+    """
+    Render the reports in news/ (or the given directory) to HTML and PDF,
+    rebuilding only the ones that changed since the last run.
+    Options: --format html,pdf, --workers N, --force
+    """
+    from .publish import PUBLISH_FORMATS, publish as publish_reports
+
+    args = command_args("publish")
+    source_dir = args[0] if args and not args[0].startswith("--") else "news"
+    options = {}
+    for name in ("--format", "--workers"):
+        if name in args and args.index(name) + 1 < len(args):
+            options[name[2:]] = args[args.index(name) + 1]
+    formats = options.get("format", ",".join(PUBLISH_FORMATS)).split(",")
+    try:
+        workers = int(options["workers"]) if "workers" in options else None
+    except ValueError as e:
+        print(f"Invalid option: {e}")
+        workers = formats = None
+    if formats is None or not set(formats) <= set(PUBLISH_FORMATS):
+        print("Usage: python main.py publish [news-dir] [--format html,pdf] [--workers N] [--force]")
+        return
+    results = publish_reports(source_dir, formats=formats, workers=workers, force="--force" in args)
+    for result in results:
+        if result["status"] != "unchanged":
+            outcome = result["error"] or result["output"]
+            print(f"{result['status']:<10} {result['seconds'] * 1000:>8.0f} ms  {outcome}")
+    counts = {status: sum(result["status"] == status for result in results)
+              for status in ("built", "unchanged", "failed")}
+    print(f"{counts['built']} built, {counts['unchanged']} unchanged, {counts['failed']} failed")
+    return results
+
+def serve():
+    """
+    Serve reports over a local HTTP API, keeping crews warm between jobs.
+    Options: --host, --port, --workers, --queue
+    """
+    from .service import serve as serve_reports
+
+    args = command_args("serve")
+    options = {}
+    for name in ("--host", "--port", "--workers", "--queue"):
+        if name in args and args.index(name) + 1 < len(args):
+            options[name[2:]] = args[args.index(name) + 1]
+    try:
+        numbers = {name: int(options[name]) for name in ("port", "workers", "queue") if name in options}
+    except ValueError as e:
+        print(f"Invalid option: {e}")
+        print("Usage: python main.py serve [--host HOST] [--port PORT] [--workers N] [--queue N]")
+        return
+    serve_reports(host=options.get("host"), port=numbers.get("port"), workers=numbers.get("workers"),
+                  queue_size=numbers.get("queue"))
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python main.py <run|train|replay|test> [args...]")
+        print("Usage: python main.py <run [--incremental] [--stream]|batch|publish|train|replay|test|profile|serve> [args...]")
     else:
         command = sys.argv[1]
         if command == "run":
             run()
+        elif command == "batch":
+            batch()
+        elif command == "publish":
+            publish()
         elif command == "train":
             train()
         elif command == "replay":
             replay()
         elif command == "test":
             test()
+        elif command == "profile":
+            profile()
+        elif command == "serve":
+            serve()
         else:
             print(f"Unknown command: {command}")
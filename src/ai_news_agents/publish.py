@@ -0,0 +1,269 @@
+"""
+Incremental Markdown to HTML/PDF publishing of the reports in ``news/``
+"""
+
+import glob
+import hashlib
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from .cache import JsonDiskCache, cache_key, write_atomic
+
+
+PUBLISH_WORKERS_ENV = "AI_NEWS_PUBLISH_WORKERS"
+PUBLISH_CSS_ENV = "AI_NEWS_PUBLISH_CSS"
+
+PUBLISH_FORMATS = ("html", "pdf")
+
+DEFAULT_STYLESHEET = os.path.join(os.path.dirname(__file__), "config", "report.css")
+
+MARKDOWN_EXTENSIONS = ("extra", "sane_lists", "toc")
+
+# Part of every output's digest: bump it when rendering changes so the
+# whole archive is rebuilt once
+RENDER_VERSION = 3
+
+# URL schemes kept in links and images; reports quote scraped pages, so
+# anything else (javascript:, file:, ...) is dropped
+SAFE_URL_SCHEMES = ("", "http", "https", "mailto")
+
+_URL_IGNORED = re.compile(r"[\x00-\x20\x7f]+")
+
+_DOCUMENT = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+{style}</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+# (source, {format: (output path, digest)})
+Job = Tuple[str, Dict[str, Tuple[str, str]]]
+
+
+def url_scheme(url: str) -> str:
+    """
+    The scheme a browser sees in an attribute value: character references
+    decoded and ASCII whitespace and control characters (which browsers
+    drop from URLs) removed, so ``&#106;ava&#x09;script:`` is ``javascript``.
+    """
+    return urlsplit(_URL_IGNORED.sub("", html.unescape(url))).scheme.lower()
+
+
+class _SafeLinks:
+    """Markdown tree processor removing link and image URLs with unsafe schemes."""
+
+    def run(self, root: Any) -> None:
+        for element in root.iter():
+            for attribute in ("href", "src"):
+                url = element.get(attribute)
+                if url is not None and url_scheme(url) not in SAFE_URL_SCHEMES:
+                    del element.attrib[attribute]
+
+
+def local_url_fetcher(root: str) -> Callable[..., Dict[str, Any]]:
+    """
+    WeasyPrint URL fetcher serving only ``data:`` URIs and files under
+    ``root`` (the stylesheet's directory, for its fonts and images). Remote
+    and other local URLs in a report are refused.
+    """
+    from weasyprint.urls import default_url_fetcher
+
+    root = os.path.realpath(root)
+
+    def fetch(url: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        parts = urlsplit(url)
+        if parts.scheme == "data":
+            return default_url_fetcher(url, *args, **kwargs)
+        if parts.scheme == "file" and not parts.netloc:
+            path = os.path.realpath(unquote(parts.path))
+            if os.path.commonpath([root, path]) == root:
+                return default_url_fetcher(url, *args, **kwargs)
+        raise ValueError(f"Refusing to fetch {url!r} while publishing")
+
+    return fetch
+
+
+class _Renderer:
+    """
+    Markdown parser and stylesheet kept for every document a process renders.
+
+    Raw HTML in a report is escaped rather than passed through, and link and
+    image URLs are limited to ``SAFE_URL_SCHEMES``. WeasyPrint's parsed
+    stylesheet and font configuration (including any ``@font-face`` fonts
+    it loaded) are created on the first PDF and reused for the rest, which
+    saves most of the per-document cost; it may only load files from the
+    stylesheet's directory.
+    """
+
+    def __init__(self, stylesheet: str, stylesheet_dir: str = os.path.dirname(DEFAULT_STYLESHEET)):
+        import markdown
+
+        self.stylesheet = stylesheet
+        self.stylesheet_dir = stylesheet_dir
+        self.markdown = markdown.Markdown(extensions=list(MARKDOWN_EXTENSIONS), output_format="html")
+        self.markdown.preprocessors.deregister("html_block")
+        self.markdown.inlinePatterns.deregister("html")
+        self.markdown.treeprocessors.register(_SafeLinks(), "safe_links", 0)
+        self._css: Any = None
+        self._fonts: Any = None
+        self._fetcher: Any = None
+
+    def document(self, text: str, title: str, inline_style: bool = True) -> str:
+        body = self.markdown.reset().convert(text)
+        style = f"<style>\n{self.stylesheet}\n</style>\n" if inline_style else ""
+        return _DOCUMENT.format(title=html.escape(title), style=style, body=body)
+
+    def pdf(self, document: str, base_url: str) -> bytes:
+        from weasyprint import CSS, HTML
+        from weasyprint.text.fonts import FontConfiguration
+
+        if self._css is None:
+            self._fetcher = local_url_fetcher(self.stylesheet_dir)
+            self._fonts = FontConfiguration()
+            self._css = CSS(string=self.stylesheet, base_url=self.stylesheet_dir + os.sep,
+                            font_config=self._fonts, url_fetcher=self._fetcher)
+        return HTML(string=document, base_url=base_url, url_fetcher=self._fetcher).write_pdf(
+            stylesheets=[self._css], font_config=self._fonts)
+
+    def render(self, job: Job) -> List[Dict[str, Any]]:
+        source, targets = job
+        try:
+            text, unreadable = read_report(source), None
+        except OSError as e:
+            text, unreadable = "", e
+        title = report_title(text, source)
+        results = []
+        for kind, (output, digest) in targets.items():
+            started = time.perf_counter()
+            try:
+                if unreadable is not None:
+                    raise unreadable
+                if kind == "html":
+                    write_atomic(output, self.document(text, title))
+                else:
+                    document = self.document(text, title, inline_style=False)
+                    write_atomic(output, self.pdf(document, os.path.dirname(os.path.abspath(source))))
+                status, error = "built", None
+            except Exception as e:
+                status, error = "failed", f"{type(e).__name__}: {e}"
+            results.append({"source": source, "format": kind, "output": output, "digest": digest,
+                            "status": status, "error": error, "seconds": time.perf_counter() - started})
+        return results
+
+
+_worker: Optional[_Renderer] = None
+
+
+def _init_worker(stylesheet: str, stylesheet_dir: str) -> None:
+    global _worker
+    _worker = _Renderer(stylesheet, stylesheet_dir)
+
+
+def _render_job(job: Job) -> List[Dict[str, Any]]:
+    return _worker.render(job)
+
+
+def read_report(path: str) -> str:
+    """Read a report as UTF-8, falling back to Windows-1252 for reports saved by Windows editors."""
+    with open(path, "rb") as handle:
+        data = handle.read()
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+def report_title(text: str, source: str) -> str:
+    """The report's first level-one heading, or its file name."""
+    match = re.search(r"^#\s+(.+?)\s*#*\s*$", text, re.MULTILINE)
+    if match:
+        return re.sub(r"[*_`]", "", match.group(1))
+    return os.path.splitext(os.path.basename(source))[0]
+
+
+def output_path(source: str, kind: str, output_dir: str) -> str:
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(output_dir, kind, f"{stem}.{kind}")
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as handle:
+        return hashlib.sha256(handle.read()).hexdigest()
+
+
+def publish(source_dir: str = "news", output_dir: Optional[str] = None, formats: Iterable[str] = PUBLISH_FORMATS,
+            workers: Optional[int] = None, force: bool = False, stylesheet: Optional[str] = None,
+            manifest: Optional[JsonDiskCache] = None) -> List[Dict[str, Any]]:
+    """
+    Render every ``*.md`` report in ``source_dir`` to ``<output_dir>/html``
+    and ``<output_dir>/pdf`` (``output_dir`` defaults to ``source_dir``).
+
+    An output is only rebuilt when the digest of its source, the stylesheet
+    and the renderer differs from the one recorded when it was last built
+    (or when ``force`` is set), so republishing an unchanged archive reads
+    each report once and renders nothing. Reports that need rendering are
+    spread over ``workers`` processes (``AI_NEWS_PUBLISH_WORKERS``, default:
+    one per CPU), each of which parses the stylesheet once.
+
+    Returns one entry per report and format, sorted by source, with
+    ``source``, ``format``, ``output``, ``status`` (built, unchanged or
+    failed), ``error`` and ``seconds``.
+    """
+    formats = list(dict.fromkeys(formats))
+    unknown = [kind for kind in formats if kind not in PUBLISH_FORMATS]
+    if unknown:
+        raise ValueError(f"Invalid publish format: {', '.join(unknown)}. Must be one of: {', '.join(PUBLISH_FORMATS)}")
+    output_dir = output_dir or source_dir
+    workers = workers or int(os.getenv(PUBLISH_WORKERS_ENV, 0)) or os.cpu_count() or 1
+    stylesheet_path = stylesheet or os.getenv(PUBLISH_CSS_ENV) or DEFAULT_STYLESHEET
+    with open(stylesheet_path, "r", encoding="utf-8") as handle:
+        css = handle.read()
+    stylesheet_dir = os.path.dirname(os.path.abspath(stylesheet_path))
+    manifest = manifest if manifest is not None else JsonDiskCache("publish")
+
+    results: List[Dict[str, Any]] = []
+    jobs: List[Job] = []
+    for source in sorted(glob.glob(os.path.join(source_dir, "*.md"))):
+        source_digest = _file_digest(source)
+        targets = {}
+        for kind in formats:
+            output = output_path(source, kind, output_dir)
+            digest = cache_key("publish", RENDER_VERSION, kind, source_digest, css)
+            if not force and os.path.exists(output) and manifest.get(_manifest_key(output)) == digest:
+                results.append({"source": source, "format": kind, "output": output, "status": "unchanged",
+                                "error": None, "seconds": 0.0})
+            else:
+                targets[kind] = (output, digest)
+        if targets:
+            jobs.append((source, targets))
+
+    if len(jobs) <= 1 or workers <= 1:
+        renderer = _Renderer(css, stylesheet_dir)
+        rendered = [renderer.render(job) for job in jobs]
+    else:
+        workers = min(workers, len(jobs))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(css, stylesheet_dir)) as pool:
+            rendered = list(pool.map(_render_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    for entries in rendered:
+        for entry in entries:
+            digest = entry.pop("digest")
+            if entry["status"] == "built":
+                manifest.set(_manifest_key(entry["output"]), digest)
+            results.append(entry)
+    return sorted(results, key=lambda entry: (entry["source"], formats.index(entry["format"])))
+
+
+def _manifest_key(output: str) -> str:
+    return cache_key("publish", os.path.abspath(output))
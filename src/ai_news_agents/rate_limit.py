@@ -0,0 +1,261 @@
+"""
+Per-provider rate limiting for Serper and LLM calls shared by every crew in
+the process
+"""
+
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from .http_utils import parse_retry_after
+from .tracing import event
+
+
+RATE_LIMITS_ENV = "AI_NEWS_RATE_LIMITS"
+RATE_LIMIT_RETRIES_ENV = "AI_NEWS_RATE_LIMIT_RETRIES"
+
+DEFAULT_RETRIES = 5
+
+# Backoff after a 429 without Retry-After: BASE_BACKOFF doubling per
+# consecutive 429, up to MAX_BACKOFF seconds
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+# Share of the configured rate kept after a 429 (multiplicative decrease),
+# and regained per successful call (additive increase)
+THROTTLE_FACTOR = 0.75
+RECOVERY_STEP = 0.1
+MIN_RATE_FACTOR = 0.1
+
+T = TypeVar("T")
+
+_priority: "contextvars.ContextVar[float]" = contextvars.ContextVar("ai_news_call_priority", default=0.0)
+
+
+@contextlib.contextmanager
+def call_priority(value: float) -> Iterator[None]:
+    """
+    Order this context's rate-limited calls by ``value`` (lower goes first)
+    when several crews wait on the same provider.
+    """
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    Refills at ``per_minute / 60`` units per second up to ``capacity``
+    (default: five seconds' worth). Requests larger than the capacity are
+    clamped to it, so an oversized call waits for a full bucket instead of
+    forever.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.per_minute = per_minute
+        self.capacity = capacity or max(per_minute / 12, 1.0)
+        self.level = self.capacity
+        self.factor = 1.0
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute * self.factor / 60
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, when negative) a correction after the fact."""
+        self.level = min(self.level - amount, self.capacity)
+
+    def drain(self, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class ProviderLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budgets for one API provider.
+
+    Callers queue in priority order (see :func:`call_priority`, ties go to
+    the earliest caller) and only the head of the queue may take budget, so
+    concurrent crews are served in a fixed order instead of racing. A 429
+    pauses the whole provider for its ``Retry-After`` (or an exponential
+    backoff) and cuts the configured rates by a quarter; each success wins
+    back a tenth until the configured budget is reached again.
+    Providers without configured budgets are still paused after a 429.
+    """
+
+    def __init__(self, name: str, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, retries: int = DEFAULT_RETRIES):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.retries = retries
+        self.stats = {"calls": 0, "throttled": 0, "retries": 0, "failed": 0, "waited_seconds": 0.0}
+        self._blocked_until = 0.0
+        self._consecutive = 0
+        self._waiting: List[Tuple[float, int]] = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, tokens: float = 0, priority: Optional[float] = None) -> float:
+        """Block until this call may go ahead; returns the seconds waited."""
+        ticket = (_priority.get() if priority is None else priority, next(self._order))
+        started = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                if self._waiting[0] != ticket:
+                    self._condition.wait()
+                    continue
+                now = time.monotonic()
+                wait = self._blocked_until - now
+                if self.requests:
+                    wait = max(wait, self.requests.wait_time(1, now))
+                if self.tokens and tokens:
+                    wait = max(wait, self.tokens.wait_time(tokens, now))
+                if wait <= 0:
+                    break
+                self._condition.wait(wait)
+            heapq.heappop(self._waiting)
+            if self.requests:
+                self.requests.take(1, now)
+            if self.tokens and tokens:
+                self.tokens.take(tokens, now)
+            waited = now - started
+            self.stats["calls"] += 1
+            self.stats["waited_seconds"] += waited
+            self._condition.notify_all()
+        return waited
+
+    def settle(self, estimated: float, actual: float) -> None:
+        """Correct the token budget once a call's real token count is known."""
+        if self.tokens:
+            with self._condition:
+                self.tokens.adjust(actual - estimated)
+
+    def succeeded(self) -> None:
+        with self._condition:
+            self._consecutive = 0
+            for bucket in (self.requests, self.tokens):
+                if bucket:
+                    bucket.factor = min(1.0, bucket.factor + RECOVERY_STEP)
+
+    def throttled(self, retry_after: Optional[float] = None) -> float:
+        """Record a 429 and pause the provider; returns the pause in seconds."""
+        with self._condition:
+            self._consecutive += 1
+            delay = retry_after if retry_after else BASE_BACKOFF * 2 ** (self._consecutive - 1)
+            delay = min(delay, MAX_BACKOFF)
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + delay)
+            for bucket in (self.requests, self.tokens):
+                if bucket:
+                    bucket.factor = max(MIN_RATE_FACTOR, bucket.factor * THROTTLE_FACTOR)
+                    bucket.drain(now)
+            self.stats["throttled"] += 1
+            self._condition.notify_all()
+        event("ratelimit.throttled", "ratelimit", provider=self.name, delay=delay, retry_after=retry_after)
+        return delay
+
+    def call(self, function: Callable[[], T], tokens: float = 0,
+             rate_limit_delay: Optional[Callable[[BaseException], Optional[float]]] = None) -> T:
+        """
+        Run ``function`` within the budget, retrying it after 429s.
+
+        ``rate_limit_delay`` maps an exception to ``None`` when it is not a
+        rate-limit error, or to the server's ``Retry-After`` in seconds
+        (``0`` when it gave none). After ``retries`` throttled attempts the
+        last error is raised.
+        """
+        classify = rate_limit_delay or _status_429_delay
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                result = function()
+            except Exception as e:
+                retry_after = classify(e)
+                if retry_after is None:
+                    raise
+                self.throttled(retry_after or None)
+                attempt += 1
+                with self._condition:
+                    self.stats["retries" if attempt <= self.retries else "failed"] += 1
+                if attempt > self.retries:
+                    raise
+                continue
+            self.succeeded()
+            return result
+
+
+def _status_429_delay(error: BaseException) -> Optional[float]:
+    # Works for requests' HTTPError and for litellm/openai errors, which
+    # both carry the HTTP response
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    return parse_retry_after(headers.get("Retry-After") or headers.get("retry-after"), 0.0)
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Dict[str, float]]:
+    """
+    Parse ``provider=<n>rpm[:<n>tpm],...``, e.g.
+    ``openai=500rpm:200000tpm,serper=300rpm``.
+    """
+    limits: Dict[str, Dict[str, float]] = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, budget = item.partition("=")
+        entry = limits.setdefault(name.strip().lower(), {})
+        for value, unit in re.findall(r"([\d.]+)\s*(rpm|tpm)", budget.lower()):
+            entry["requests_per_minute" if unit == "rpm" else "tokens_per_minute"] = float(value)
+    return limits
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> ProviderLimiter:
+    """Return the process-wide limiter for ``provider``, configured from ``AI_NEWS_RATE_LIMITS``."""
+    provider = provider.lower()
+    with _limiters_lock:
+        if provider not in _limiters:
+            budget = parse_rate_limits(os.getenv(RATE_LIMITS_ENV, "")).get(provider, {})
+            _limiters[provider] = ProviderLimiter(
+                provider, retries=int(os.getenv(RATE_LIMIT_RETRIES_ENV, DEFAULT_RETRIES)), **budget)
+        return _limiters[provider]
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters of every limiter created so far, by provider."""
+    with _limiters_lock:
+        return {name: dict(limiter.stats) for name, limiter in _limiters.items()}
+
+
+def reset_rate_limiters() -> None:
+    """Forget every limiter, so the next calls pick up ``AI_NEWS_RATE_LIMITS`` afresh."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,288 @@
+"""
+Streaming of the final report to disk (and optionally stdout) while the
+writer agent is still generating it
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from crewai.tasks.conditional_task import ConditionalTask
+from pydantic import Field, PrivateAttr, field_validator
+
+from .cache import cache_key, write_atomic
+
+
+STREAM_ENV = "AI_NEWS_STREAM"
+
+# off:    write the report once it is complete
+# file:   stream the report into ``<report>.partial`` and rename it on completion
+# stdout: like ``file``, and echo the report to stdout as it is written
+STREAM_MODES = ("off", "file", "stdout")
+
+PARTIAL_SUFFIX = ".partial"
+
+# First line of a partial report: the digest of the inputs of the run that
+# wrote it, so only a rerun with the same inputs resumes it
+PARTIAL_HEADER = "<!-- ai-news partial report: {key} -->\n"
+
+FINAL_ANSWER = "Final Answer:"
+
+# Seconds between fsyncs of the partial file; every chunk is flushed to the OS
+SYNC_INTERVAL = 1.0
+
+RESUME_NOTE = (
+    "\n\nAn earlier attempt at this report was interrupted after writing the beginning below. "
+    "Keep that beginning as it is, unless the sources contradict it, and complete the report "
+    "from where it stops.\n\n--- INTERRUPTED REPORT ---\n{partial}\n--- END OF INTERRUPTED REPORT ---"
+)
+
+
+def run_key(inputs: Any) -> str:
+    """Digest of a run's inputs (topic, date, ...) identifying its partial report."""
+    return cache_key("report", inputs or {})
+
+
+def read_partial(path: str, key: str) -> Optional[str]:
+    """
+    The partial report an interrupted run with inputs digest ``key`` left
+    next to ``path``, if any. Partial reports of runs with other inputs (a
+    different topic or date) are ignored.
+    """
+    try:
+        with open(path + PARTIAL_SUFFIX, "r", encoding="utf-8") as handle:
+            header = handle.readline()
+            if header != PARTIAL_HEADER.format(key=key):
+                return None
+            return handle.read().strip() or None
+    except OSError:
+        return None
+
+
+class ReportStream:
+    """
+    Write the writer agent's final answer to ``<path>.partial`` as it streams.
+
+    Only text after the ReAct ``Final Answer:`` marker is written; a new LLM
+    response resets the parser, so thoughts and tool calls never reach the
+    file. Every chunk is flushed, so a crash leaves the report written so
+    far on disk. :meth:`finish` replaces the partial file's content with the
+    complete report and renames it to ``path`` atomically.
+    """
+
+    def __init__(self, path: str, echo: Optional[Callable[[str], None]] = None, key: str = ""):
+        self.path = path
+        self.partial_path = path + PARTIAL_SUFFIX
+        self.echo = echo
+        self.key = key
+        self._file: Optional[Any] = None
+        self._buffer = ""
+        self._answering = False
+        self._leading = True
+        self._started = False
+        self._synced = 0.0
+
+    def start_response(self) -> None:
+        self._buffer = ""
+        self._answering = False
+
+    def feed(self, chunk: str) -> None:
+        if not self._answering:
+            self._buffer += chunk
+            index = self._buffer.find(FINAL_ANSWER)
+            if index < 0:
+                return
+            chunk = self._buffer[index + len(FINAL_ANSWER):]
+            self._buffer = ""
+            self._answering = True
+            self._open()
+        if self._leading:
+            chunk = chunk.lstrip()
+            self._leading = not chunk
+        if chunk:
+            self._write(chunk)
+
+    def finish(self, text: str) -> None:
+        # A reply served from the LLM cache arrives whole, without chunks
+        if not self._started and self.echo is not None:
+            self.echo(text)
+        self.close()
+        write_atomic(self.partial_path, text)
+        os.replace(self.partial_path, self.path)
+
+    def close(self) -> None:
+        """Stop streaming, leaving any partial report on disk."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        # A new final answer replaces whatever an earlier one (or an
+        # interrupted run) left in the partial file
+        self.close()
+        directory = os.path.dirname(self.partial_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.partial_path, "w", encoding="utf-8")
+        self._file.write(PARTIAL_HEADER.format(key=self.key))
+        self._leading = True
+        self._started = True
+
+    def _write(self, text: str) -> None:
+        self._file.write(text)
+        self._file.flush()
+        now = time.monotonic()
+        if now - self._synced >= SYNC_INTERVAL:
+            os.fsync(self._file.fileno())
+            self._synced = now
+        if self.echo is not None:
+            self.echo(text)
+
+
+def _echo_stdout(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+class ReportTask(ConditionalTask):
+    """
+    Conditional task whose output file is written atomically and, with
+    ``stream_mode`` set, streamed while the agent generates it. Otherwise
+    the file is written like crewAI writes it: ``~`` is expanded, a missing
+    directory is only created with ``create_directory``, and dict results
+    are saved as JSON.
+
+    The agent's LLM must be created with ``stream=True`` for chunks to
+    arrive; ``stream_callback`` receives every chunk written and turns
+    streaming on by itself. ``saved_callback`` is called with the output
+    file and the report once the file is written. When an interrupted run
+    with the same inputs left a partial report, it is added to the prompt so
+    the writer resumes from it.
+    """
+
+    stream_mode: str = Field(default="off", description="One of off, file, stdout")
+    stream_callback: Optional[Callable[[str], None]] = Field(
+        default=None, description="Called with each chunk of the report as it is streamed")
+    saved_callback: Optional[Callable[[str, Any], None]] = Field(
+        default=None, description="Called with the output file and the report once the file is saved")
+
+    _stream: Optional[ReportStream] = PrivateAttr(default=None)
+    _run_key: str = PrivateAttr(default="")
+
+    @field_validator("stream_mode")
+    @classmethod
+    def _check_stream_mode(cls, value: str) -> str:
+        if value not in STREAM_MODES:
+            raise ValueError(f"Invalid stream mode: {value}. Must be one of: {', '.join(STREAM_MODES)}")
+        return value
+
+    @property
+    def streaming(self) -> bool:
+        if (self.stream_mode == "off" and self.stream_callback is None) or not self.output_file:
+            return False
+        # Never create a directory the final save would refuse to create
+        return self.create_directory or os.path.isdir(os.path.dirname(self._output_path()))
+
+    def interpolate_inputs_and_add_conversation_history(self, inputs: Dict[str, Any]) -> None:
+        super().interpolate_inputs_and_add_conversation_history(inputs)
+        self._run_key = run_key(inputs)
+
+    def prompt(self) -> str:
+        prompt = super().prompt()
+        partial = read_partial(self._output_path(), self._run_key) if self.streaming else None
+        return prompt + RESUME_NOTE.format(partial=partial) if partial else prompt
+
+    def start_response(self) -> None:
+        if self._stream is not None:
+            self._stream.start_response()
+
+    def stream_chunk(self, chunk: str) -> None:
+        if self.streaming:
+            self._get_stream().feed(chunk)
+
+    def abort_stream(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def _save_file(self, result: Any) -> None:
+        if self.output_file is None:
+            raise ValueError("output_file is not set.")
+        path = self._output_path()
+        directory = os.path.dirname(path)
+        if not self.create_directory and not os.path.isdir(directory):
+            raise RuntimeError(f"Directory {directory} does not exist and create_directory is False")
+        text = json.dumps(result, ensure_ascii=False, indent=2) if isinstance(result, dict) else str(result)
+        stream, self._stream = self._get_stream(), None
+        try:
+            stream.finish(text)
+        except OSError as e:
+            raise RuntimeError(f"Failed to save output file: {e}") from e
+        if self.saved_callback is not None:
+            self.saved_callback(self.output_file, result)
+
+    def _get_stream(self) -> ReportStream:
+        if self._stream is None:
+            echoes = [echo for echo in (_echo_stdout if self.stream_mode == "stdout" else None,
+                                        self.stream_callback) if echo]
+
+            def echo(text: str) -> None:
+                for target in echoes:
+                    target(text)
+
+            self._stream = ReportStream(self._output_path(), echo if echoes else None, self._run_key)
+        return self._stream
+
+    def _output_path(self) -> str:
+        return str(Path(self.output_file).expanduser().resolve())
+
+
+_listeners_installed = False
+_install_lock = threading.Lock()
+
+# Running report tasks by task id. crewAI's LLM events only carry the id of
+# the task that made the call, not the task itself.
+_running: "weakref.WeakValueDictionary[str, ReportTask]" = weakref.WeakValueDictionary()
+
+
+def install_stream_listeners() -> None:
+    """Route crewAI's LLM stream events to the report tasks that produced them."""
+    global _listeners_installed
+    with _install_lock:
+        if _listeners_installed:
+            return
+        from crewai.events import (LLMCallStartedEvent, LLMStreamChunkEvent, TaskCompletedEvent,
+                                   TaskFailedEvent, TaskStartedEvent, crewai_event_bus)
+
+        def on_task_started(source: Any, event: Any) -> None:
+            if isinstance(event.task, ReportTask) and event.task.streaming:
+                _running[str(event.task.id)] = event.task
+
+        def on_task_finished(source: Any, event: Any) -> None:
+            if isinstance(event.task, ReportTask):
+                _running.pop(str(event.task.id), None)
+                event.task.abort_stream()
+
+        def on_call_started(source: Any, event: Any) -> None:
+            task = _running.get(str(event.task_id))
+            if task is not None:
+                task.start_response()
+
+        def on_chunk(source: Any, event: Any) -> None:
+            task = _running.get(str(event.task_id))
+            if task is not None and event.tool_call is None:
+                task.stream_chunk(event.chunk)
+
+        crewai_event_bus.register_handler(TaskStartedEvent, on_task_started)
+        crewai_event_bus.register_handler(TaskCompletedEvent, on_task_finished)
+        crewai_event_bus.register_handler(TaskFailedEvent, on_task_finished)
+        crewai_event_bus.register_handler(LLMCallStartedEvent, on_call_started)
+        crewai_event_bus.register_handler(LLMStreamChunkEvent, on_chunk)
+        _listeners_installed = True
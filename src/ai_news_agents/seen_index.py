@@ -0,0 +1,151 @@
+"""
+Persistent index of sources already covered by earlier reports
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache import cache_dir
+from .tools.fact_check_cache import content_digest, normalize_url
+
+
+INCREMENTAL_ENV = "AI_NEWS_INCREMENTAL"
+
+
+def incremental_from_env() -> bool:
+    """Whether ``AI_NEWS_INCREMENTAL`` asks for incremental runs."""
+    return os.getenv(INCREMENTAL_ENV, "").lower() in ("1", "true", "yes")
+
+
+def text_digest(text: str) -> str:
+    """Digest of extracted page text, insensitive to case and whitespace."""
+    return content_digest(" ".join((text or "").lower().split()))
+
+
+class SeenIndex:
+    """
+    SQLite index of which source versions went into which report.
+
+    ``sources`` holds, per normalized URL, the content digest last reported
+    and when it was first and last seen. ``report_sources`` records every
+    report's members. A source is unchanged when its URL was reported with
+    the same digest, or when the same content was reported under another URL
+    (a syndicated copy).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or cache_dir("seen.sqlite")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "url TEXT PRIMARY KEY, digest TEXT NOT NULL, "
+            "first_seen REAL NOT NULL, last_seen REAL NOT NULL, last_report TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS sources_digest ON sources (digest)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS report_sources ("
+            "report TEXT NOT NULL, url TEXT NOT NULL, digest TEXT NOT NULL, "
+            "decision TEXT NOT NULL, reported_at REAL NOT NULL, PRIMARY KEY (report, url))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS report_sources_digest ON report_sources (digest)")
+        self._db.commit()
+
+    def classify(self, pages: Dict[str, str]) -> Dict[str, str]:
+        """
+        Classify sources by their current content digest.
+
+        Args:
+            pages (Dict[str, str]): Content digest per source URL
+
+        Returns:
+            ``new``, ``changed`` or ``unchanged`` per source URL
+        """
+        status = {}
+        with self._lock:
+            for url, digest in pages.items():
+                row = self._db.execute(
+                    "SELECT digest FROM sources WHERE url = ?", (normalize_url(url),)
+                ).fetchone()
+                if row is not None and row[0] == digest:
+                    status[url] = "unchanged"
+                elif self._db.execute(
+                    "SELECT 1 FROM report_sources WHERE digest = ? LIMIT 1", (digest,)
+                ).fetchone():
+                    status[url] = "unchanged"
+                else:
+                    status[url] = "changed" if row is not None else "new"
+        return status
+
+    def record_report(self, report: str, sources: Iterable[Tuple[str, str, str]]) -> None:
+        """
+        Record the sources that went into a report.
+
+        Args:
+            report (str): Report identifier, e.g. its path and run timestamp
+            sources (Iterable[Tuple[str, str, str]]): ``(url, digest, decision)``
+                per source considered for the report
+        """
+        now = time.time()
+        with self._lock:
+            for url, digest, decision in sources:
+                key = normalize_url(url)
+                self._db.execute(
+                    "INSERT INTO sources (url, digest, first_seen, last_seen, last_report) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                    "digest = excluded.digest, last_seen = excluded.last_seen, "
+                    "last_report = excluded.last_report",
+                    (key, digest, now, now, report),
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO report_sources (report, url, digest, decision, reported_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (report, key, digest, decision, now),
+                )
+            self._db.commit()
+
+    def report_sources(self, report: str) -> List[Dict[str, str]]:
+        """Sources recorded for a report, in insertion order."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, digest, decision FROM report_sources WHERE report = ? ORDER BY rowid",
+                (report,),
+            ).fetchall()
+        return [{"url": url, "digest": digest, "decision": decision} for url, digest, decision in rows]
+
+    def reports(self, url: str) -> List[str]:
+        """Reports a source went into, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT report FROM report_sources WHERE url = ? ORDER BY reported_at",
+                (normalize_url(url),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM sources")
+            self._db.execute("DELETE FROM report_sources")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_default_index: Optional[SeenIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_seen_index() -> SeenIndex:
+    """Return the process-wide seen-content index, opening it on first use."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = SeenIndex()
+        return _default_index
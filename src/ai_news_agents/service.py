@@ -0,0 +1,419 @@
+"""
+Long-lived report service: a local HTTP API in front of a bounded job queue
+and a pool of workers that keep their crews warm between jobs
+"""
+
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cache import cache_dir
+from .rate_limit import call_priority, rate_limit_stats
+from .tracing import span
+
+
+logger = logging.getLogger(__name__)
+
+SERVICE_HOST_ENV = "AI_NEWS_SERVICE_HOST"
+SERVICE_PORT_ENV = "AI_NEWS_SERVICE_PORT"
+SERVICE_WORKERS_ENV = "AI_NEWS_SERVICE_WORKERS"
+SERVICE_QUEUE_ENV = "AI_NEWS_SERVICE_QUEUE"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8477
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 16
+
+# Finished jobs kept for status queries before the oldest are forgotten
+DEFAULT_HISTORY = 500
+
+JOB_STATES = ("queued", "running", "succeeded", "failed", "cancelled")
+
+# Fields a client may set when submitting a job over the API
+JOB_FIELDS = ("topic", "date", "incremental")
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    """One report request and, once it has run, its outcome."""
+
+    def __init__(self, inputs: Dict[str, Any], incremental: Optional[bool] = None,
+                 report_file: Optional[str] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.inputs = inputs
+        self.incremental = incremental
+        self.report_file = report_file
+        self.status = "queued"
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.worker: Optional[int] = None
+        self.output_dir: Optional[str] = None
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "inputs": self.inputs,
+            "incremental": self.incremental,
+            "submitted_at": _timestamp(self.submitted_at),
+            "started_at": _timestamp(self.started_at),
+            "finished_at": _timestamp(self.finished_at),
+            "queued_seconds": _elapsed(self.submitted_at, self.started_at),
+            "run_seconds": _elapsed(self.started_at, self.finished_at),
+            "worker": self.worker,
+            "output_dir": self.output_dir,
+            "report_file": self.report_file,
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class ReportService:
+    """
+    Run report jobs on a fixed pool of worker threads.
+
+    Each worker builds its crew once and kicks off a fresh copy of it per job,
+    so agents, LLM clients, tools and their connection pools stay warm while
+    every job still starts with clean task outputs and an empty tool-result
+    cache. Task output files are redirected into a directory per job so
+    concurrent jobs never overwrite each other. The fetcher, search, LLM and
+    fact-check caches are process-wide and shared by all workers.
+
+    Submissions beyond ``queue_size`` waiting jobs raise :class:`QueueFull`.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 crew_factory: Optional[Callable[[], Any]] = None, output_root: Optional[str] = None,
+                 history: int = DEFAULT_HISTORY):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.crew_factory = crew_factory or _default_crew_factory
+        self.output_root = output_root or cache_dir("service", "jobs")
+        self.history = history
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=queue_size)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._warm = 0
+        self._completed = 0
+        self._failed = 0
+
+    def start(self) -> "ReportService":
+        _skip_trace_prompt()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, args=(index,), name=f"report-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, wait: bool = True) -> None:
+        """Let the workers finish the queued jobs, then stop them."""
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def submit(self, topic: str, date: Optional[str] = None, incremental: Optional[bool] = None,
+               report_file: Optional[str] = None, **inputs: Any) -> Job:
+        """
+        Queue a report on ``topic``; ``date`` defaults to today. The final
+        report goes to ``report_file`` when given, otherwise into the job's
+        output directory with the other task outputs.
+        """
+        job = Job({"topic": topic, "date": date or datetime.now().strftime("%Y-%m-%d"), **inputs}, incremental,
+                  report_file)
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFull(f"Job queue is full ({self.queue_size} jobs waiting)") from None
+            self._jobs[job.id] = job
+            self._forget_old_jobs()
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "queued":
+                return False
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            return True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll: float = 0.05) -> Optional[Job]:
+        """Block until the job finishes or ``timeout`` seconds pass."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job.finished or (deadline is not None and time.monotonic() >= deadline):
+                return job
+            time.sleep(poll)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {state: 0 for state in JOB_STATES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {
+                "workers": self.workers,
+                "warm_workers": self._warm,
+                "queue_size": self.queue_size,
+                "jobs": counts,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rate_limits": rate_limit_stats(),
+            }
+
+    def _forget_old_jobs(self) -> None:
+        excess = len(self._jobs) - self.history
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    def _work(self, index: int) -> None:
+        try:
+            crew_instance, template = self._build_crew()
+        except Exception:
+            logger.exception("Worker %d could not build its crew; retrying on its first job", index)
+            crew_instance = template = None
+        incremental = getattr(crew_instance, "incremental", False)
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                if job.status == "cancelled":
+                    continue
+                job.status = "running"
+                job.worker = index
+                job.started_at = time.time()
+            try:
+                if template is None:
+                    crew_instance, template = self._build_crew()
+                    incremental = crew_instance.incremental
+                crew_instance.incremental = incremental if job.incremental is None else job.incremental
+                job.result = self._run(job, template)
+                status = "succeeded"
+            except Exception as e:
+                logger.exception("Report job %s failed", job.id)
+                job.error = f"{type(e).__name__}: {e}"
+                status = "failed"
+            with self._lock:
+                job.status = status
+                job.finished_at = time.time()
+                self._completed += status == "succeeded"
+                self._failed += status == "failed"
+
+    def _build_crew(self) -> Tuple[Any, Any]:
+        crew_instance = self.crew_factory()
+        template = crew_instance.crew()
+        with self._lock:
+            self._warm += 1
+        return crew_instance, template
+
+    def _run(self, job: Job, template: Any) -> str:
+        # A copy shares the template's agents, LLMs and tools but gets fresh
+        # task outputs and its own tool-result cache
+        crew = template.copy()
+        job.output_dir = os.path.join(self.output_root, job.id)
+        for task in crew.tasks:
+            if task.output_file:
+                task.output_file = os.path.join(job.output_dir, task.output_file)
+        if job.report_file:
+            crew.tasks[-1].output_file = job.report_file
+        # Earlier jobs get the rate-limited APIs first, so a burst finishes
+        # jobs one after another instead of all of them late
+        with span("service.job", job=job.id, topic=job.inputs.get("topic"), worker=job.worker), \
+                call_priority(job.submitted_at):
+            output = crew.kickoff(inputs=dict(job.inputs))
+        return output.raw
+
+
+def _default_crew_factory() -> Any:
+    from .crew import AiNewsAgents
+    return AiNewsAgents()
+
+
+def _skip_trace_prompt() -> None:
+    # crewAI asks first-time users on stdin whether to upload traces, waiting
+    # up to 20 seconds after every kickoff for as long as the process lives.
+    # Nobody answers a service, so record the question as already answered.
+    try:
+        from crewai.events.listeners.tracing.trace_listener import TraceCollectionListener
+        from crewai.events.listeners.tracing.utils import mark_first_execution_done
+    except ImportError:
+        return
+    mark_first_execution_done()
+    listener = getattr(TraceCollectionListener, "_instance", None)
+    if listener is not None and hasattr(listener, "first_time_handler"):
+        listener.first_time_handler.is_first_time = False
+
+
+def _timestamp(value: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(value).isoformat(timespec="seconds") if value else None
+
+
+def _elapsed(start: Optional[float], end: Optional[float]) -> Optional[float]:
+    return round(end - start, 3) if start and end else None
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    JSON API over a :class:`ReportService`:
+
+    - ``POST /jobs`` with ``{"topic": ..., "date": ..., "incremental": ...}`` queues a
+      report (202), or answers 429 when the queue is full
+    - ``GET /jobs`` lists jobs, ``GET /jobs/<id>`` returns one job's status
+    - ``GET /jobs/<id>/report`` returns the finished report as Markdown
+    - ``DELETE /jobs/<id>`` cancels a job that has not started
+    - ``GET /health`` returns worker and queue counts
+    """
+
+    service: ReportService
+    server_version = "AiNewsAgents"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self) -> None:
+        parts = self._path_parts()
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", **self.service.stats()})
+        elif parts == ["jobs"]:
+            self._send_json(200, {"jobs": [job.to_dict() for job in self.service.jobs()]})
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.service.get(parts[1])
+            if job is None:
+                self._send_json(404, {"error": f"Unknown job: {parts[1]}"})
+            elif len(parts) == 2:
+                self._send_json(200, job.to_dict(include_result=True))
+            elif parts[2] != "report":
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            elif job.status != "succeeded":
+                self._send_json(409, {"error": f"Job is {job.status}", "status": job.status})
+            else:
+                self._send(200, (job.result or "").encode("utf-8"), "text/markdown; charset=utf-8")
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        if self._path_parts() != ["jobs"]:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        # Clients choose what to report on, not where the server writes files
+        # or what else goes into the crew's inputs
+        unknown = sorted(set(body) - set(JOB_FIELDS))
+        if unknown:
+            self._send_json(400, {"error": f"Unknown field(s): {', '.join(unknown)}. "
+                                           f"Allowed: {', '.join(JOB_FIELDS)}"})
+            return
+        topic, date, incremental = body.get("topic"), body.get("date"), body.get("incremental")
+        if not isinstance(topic, str) or not topic.strip():
+            self._send_json(400, {"error": "Missing 'topic'"})
+            return
+        if date is not None and not (isinstance(date, str) and re.fullmatch(r"\d{4}-\d{2}-\d{2}", date)):
+            self._send_json(400, {"error": "'date' must be a YYYY-MM-DD string"})
+            return
+        if incremental is not None and not isinstance(incremental, bool):
+            self._send_json(400, {"error": "'incremental' must be true or false"})
+            return
+        try:
+            job = self.service.submit(topic.strip(), date=date, incremental=incremental)
+        except QueueFull as e:
+            self._send_json(429, {"error": str(e)}, headers={"Retry-After": "30"})
+            return
+        self._send_json(202, job.to_dict(), headers={"Location": f"/jobs/{job.id}"})
+
+    def do_DELETE(self) -> None:
+        parts = self._path_parts()
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+        elif self.service.cancel(parts[1]):
+            self._send_json(200, self.service.get(parts[1]).to_dict())
+        else:
+            job = self.service.get(parts[1])
+            self._send_json(404 if job is None else 409,
+                            {"error": f"Unknown job: {parts[1]}" if job is None else f"Job is {job.status}"})
+
+    def _path_parts(self) -> List[str]:
+        return [part for part in self.path.split("?", 1)[0].split("/") if part]
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(service: ReportService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Bind the JSON API for ``service``; call ``serve_forever()`` on the result."""
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(host: Optional[str] = None, port: Optional[int] = None, workers: Optional[int] = None,
+          queue_size: Optional[int] = None) -> None:
+    """Start the worker pool and serve the API until interrupted."""
+    host = host or os.getenv(SERVICE_HOST_ENV, DEFAULT_HOST)
+    port = port if port is not None else int(os.getenv(SERVICE_PORT_ENV, DEFAULT_PORT))
+    workers = workers or int(os.getenv(SERVICE_WORKERS_ENV, DEFAULT_WORKERS))
+    queue_size = queue_size or int(os.getenv(SERVICE_QUEUE_ENV, DEFAULT_QUEUE_SIZE))
+
+    service = ReportService(workers=workers, queue_size=queue_size).start()
+    server = create_server(service, host, port)
+    print(f"Serving reports on http://{host}:{server.server_port} with {workers} workers "
+          f"(queue of {queue_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down; waiting for running jobs...")
+    finally:
+        server.server_close()
+        service.stop()
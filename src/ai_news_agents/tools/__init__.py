@@ -1,3 +1,11 @@
-from .fact_check_functions import fact_check_source, validate_sources
+from .fact_check_functions import fact_check_source, fact_check_sources, validate_sources
+from .domain_reputation import DomainReputationIndex, get_reputation_index, set_reputation_index
+from .fact_check_cache import FactCheckCache, get_fact_check_cache, normalize_url
+from .lexicon import LexiconScanner, get_lexicon_scanner, load_lexicons, set_lexicon_scanner
 
-__all__ = ['fact_check_source', 'validate_sources']
\ No newline at end of file
+__all__ = [
+    'fact_check_source', 'fact_check_sources', 'validate_sources',
+    'DomainReputationIndex', 'get_reputation_index', 'set_reputation_index',
+    'FactCheckCache', 'get_fact_check_cache', 'normalize_url',
+    'LexiconScanner', 'get_lexicon_scanner', 'load_lexicons', 'set_lexicon_scanner',
+]
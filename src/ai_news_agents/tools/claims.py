@@ -0,0 +1,257 @@
+"""
+Cross-source claim consensus: which sentences of a source other sources
+repeat, and which they contradict
+"""
+
+import itertools
+import re
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Set, Tuple
+
+import numpy as np
+
+
+# Claims are sentences of this many words; shorter ones are mostly
+# headings and captions, longer ones run-ons from scraped markup
+MIN_CLAIM_WORDS = 6
+MAX_CLAIM_WORDS = 60
+
+MAX_CLAIMS_PER_SOURCE = 400
+
+# Cosine similarity of TF-IDF vectors above which two claims from different
+# sources state the same thing. Numbers and negations are kept out of the
+# vectors, so claims differing only in them match and are then told apart.
+CLAIM_MATCH_THRESHOLD = 0.5
+
+# Upper bound on candidate pairs expanded at once by the similarity join
+PAIR_BATCH = 2_000_000
+
+CLAIM_LABELS = ("corroborated", "single_source", "conflicting")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+_WORD = re.compile(r"[a-z][a-z'’-]*[a-z]")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*%?")
+_NEGATION = re.compile(r"\b(?:not|no|never|none|neither|nor|cannot|denie[sd]|deny|false|without)\b|n[’']t\b")
+
+_STOPWORDS = frozenset(
+    "a about after all also an and any are as at be been before being but by can could did do does for from "
+    "had has have he her his how i if in into is it its just may might more most much must not of on one only "
+    "or other our out over said says she should so some such than that the their them then there these they "
+    "this those to under up was we were what when where which while who will with would you no never nor "
+    "without cannot".split()
+)
+
+
+def extract_claims(text: str, limit: int = MAX_CLAIMS_PER_SOURCE) -> List[str]:
+    """The distinct sentences of a text that are long enough to state a fact, in order."""
+    claims: List[str] = []
+    seen = set()
+    for line in (text or "").splitlines():
+        for sentence in _SENTENCE_END.split(line.strip()):
+            words = sentence.split()
+            if not MIN_CLAIM_WORDS <= len(words) <= MAX_CLAIM_WORDS:
+                continue
+            sentence = " ".join(words)
+            key = sentence.lower()
+            if key not in seen:
+                seen.add(key)
+                claims.append(sentence)
+                if len(claims) >= limit:
+                    return claims
+    return claims
+
+
+def _terms(claim: str) -> Set[str]:
+    """A claim's distinct unigram and bigram terms; numbers and stopwords are left out."""
+    words = [word for word in _WORD.findall(claim.lower()) if word not in _STOPWORDS]
+    terms = set(words)
+    terms.update(map(" ".join, zip(words, words[1:])))
+    return terms
+
+
+def _qualifiers(claim: str) -> Tuple[FrozenSet[str], bool]:
+    """A claim's numbers and whether it is negated."""
+    numbers = frozenset(number.replace(",", "") for number in _NUMBER.findall(claim))
+    return numbers, bool(_NEGATION.search(claim.lower()))
+
+
+def _tfidf(claim_terms: List[Set[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sparse L2-normalized TF-IDF entries as (claim, term, weight) arrays,
+    ordered by claim, plus each term's claim count. Sentences rarely repeat
+    a term, so term frequency is binary. IDF is smoothed so that terms in
+    every claim, as when all sources state the same sentence, keep weight.
+    """
+    vocabulary: Dict[str, int] = defaultdict(itertools.count().__next__)
+    sizes = np.fromiter(map(len, claim_terms), dtype=np.int64, count=len(claim_terms))
+    columns = np.fromiter(map(vocabulary.__getitem__, itertools.chain.from_iterable(claim_terms)),
+                          dtype=np.int64, count=int(sizes.sum()))
+    rows = np.repeat(np.arange(len(claim_terms)), sizes)
+    frequency = np.bincount(columns, minlength=len(vocabulary))
+    weights = np.log((1.0 + len(claim_terms)) / (1.0 + frequency[columns])) + 1.0
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(claim_terms)))
+    weights = np.divide(weights, norms[rows], out=np.zeros_like(weights), where=norms[rows] > 0)
+    return rows, columns, weights, frequency
+
+
+def _expand(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """For ``counts[i]`` items of each owner ``i``: the owner and the offset of every item."""
+    total = int(counts.sum())
+    owners = np.repeat(np.arange(len(counts)), counts)
+    return owners, np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def similar_pairs(claim_terms: List[Set[str]], groups: np.ndarray,
+                  threshold: float = CLAIM_MATCH_THRESHOLD) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pairs ``(i, j)``, ``i < j``, of claims in different ``groups`` whose TF-IDF
+    cosine similarity is at least ``threshold``.
+
+    The similarity matrix is the sparse product of the claim-term matrix with
+    its transpose, computed as a vectorized join over each term's postings.
+    Frequent terms would make that join quadratic, so it uses prefix
+    filtering: each claim's terms are ordered rarest first, and the terms
+    after its shortest prefix whose remainder has a norm below ``threshold``
+    are only joined against other claims' prefixes. Two claims that share no
+    prefix term cannot reach the threshold. The candidate pairs' remaining
+    similarity, from terms both hold outside their prefixes, is bounded by
+    the product of those remainders' norms and looked up exactly for the
+    pairs the bound cannot rule out. Postings are expanded in batches of at
+    most ``PAIR_BATCH`` pairs.
+
+    Returns the first claims, the second claims and the similarities.
+    """
+    rows, columns, weights, frequency = _tfidf(claim_terms)
+    claims, terms = len(claim_terms), len(frequency)
+    empty = np.zeros(0, dtype=np.int64)
+    if not len(rows):
+        return empty, empty, np.zeros(0)
+
+    # Rarest terms first within each claim (any order is exact, this one
+    # keeps prefixes short); an entry is in the prefix while the norm of it
+    # and the claim's later entries reaches the threshold
+    order = np.argsort(rows * (int(frequency.max()) + 1) + frequency[columns])
+    rows, columns, weights = rows[order], columns[order], weights[order]
+    squares = weights * weights
+    row_total = np.bincount(rows, weights=squares, minlength=claims)
+    before = np.cumsum(squares) - squares
+    row_start = np.r_[0, np.cumsum(np.bincount(rows, minlength=claims))[:-1]]
+    remaining = row_total[rows] - (before - before[row_start[rows]])
+    prefix = remaining >= threshold * threshold - 1e-12
+    rest_norm = np.sqrt(np.maximum(np.bincount(rows, weights=np.where(prefix, 0.0, squares), minlength=claims), 0.0))
+
+    # Postings of terms in more than one claim, prefix entries first; each
+    # prefix entry pairs with every later entry of its term
+    shared = frequency[columns] > 1
+    postings = np.argsort(columns[shared] * 2 + ~prefix[shared])
+    p_rows, p_columns, p_weights, p_prefix = (rows[shared][postings], columns[shared][postings],
+                                              weights[shared][postings], prefix[shared][postings])
+    starts = np.flatnonzero(np.r_[True, p_columns[1:] != p_columns[:-1]])
+    sizes = np.diff(np.r_[starts, len(p_columns)])
+    later = np.where(p_prefix, np.repeat(starts + sizes, sizes) - np.arange(len(p_columns)) - 1, 0)
+    cumulative = np.cumsum(later)
+
+    keys: List[np.ndarray] = []
+    scores: List[np.ndarray] = []
+    begin = 0
+    while begin < len(later):
+        done = cumulative[begin - 1] if begin else 0
+        end = max(int(np.searchsorted(cumulative, done + PAIR_BATCH, side="right")), begin + 1)
+        owners, offsets = _expand(later[begin:end])
+        if len(owners):
+            left = owners + begin
+            right = left + offsets + 1
+            first, second = p_rows[left], p_rows[right]
+            cross = groups[first] != groups[second]
+            first, second = first[cross], second[cross]
+            keys.append(np.minimum(first, second) * claims + np.maximum(first, second))
+            scores.append(p_weights[left[cross]] * p_weights[right[cross]])
+        begin = end
+    if not keys:
+        return empty, empty, np.zeros(0)
+
+    pair_keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    similarity = np.bincount(inverse, weights=np.concatenate(scores))
+    first, second = np.divmod(pair_keys, claims)
+    bound = rest_norm[first] * rest_norm[second]
+    candidate = similarity + bound >= threshold
+    first, second, similarity, bound = first[candidate], second[candidate], similarity[candidate], bound[candidate]
+
+    # Add the similarity of the terms both claims hold outside their prefix
+    undecided = np.flatnonzero(bound > 0)
+    if len(undecided):
+        suffix = ~prefix
+        s_rows, s_columns, s_weights = rows[suffix], columns[suffix], weights[suffix]
+        s_keys = s_rows * terms + s_columns
+        s_order = np.argsort(s_keys, kind="stable")
+        s_keys, s_weights, s_columns, s_rows = s_keys[s_order], s_weights[s_order], s_columns[s_order], s_rows[s_order]
+        s_start = np.searchsorted(s_rows, first[undecided], side="left")
+        s_count = np.searchsorted(s_rows, first[undecided], side="right") - s_start
+        owners, offsets = _expand(s_count)
+        entry = s_start[owners] + offsets
+        target = second[undecided][owners] * terms + s_columns[entry]
+        found = np.minimum(np.searchsorted(s_keys, target), len(s_keys) - 1)
+        hit = s_keys[found] == target
+        similarity[undecided] += np.bincount(owners[hit], weights=s_weights[entry[hit]] * s_weights[found[hit]],
+                                             minlength=len(undecided))
+
+    matched = similarity >= threshold
+    return first[matched], second[matched], similarity[matched]
+
+
+def claim_consensus(texts: Dict[str, str], threshold: float = CLAIM_MATCH_THRESHOLD) -> Dict[str, Any]:
+    """
+    Label every claim of every source by what the other sources say.
+
+    A claim is ``corroborated`` when a claim of another source matches it,
+    ``conflicting`` when a matching claim disagrees on a number (each side
+    states a figure the other lacks) or on negation, and ``single_source``
+    otherwise. Conflicts take precedence over corroboration.
+
+    Args:
+        texts (Dict[str, str]): Text per source; claims of one source never
+            corroborate each other
+        threshold (float): TF-IDF cosine similarity at which claims match
+
+    Returns:
+        Dict with ``claims`` (one entry per claim with ``source``, ``text``,
+        ``label``, ``corroborating_sources`` and ``conflicting_sources``),
+        ``counts`` per label and ``conflicts`` (claim index pairs, most
+        similar first)
+    """
+    names = list(texts)
+    claims: List[Tuple[int, str]] = [(index, claim) for index, name in enumerate(names)
+                                     for claim in extract_claims(texts[name])]
+    groups = np.asarray([index for index, _ in claims], dtype=np.int64)
+    first, second, similarity = similar_pairs([_terms(claim) for _, claim in claims], groups, threshold)
+
+    # Numbers and negation only matter for claims that matched another
+    qualifiers = {index: _qualifiers(claims[index][1]) for index in np.unique(np.r_[first, second]).tolist()}
+    disagree = np.zeros(len(first), dtype=bool)
+    for position, (left, right) in enumerate(zip(first.tolist(), second.tolist())):
+        (left_numbers, left_negated), (right_numbers, right_negated) = qualifiers[left], qualifiers[right]
+        disagree[position] = (left_negated != right_negated
+                              or bool(left_numbers - right_numbers) and bool(right_numbers - left_numbers))
+
+    def other_sources(mask: np.ndarray) -> np.ndarray:
+        # Distinct other sources per claim among the pairs selected by mask
+        claim = np.r_[first[mask], second[mask]]
+        other = np.r_[groups[second[mask]], groups[first[mask]]]
+        unique = np.unique(claim * max(len(names), 1) + other)
+        return np.bincount(unique // max(len(names), 1), minlength=len(claims))
+
+    corroborating = other_sources(~disagree)
+    conflicting = other_sources(disagree)
+    labels = np.where(conflicting > 0, 2, np.where(corroborating > 0, 0, 1))
+
+    conflicts = np.flatnonzero(disagree)
+    conflicts = conflicts[np.argsort(-similarity[conflicts], kind="stable")]
+    return {
+        "claims": [
+            {"source": names[index], "text": claim, "label": CLAIM_LABELS[label],
+             "corroborating_sources": int(agree), "conflicting_sources": int(against)}
+            for (index, claim), label, agree, against in zip(claims, labels, corroborating, conflicting)
+        ],
+        "counts": {name: int(np.count_nonzero(labels == code)) for code, name in enumerate(CLAIM_LABELS)},
+        "conflicts": [(int(first[position]), int(second[position])) for position in conflicts],
+    }
@@ -0,0 +1,252 @@
+"""
+Domain reputation index for fact-checking
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..cache import write_atomic
+
+
+# Known reputable news sources shipped with the package
+DEFAULT_HIGH_CREDIBILITY_DOMAINS = (
+    'reuters.com', 'apnews.com', 'bbc.com', 'npr.org', 'pbs.org',
+    'wsj.com', 'nytimes.com', 'washingtonpost.com', 'theguardian.com',
+    'cnn.com', 'abcnews.go.com', 'cbsnews.com', 'nbcnews.com',
+    'techcrunch.com', 'wired.com', 'arstechnica.com', 'nature.com',
+    'science.org', 'mit.edu', 'stanford.edu', 'harvard.edu'
+)
+
+# Keywords suggesting a biased or low-credibility domain, used when the
+# host is not in the index
+DEFAULT_LOW_CREDIBILITY_INDICATORS = (
+    '.blog', 'fake', 'conspiracy', 'truth', 'patriot', 'freedom',
+    'real', 'expose', 'leak', 'insider', 'underground'
+)
+
+REPUTATION_LIST_ENV = "AI_NEWS_REPUTATION_LIST"
+
+_INDEX_FORMAT = "ai-news-reputation/2"
+
+
+class DomainReputationIndex:
+    """
+    Suffix-matched lookup table of domain reputations.
+
+    Entries are stored in a hash keyed by registrable domain. A lookup walks
+    the host's labels from the most specific suffix to the least specific
+    one, so it costs O(number of labels) and only matches on whole labels:
+    ``news.reuters.com`` matches ``reuters.com``, ``notreuters.com.evil.io``
+    does not.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, str]] = {}
+        self._version: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, domain: str) -> bool:
+        return _normalize_domain(domain) in self._entries
+
+    @property
+    def version(self) -> str:
+        """Digest of the index contents, independent of how they were built."""
+        if self._version is None:
+            digest = hashlib.sha256()
+            for domain in sorted(self._entries):
+                tier, source_type = self._entries[domain]
+                digest.update(f"{domain}\t{tier}\t{source_type}\n".encode("utf-8"))
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
+    def add(self, domain: str, tier: str, source_type: str) -> None:
+        """Add or replace the reputation of a domain and its subdomains."""
+        domain = _normalize_domain(domain)
+        if not domain:
+            return
+        self._entries[domain] = (tier, source_type)
+        self._version = None
+
+    def update(self, entries: Iterable[Tuple[str, str, str]]) -> None:
+        """Add many ``(domain, tier, source_type)`` entries."""
+        for domain, tier, source_type in entries:
+            self.add(domain, tier, source_type)
+
+    def lookup(self, host: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Find the most specific entry covering a host.
+
+        Args:
+            host (str): Hostname, e.g. ``www.bbc.com``
+
+        Returns:
+            ``(matched_domain, tier, source_type)`` or None if no suffix of
+            the host is indexed
+        """
+        host = _normalize_domain(host)
+        entries = self._entries
+        while host:
+            entry = entries.get(host)
+            if entry is not None:
+                return (host, entry[0], entry[1])
+            dot = host.find('.')
+            if dot < 0:
+                break
+            host = host[dot + 1:]
+        return None
+
+    def load_text(self, path: str, tier: str = "high",
+                  source_type: str = "established_media") -> int:
+        """
+        Load a plain-text reputation list.
+
+        Each non-empty line holds a domain optionally followed by a tier and a
+        source type, separated by commas, tabs or spaces. Lines starting with
+        ``#`` are ignored. Missing columns fall back to the given defaults.
+
+        Returns:
+            Number of entries read
+        """
+        count = 0
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                fields = line.replace(',', ' ').split()
+                self.add(
+                    fields[0],
+                    fields[1] if len(fields) > 1 else tier,
+                    fields[2] if len(fields) > 2 else source_type,
+                )
+                count += 1
+        return count
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a compact JSON file: the distinct tiers and source
+        types, the domains, and a pair of tier and type codes per domain.
+        """
+        tiers = sorted({tier for tier, _ in self._entries.values()})
+        types = sorted({source_type for _, source_type in self._entries.values()})
+        tier_ids = {tier: i for i, tier in enumerate(tiers)}
+        type_ids = {source_type: i for i, source_type in enumerate(types)}
+        payload = {
+            "format": _INDEX_FORMAT,
+            "version": self.version,
+            "tiers": tiers,
+            "types": types,
+            "domains": list(self._entries),
+            "codes": [
+                code
+                for tier, source_type in self._entries.values()
+                for code in (tier_ids[tier], type_ids[source_type])
+            ],
+        }
+        write_atomic(path, json.dumps(payload, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, path: str) -> "DomainReputationIndex":
+        """
+        Read an index written by :meth:`save`. The version is recomputed
+        from the entries read.
+
+        Raises:
+            ValueError: If the file is not a well-formed index
+        """
+        with open(path, "rb") as handle:
+            payload = json.loads(handle.read())
+        if not isinstance(payload, dict) or payload.get("format") != _INDEX_FORMAT:
+            raise ValueError(f"Not a domain reputation index: {path}")
+        tiers, types, domains, codes = (payload.get(key) for key in ("tiers", "types", "domains", "codes"))
+        if not (_strings(tiers) and _strings(types) and _strings(domains) and isinstance(codes, list)
+                and len(codes) == 2 * len(domains)
+                and all(type(code) is int for code in codes)
+                and all(0 <= code < len(tiers) for code in codes[0::2])
+                and all(0 <= code < len(types) for code in codes[1::2])):
+            raise ValueError(f"Malformed domain reputation index: {path}")
+        index = cls()
+        index._entries = {
+            _normalize_domain(domain): (tiers[codes[2 * i]], types[codes[2 * i + 1]])
+            for i, domain in enumerate(domains)
+        }
+        return index
+
+    @classmethod
+    def from_file(cls, path: str) -> "DomainReputationIndex":
+        """
+        Build an index of the built-in domains plus a text list or a compiled
+        ``.idx`` file. For a text list, a compiled ``.idx`` file next to it
+        is reused when that file is newer than the list.
+        """
+        if path.endswith(".idx"):
+            return cls.with_defaults()._merge(cls.load(path))
+        compiled_path = f"{path}.idx"
+        try:
+            if os.path.getmtime(compiled_path) >= os.path.getmtime(path):
+                # Merged anyway, in case the built-in domains changed since
+                return cls.with_defaults()._merge(cls.load(compiled_path))
+        except (OSError, ValueError):
+            pass
+        index = cls.with_defaults()
+        index.load_text(path)
+        try:
+            index.save(compiled_path)
+        except OSError:
+            pass
+        return index
+
+    def _merge(self, other: "DomainReputationIndex") -> "DomainReputationIndex":
+        self._entries.update(other._entries)
+        self._version = None
+        return self
+
+    @classmethod
+    def with_defaults(cls) -> "DomainReputationIndex":
+        """Create an index holding the built-in high-credibility domains."""
+        index = cls()
+        for domain in DEFAULT_HIGH_CREDIBILITY_DOMAINS:
+            index.add(domain, "high", "established_media")
+        return index
+
+
+_default_index: Optional[DomainReputationIndex] = None
+
+
+def get_reputation_index() -> DomainReputationIndex:
+    """
+    Return the process-wide reputation index, building it on first use.
+
+    The built-in domains are always present. If the ``AI_NEWS_REPUTATION_LIST``
+    environment variable points to a text list or a compiled ``.idx`` file,
+    its entries are loaded as well.
+    """
+    global _default_index
+    if _default_index is None:
+        path = os.getenv(REPUTATION_LIST_ENV)
+        if path:
+            _default_index = DomainReputationIndex.from_file(path)
+        else:
+            _default_index = DomainReputationIndex.with_defaults()
+    return _default_index
+
+
+def set_reputation_index(index: Optional[DomainReputationIndex]) -> None:
+    """Replace the process-wide index. Passing None resets it to the default."""
+    global _default_index
+    _default_index = index
+
+
+def _strings(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _normalize_domain(domain: str) -> str:
+    domain = domain.strip().lower().rstrip('.')
+    if domain.startswith("www."):
+        domain = domain[4:]
+    return domain
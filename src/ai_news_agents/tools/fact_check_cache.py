@@ -0,0 +1,222 @@
+"""
+Persistent memoization cache for fact-check results
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..cache import cache_dir
+from .domain_reputation import get_reputation_index
+from .lexicon import get_lexicon_scanner
+
+
+# Bump when the shape or scoring of fact_check_source results changes
+RESULT_FORMAT_VERSION = "1"
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a cache key.
+
+    Lowercases the scheme and host, drops default ports, fragments, trailing
+    slashes and tracking parameters, and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    netloc = host
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    ))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def _for_url(result: Dict[str, Any], url: str) -> Dict[str, Any]:
+    result["url"] = url
+    if "domain" in result:
+        result["domain"] = urlsplit(url).netloc.lower()
+    return result
+
+
+def content_digest(content: str) -> str:
+    """Return a hex digest identifying a piece of content."""
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class FactCheckCache:
+    """
+    Two-level cache of fact-check results.
+
+    An in-memory LRU sits in front of a SQLite table. Entries are keyed by the
+    normalized URL plus a digest of the content, expire after ``ttl`` seconds,
+    and the table is trimmed to ``max_entries`` rows, oldest first. Every entry
+    records the reputation-index and lexicon versions it was computed with;
+    entries from other versions are dropped when the cache is opened and never
+    returned.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 24 * 3600,
+                 max_entries: int = 200_000, memory_entries: int = 4096):
+        self.path = path or cache_dir("fact_check.sqlite")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = self._current_version()
+        self._stores_since_trim = 0
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fact_checks ("
+            "key TEXT PRIMARY KEY, version TEXT NOT NULL, "
+            "created_at REAL NOT NULL, result TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS fact_checks_created ON fact_checks (created_at)")
+        self._db.execute("DELETE FROM fact_checks WHERE version != ?", (self._version,))
+        self._db.commit()
+
+    @property
+    def version(self) -> str:
+        """Version tag of the analysis inputs the cached results depend on."""
+        return self._version
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return hits / lookups if lookups else 0.0
+
+    def get(self, url: str, content: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for a URL and content, or None.
+
+        The entry may have been stored for another spelling of the same
+        normalized URL, so the result's ``url`` and ``domain`` are set to the
+        requested URL's.
+        """
+        with self._lock:
+            self._check_version()
+            key = self._key(url, content)
+            now = time.time()
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return _for_url(json.loads(json.dumps(entry[1])), url)
+                del self._memory[key]
+            row = self._db.execute(
+                "SELECT created_at, result FROM fact_checks WHERE key = ? AND version = ?",
+                (key, self._version),
+            ).fetchone()
+            if row is None or now - row[0] > self.ttl:
+                self.stats["misses"] += 1
+                return None
+            result = json.loads(row[1])
+            self._remember(key, row[0], result)
+            self.stats["disk_hits"] += 1
+            return _for_url(json.loads(row[1]), url)
+
+    def put(self, url: str, content: str, result: Dict[str, Any]) -> None:
+        """Store a fact-check result. Results carrying an error are not cached."""
+        if result.get("error"):
+            return
+        with self._lock:
+            self._check_version()
+            key = self._key(url, content)
+            now = time.time()
+            self._remember(key, now, json.loads(json.dumps(result)))
+            self._db.execute(
+                "INSERT OR REPLACE INTO fact_checks (key, version, created_at, result) VALUES (?, ?, ?, ?)",
+                (key, self._version, now, json.dumps(result)),
+            )
+            self.stats["stores"] += 1
+            self._stores_since_trim += 1
+            if self._stores_since_trim >= 256:
+                self._trim()
+            self._db.commit()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM fact_checks")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._trim()
+            self._db.commit()
+            self._db.close()
+
+    def _key(self, url: str, content: str) -> str:
+        return hashlib.sha256(f"{normalize_url(url)}\0{content_digest(content)}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, created_at: float, result: Dict[str, Any]) -> None:
+        self._memory[key] = (created_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _trim(self) -> None:
+        self._stores_since_trim = 0
+        cutoff = time.time() - self.ttl
+        expired = self._db.execute("DELETE FROM fact_checks WHERE created_at < ?", (cutoff,)).rowcount
+        count = self._db.execute("SELECT COUNT(*) FROM fact_checks").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM fact_checks WHERE key IN "
+                "(SELECT key FROM fact_checks ORDER BY created_at LIMIT ?)",
+                (overflow,),
+            )
+        self.stats["evictions"] += max(expired, 0) + max(overflow, 0)
+
+    def _check_version(self) -> None:
+        version = self._current_version()
+        if version != self._version:
+            self._version = version
+            self._memory.clear()
+            self._db.execute("DELETE FROM fact_checks WHERE version != ?", (version,))
+            # Commit at once: get() would otherwise hold the write lock
+            self._db.commit()
+
+    @staticmethod
+    def _current_version() -> str:
+        return "-".join((
+            RESULT_FORMAT_VERSION,
+            get_reputation_index().version,
+            get_lexicon_scanner().version,
+        ))
+
+
+_default_cache: Optional[FactCheckCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_fact_check_cache() -> FactCheckCache:
+    """Return the process-wide fact-check cache, opening it on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = FactCheckCache()
+        return _default_cache
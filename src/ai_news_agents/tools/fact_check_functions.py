@@ -2,63 +2,150 @@
 Simple fact-checking functions for CrewAI
 """
 
-from typing import Dict, List, Any
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from urllib.parse import urlparse
 
+from .claims import claim_consensus
+from .domain_reputation import DEFAULT_LOW_CREDIBILITY_INDICATORS, get_reputation_index
+from .fact_check_cache import FactCheckCache
+from .lexicon import get_lexicon_scanner, set_lexicon_scanner
 
-def fact_check_source(url: str, content: str = "") -> Dict[str, Any]:
+
+def fact_check_source(url: str, content: str = "",
+                      cache: Optional[FactCheckCache] = None) -> Dict[str, Any]:
     """
     Perform fact-checking on a given URL and optionally its content.
     
     Args:
         url (str): The URL to fact-check
         content (str): Optional content to analyze
+        cache (FactCheckCache): Optional cache to read from and store into
         
     Returns:
         Dict containing credibility score, bias indicators, and recommendations
     """
-    result = {
-        "url": url,
-        "credibility_score": 0,
-        "domain_reputation": "unknown",
-        "bias_indicators": [],
-        "red_flags": [],
-        "recommendations": [],
-        "source_type": "unknown",
-        "last_updated": "unknown"
-    }
+    if cache is not None:
+        result = cache.get(url, content)
+        if result is None:
+            result = fact_check_source(url, content)
+            cache.put(url, content, result)
+        return result
     
     try:
         # Analyze domain reputation
         domain_analysis = _analyze_domain(url)
-        result.update(domain_analysis)
         
         # Check for bias indicators in content
-        if content:
-            bias_analysis = _analyze_content_bias(content)
-            result.update(bias_analysis)
+        bias_analysis = _analyze_content_bias(content) if content else None
+    except Exception as e:
+        return _build_result(url, error=e)
+    
+    return _build_result(url, domain_analysis, bias_analysis)
+
+
+def fact_check_sources(items: Iterable[Tuple[str, str]], workers: int = 1,
+                       chunk_size: int = 32,
+                       cache: Optional[FactCheckCache] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Fact-check many (url, content) pairs, streaming results in input order.
+    
+    Domain analysis runs once per distinct host in the batch. With more than
+    one worker, content analysis is fanned out to a process pool in chunks,
+    keeping only a bounded number of chunks in flight so the input iterable
+    can be arbitrarily large.
+    
+    Args:
+        items (Iterable[Tuple[str, str]]): Pairs of URL and content (may be empty)
+        workers (int): Number of processes for content analysis; 1 runs in-process
+        chunk_size (int): Number of items sent to a worker at a time
+        cache (FactCheckCache): Optional cache; hits skip analysis entirely
         
-        # Calculate overall credibility score
-        result["credibility_score"] = _calculate_credibility_score(result)
+    Returns:
+        Iterator of dicts, one per item, as returned by fact_check_source
+    """
+    domain_cache: Dict[str, Any] = {}
+    
+    def domain_analysis_for(url: str) -> Any:
+        host = urlparse(url).netloc.lower()
+        if host not in domain_cache:
+            try:
+                domain_cache[host] = _analyze_domain(url)
+            except Exception as e:
+                domain_cache[host] = e
+        # Copy so callers mutating one result don't affect the others
+        analysis = domain_cache[host]
+        return dict(analysis) if isinstance(analysis, dict) else analysis
+    
+    def assemble(url: str, content: str, bias_analysis: Any) -> Dict[str, Any]:
+        domain_analysis = domain_analysis_for(url)
+        for analysis in (domain_analysis, bias_analysis):
+            if isinstance(analysis, Exception):
+                return _build_result(url, error=analysis)
+        result = _build_result(url, domain_analysis, bias_analysis)
+        if cache is not None:
+            cache.put(url, content, result)
+        return result
+    
+    if workers <= 1:
+        for url, content in items:
+            cached = cache.get(url, content) if cache is not None else None
+            yield cached or assemble(url, content, _analyze_content_bias_safe(content))
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_lexicon_scanner,
+                             initargs=(get_lexicon_scanner(),)) as pool:
+        pending: deque = deque()
+        max_pending = workers * 2
         
-        # Generate recommendations
-        result["recommendations"] = _generate_recommendations(result)
+        def submit(chunk: List[Tuple[str, str, Optional[Dict[str, Any]]]]) -> None:
+            misses = [content for _, content, cached in chunk if cached is None]
+            future = pool.submit(_analyze_content_chunk, misses) if misses else None
+            pending.append((chunk, future))
         
-    except Exception as e:
-        result["error"] = f"Fact-checking failed: {str(e)}"
-        result["credibility_score"] = 0
-        result["recommendations"] = ["Manual verification required due to analysis error"]
-    
-    return result
+        def drain(limit: int) -> Iterator[Dict[str, Any]]:
+            while len(pending) > limit:
+                chunk, future = pending.popleft()
+                analyses = iter(future.result() if future is not None else ())
+                for url, content, cached in chunk:
+                    yield cached or assemble(url, content, next(analyses))
+        
+        chunk: List[Tuple[str, str, Optional[Dict[str, Any]]]] = []
+        for url, content in items:
+            chunk.append((url, content, cache.get(url, content) if cache is not None else None))
+            if len(chunk) >= chunk_size:
+                submit(chunk)
+                chunk = []
+                yield from drain(max_pending)
+        if chunk:
+            submit(chunk)
+        yield from drain(0)
+
+
+# Share of the sources with claims that must have a corroborated claim for
+# strong consensus
+STRONG_CONSENSUS_SHARE = 0.5
 
+# Validated facts and conflicts listed in a validation result
+MAX_LISTED_CLAIMS = 10
 
-def validate_sources(sources: List[str], topic: str) -> Dict[str, Any]:
+
+def validate_sources(sources: List[str], topic: str,
+                     contents: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """
     Cross-validate information across multiple sources.
     
+    Without content, consensus is judged from the number and diversity of
+    the sources. With content, each source's claims are compared with the
+    other sources' (see :func:`claim_consensus`; pages on the same host
+    count as one source) and consensus follows from how many sources have
+    corroborated claims and how many claims conflict.
+    
     Args:
         sources (List[str]): List of URLs to cross-reference
         topic (str): The topic to validate
+        contents (Dict[str, str]): Optional text per URL
         
     Returns:
         Dict containing validation results and consensus analysis
@@ -96,6 +183,9 @@ def validate_sources(sources: List[str], topic: str) -> Dict[str, Any]:
             result["consensus_level"] = "weak"
             result["recommendation"] = "Single source - requires significant additional validation"
         
+        if contents:
+            _apply_claim_consensus(result, sources, domains, contents)
+        
         # Add validation guidance
         if result["source_diversity"] == "low":
             result["conflicting_information"].append("Sources lack diversity - potential echo chamber effect")
@@ -107,24 +197,53 @@ def validate_sources(sources: List[str], topic: str) -> Dict[str, Any]:
     return result
 
 
-def _analyze_domain(url: str) -> Dict[str, Any]:
-    """Analyze the domain reputation and characteristics."""
-    domain = urlparse(url).netloc.lower()
-    
-    # Known reputable news sources
-    high_credibility_domains = {
-        'reuters.com', 'apnews.com', 'bbc.com', 'npr.org', 'pbs.org',
-        'wsj.com', 'nytimes.com', 'washingtonpost.com', 'theguardian.com',
-        'cnn.com', 'abcnews.go.com', 'cbsnews.com', 'nbcnews.com',
-        'techcrunch.com', 'wired.com', 'arstechnica.com', 'nature.com',
-        'science.org', 'mit.edu', 'stanford.edu', 'harvard.edu'
-    }
+def _apply_claim_consensus(result: Dict[str, Any], sources: List[str], domains: List[str],
+                           contents: Dict[str, str]) -> None:
+    """Replace the count-based consensus with one judged from the sources' claims."""
+    texts: Dict[str, List[str]] = {}
+    for url, domain in zip(sources, domains):
+        if contents.get(url):
+            texts.setdefault(domain, []).append(contents[url])
+    consensus = claim_consensus({domain: "\n".join(parts) for domain, parts in texts.items()})
+    claims, counts = consensus["claims"], consensus["counts"]
+    result["claims_analyzed"] = len(claims)
+    result["claim_labels"] = counts
+    if not claims:
+        return
     
-    # Known biased or low-credibility domains
-    low_credibility_indicators = [
-        '.blog', 'fake', 'conspiracy', 'truth', 'patriot', 'freedom',
-        'real', 'expose', 'leak', 'insider', 'underground'
+    corroborated = sorted((claim for claim in claims if claim["label"] == "corroborated"),
+                          key=lambda claim: -claim["corroborating_sources"])
+    result["validated_facts"] = [
+        {"claim": claim["text"], "source": claim["source"], "sources": claim["corroborating_sources"] + 1}
+        for claim in corroborated[:MAX_LISTED_CLAIMS]
     ]
+    for first, second in consensus["conflicts"][:MAX_LISTED_CLAIMS]:
+        first, second = claims[first], claims[second]
+        result["conflicting_information"].append(
+            f'{first["source"]}: "{first["text"]}" conflicts with {second["source"]}: "{second["text"]}"'
+        )
+    
+    sources_with_claims = {claim["source"] for claim in claims}
+    corroborated_sources = {claim["source"] for claim in corroborated}
+    share = len(corroborated_sources) / len(sources_with_claims)
+    if counts["conflicting"] > counts["corroborated"]:
+        result["consensus_level"] = "weak"
+        result["recommendation"] = "Sources disagree on key facts - verify the conflicting claims"
+    elif len(sources_with_claims) >= 3 and share >= STRONG_CONSENSUS_SHARE:
+        result["consensus_level"] = "strong"
+        result["recommendation"] = "Key claims are corroborated across independent sources"
+    elif corroborated_sources:
+        result["consensus_level"] = "moderate"
+        result["recommendation"] = "Some claims are corroborated - seek additional sources for the rest"
+    else:
+        result["consensus_level"] = "weak"
+        result["recommendation"] = "No claim is corroborated by another source - requires additional validation"
+
+
+def _analyze_domain(url: str) -> Dict[str, Any]:
+    """Analyze the domain reputation and characteristics."""
+    parsed = urlparse(url)
+    domain = parsed.netloc.lower()
     
     result = {
         "domain": domain,
@@ -132,16 +251,14 @@ def _analyze_domain(url: str) -> Dict[str, Any]:
         "source_type": "unknown"
     }
     
-    # Check against known high-credibility sources
-    for trusted_domain in high_credibility_domains:
-        if trusted_domain in domain:
-            result["domain_reputation"] = "high"
-            result["source_type"] = "established_media"
-            break
+    # Check against the reputation index (exact suffix match on whole labels)
+    entry = get_reputation_index().lookup(parsed.hostname or domain)
+    if entry is not None:
+        _, result["domain_reputation"], result["source_type"] = entry
     
     # Check for low-credibility indicators
     if result["domain_reputation"] == "unknown":
-        for indicator in low_credibility_indicators:
+        for indicator in DEFAULT_LOW_CREDIBILITY_INDICATORS:
             if indicator in domain:
                 result["domain_reputation"] = "low"
                 result["source_type"] = "questionable"
@@ -160,41 +277,86 @@ def _analyze_content_bias(content: str) -> Dict[str, Any]:
     bias_indicators = []
     red_flags = []
     
-    # Emotional language indicators
-    emotional_words = [
-        'shocking', 'devastating', 'incredible', 'unbelievable', 'scandal',
-        'outrage', 'fury', 'explosive', 'bombshell', 'exclusive', 'leaked'
-    ]
+    # Find emotional, conspiracy, attribution and balance cues in one pass
+    matches = get_lexicon_scanner().scan(content)["matches"]
     
-    # Conspiracy theory indicators
-    conspiracy_indicators = [
-        'they don\'t want you to know', 'mainstream media won\'t tell you',
-        'hidden truth', 'cover-up', 'secret agenda', 'wake up', 'sheeple'
-    ]
+    def distinct(category: str) -> int:
+        return len({phrase for _, _, phrase in matches.get(category, [])})
     
     # Check for emotional language
-    content_lower = content.lower()
-    emotional_count = sum(1 for word in emotional_words if word in content_lower)
-    if emotional_count > 3:
+    if distinct("emotional") > 3:
         bias_indicators.append("High use of emotional language")
     
     # Check for conspiracy indicators
-    conspiracy_count = sum(1 for phrase in conspiracy_indicators if phrase in content_lower)
-    if conspiracy_count > 0:
+    if distinct("conspiracy") > 0:
         red_flags.append("Contains conspiracy theory language")
     
     # Check for lack of sources
-    if not any(phrase in content_lower for phrase in ['according to', 'source:', 'cited', 'reported by', 'study', 'research']):
+    if not distinct("attribution"):
         red_flags.append("Lacks attribution to sources")
     
     # Check for balanced reporting
-    if not any(phrase in content_lower for phrase in ['however', 'although', 'despite', 'on the other hand', 'critics', 'opponents']):
+    if not distinct("balance"):
         bias_indicators.append("May lack balanced perspective")
     
     return {
         "bias_indicators": bias_indicators,
-        "red_flags": red_flags
+        "red_flags": red_flags,
+        "bias_cue_counts": {category: len(hits) for category, hits in matches.items()}
+    }
+
+
+def _analyze_content_bias_safe(content: str) -> Any:
+    """Analyze content, returning None for empty content and the exception on failure."""
+    if not content:
+        return None
+    try:
+        return _analyze_content_bias(content)
+    except Exception as e:
+        return e
+
+
+def _analyze_content_chunk(contents: List[str]) -> List[Any]:
+    """Process pool entry point for fact_check_sources."""
+    return [_analyze_content_bias_safe(content) for content in contents]
+
+
+def _build_result(url: str, domain_analysis: Optional[Dict[str, Any]] = None,
+                  bias_analysis: Optional[Dict[str, Any]] = None,
+                  error: Optional[Exception] = None) -> Dict[str, Any]:
+    """Combine domain and content analysis into a scored fact-check result."""
+    result = {
+        "url": url,
+        "credibility_score": 0,
+        "domain_reputation": "unknown",
+        "bias_indicators": [],
+        "red_flags": [],
+        "bias_cue_counts": {},
+        "recommendations": [],
+        "source_type": "unknown",
+        "last_updated": "unknown"
     }
+    
+    try:
+        if error is not None:
+            raise error
+        
+        result.update(domain_analysis or {})
+        if bias_analysis:
+            result.update(bias_analysis)
+        
+        # Calculate overall credibility score
+        result["credibility_score"] = _calculate_credibility_score(result)
+        
+        # Generate recommendations
+        result["recommendations"] = _generate_recommendations(result)
+        
+    except Exception as e:
+        result["error"] = f"Fact-checking failed: {str(e)}"
+        result["credibility_score"] = 0
+        result["recommendations"] = ["Manual verification required due to analysis error"]
+    
+    return result
 
 
 def _calculate_credibility_score(analysis: Dict[str, Any]) -> int:
@@ -0,0 +1,86 @@
+"""
+Tools that defer their imports and construction until an agent first uses them
+"""
+
+import threading
+from typing import Any, Callable, Optional, Type, Union
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+class SearchToolSchema(BaseModel):
+    """Input for the Serper search tool."""
+
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+
+class FileWriterToolSchema(BaseModel):
+    """Input for the file writer tool."""
+
+    filename: str
+    directory: Optional[str] = "./"
+    overwrite: Union[str, bool] = False
+    content: str
+
+
+class LazyTool(BaseTool):
+    """
+    Stand-in for a tool whose module is slow to import.
+
+    The agent sees ``name``, ``description`` and ``args_schema`` up front;
+    ``factory`` is only called, once, when the tool is first run. Importing
+    ``crewai_tools`` alone costs over a second, and a run that stops early
+    never needs the search or file writer tools at all.
+    """
+
+    factory: Callable[[], BaseTool] = Field(exclude=True)
+
+    _tool: Optional[BaseTool] = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def tool(self) -> BaseTool:
+        """The wrapped tool, constructed on first access."""
+        if self._tool is None:
+            with self._lock:
+                if self._tool is None:
+                    self._tool = self.factory()
+        return self._tool
+
+    @property
+    def loaded(self) -> bool:
+        return self._tool is not None
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        return self.tool._run(*args, **kwargs)
+
+
+def _cached_serper_tool() -> BaseTool:
+    from .search_cache import CachedSerperDevTool
+    return CachedSerperDevTool()
+
+
+def _file_writer_tool() -> BaseTool:
+    from crewai_tools import FileWriterTool
+    return FileWriterTool()
+
+
+def lazy_search_tool() -> LazyTool:
+    """CachedSerperDevTool, imported and built on the first search."""
+    return _lazy(_cached_serper_tool, "Search the internet with Serper",
+                 "A tool that can be used to search the internet with a search_query. "
+                 "Supports different search types: 'search' (default), 'news'",
+                 SearchToolSchema)
+
+
+def lazy_file_writer_tool() -> LazyTool:
+    """crewAI's FileWriterTool, imported and built on the first write."""
+    return _lazy(_file_writer_tool, "File Writer Tool",
+                 "A tool to write content to a specified file. Accepts filename, content, "
+                 "and optionally a directory path and overwrite flag as input.",
+                 FileWriterToolSchema)
+
+
+def _lazy(factory: Callable[[], BaseTool], name: str, description: str, schema: Type[BaseModel]) -> LazyTool:
+    return LazyTool(factory=factory, name=name, description=description, args_schema=schema)
@@ -0,0 +1,161 @@
+"""
+Single-pass lexicon scanner for content bias analysis
+"""
+
+import hashlib
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "lexicons.yaml")
+
+LEXICON_PATH_ENV = "AI_NEWS_LEXICONS"
+
+_WORD_CHAR = re.compile(r"\w")
+
+# Characters whose lowercase form is longer than one character (only U+0130,
+# capital I with dot, lowers to "i" plus a combining dot). Mapped first so
+# that lowercasing keeps every offset.
+_LOWER_SAFE = str.maketrans({"\u0130": "i"})
+
+
+class LexiconScanner:
+    """
+    Compiled matcher for several phrase lexicons at once.
+
+    All phrases are merged into a character trie which is emitted as a single
+    regular expression, so every category is found in one pass over the text
+    and the cost per character is bounded by the trie fan-out rather than the
+    number of phrases. Matching is case-insensitive, any run of whitespace
+    matches a space in a phrase, and phrases only match on word boundaries.
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        self.categories: List[str] = list(lexicons)
+        self._phrase_categories: Dict[str, Tuple[str, ...]] = {}
+        for category, phrases in lexicons.items():
+            for phrase in phrases:
+                key = _normalize_phrase(phrase)
+                if not key:
+                    continue
+                owners = self._phrase_categories.get(key, ())
+                if category not in owners:
+                    self._phrase_categories[key] = owners + (category,)
+
+        digest = hashlib.sha256()
+        for key in sorted(self._phrase_categories):
+            digest.update(f"{key}\t{','.join(self._phrase_categories[key])}\n".encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+
+        # Lowercased text is matched case-sensitively, which lets the regex
+        # engine skip ahead on the leading character set
+        self._pattern = re.compile(_build_pattern(self._phrase_categories))
+
+    def __len__(self) -> int:
+        return len(self._phrase_categories)
+
+    def scan(self, text: str) -> Dict[str, Any]:
+        """
+        Find every lexicon phrase in a text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            Dict with per-category ``counts`` of occurrences and ``matches``,
+            a list of ``(start, end, phrase)`` offsets per category
+        """
+        matches: Dict[str, List[Tuple[int, int, str]]] = {category: [] for category in self.categories}
+        if self._phrase_categories:
+            lookup = self._phrase_categories
+            lowered = text.lower()
+            if len(lowered) != len(text):
+                lowered = text.translate(_LOWER_SAFE).lower()
+            for match in self._pattern.finditer(lowered):
+                phrase = match.group()
+                owners = lookup.get(phrase)
+                if owners is None:
+                    # Matched across a run of whitespace
+                    phrase = _normalize_phrase(phrase)
+                    owners = lookup[phrase]
+                hit = (match.start(), match.end(), phrase)
+                for category in owners:
+                    matches[category].append(hit)
+        return {
+            "counts": {category: len(hits) for category, hits in matches.items()},
+            "matches": matches,
+        }
+
+
+def load_lexicons(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Load phrase lexicons from a YAML file mapping category names to phrase lists.
+
+    Args:
+        path (str): File to read. Defaults to ``AI_NEWS_LEXICONS`` or the
+            packaged ``config/lexicons.yaml``
+
+    Returns:
+        Dict of category name to phrases
+    """
+    path = path or os.getenv(LEXICON_PATH_ENV) or DEFAULT_LEXICON_PATH
+    with open(path, "r", encoding="utf-8") as handle:
+        data = yaml.safe_load(handle) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"Lexicon file must map categories to phrase lists: {path}")
+    return {str(category): [str(phrase) for phrase in phrases or []] for category, phrases in data.items()}
+
+
+_default_scanner: Optional[LexiconScanner] = None
+
+
+def get_lexicon_scanner() -> LexiconScanner:
+    """Return the process-wide scanner, compiling the configured lexicons on first use."""
+    global _default_scanner
+    if _default_scanner is None:
+        _default_scanner = LexiconScanner(load_lexicons())
+    return _default_scanner
+
+
+def set_lexicon_scanner(scanner: Optional[LexiconScanner]) -> None:
+    """Replace the process-wide scanner. Passing None reloads the configured lexicons on next use."""
+    global _default_scanner
+    _default_scanner = scanner
+
+
+def _normalize_phrase(phrase: str) -> str:
+    return " ".join(phrase.translate(_LOWER_SAFE).lower().split())
+
+
+def _build_pattern(phrases: Iterable[str]) -> str:
+    word_trie: Dict[str, Any] = {}
+    other_trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = word_trie if _WORD_CHAR.match(phrase) else other_trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = True
+    branches = []
+    if word_trie:
+        branches.append(r"\b" + _trie_to_pattern(word_trie, ""))
+    if other_trie:
+        branches.append(_trie_to_pattern(other_trie, ""))
+    return "|".join(branches) or "(?!)"
+
+
+def _trie_to_pattern(node: Dict[str, Any], prev_char: str) -> str:
+    alternatives = []
+    for char, child in node.items():
+        if char == "":
+            continue
+        piece = r"\s+" if char == " " else re.escape(char)
+        alternatives.append(piece + _trie_to_pattern(child, char))
+    if "" in node:
+        # Longer phrases come first so the longest match wins
+        alternatives.append(r"(?!\w)" if _WORD_CHAR.match(prev_char) else "")
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return "(?:" + "|".join(alternatives) + ")"
@@ -0,0 +1,95 @@
+"""
+Deterministic pre-scoring of news sources before the fact-checking agent
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fact_check_cache import FactCheckCache
+from .fact_check_functions import fact_check_sources, validate_sources
+
+
+# Sources scoring inside this band [low, high) are sent to the fact-checking
+# agent; the thresholds match those used by _generate_recommendations
+REVIEW_BAND: Tuple[int, int] = (40, 70)
+
+VERDICT_HEADER = "PRE-SCORED SOURCE VERDICT"
+
+_URL_PATTERN = re.compile(r"https?://[^\s<>\"'()\[\]{}|\\^`]+")
+
+
+def extract_urls(text: str) -> List[str]:
+    """Return the distinct http(s) URLs in a text, in order of appearance."""
+    urls: List[str] = []
+    seen = set()
+    for match in _URL_PATTERN.finditer(text or ""):
+        url = match.group().rstrip(".,;:!?*")
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+def prescore_sources(urls: List[str], topic: str = "", contents: Optional[Dict[str, str]] = None,
+                     cache: Optional[FactCheckCache] = None) -> Dict[str, Any]:
+    """
+    Score sources with the deterministic fact-check functions.
+
+    Args:
+        urls (List[str]): Source URLs found by the news agent
+        topic (str): Topic the sources were found for
+        contents (Dict[str, str]): Optional content per URL for bias analysis and claim consensus
+        cache (FactCheckCache): Optional fact-check result cache
+
+    Returns:
+        Dict with one entry per source and the URLs split into ``approved``,
+        ``review`` (ambiguous, needs the fact-checking agent) and ``rejected``
+    """
+    contents = contents or {}
+    verdict: Dict[str, Any] = {
+        "topic": topic,
+        "sources": [],
+        "approved": [],
+        "review": [],
+        "rejected": [],
+    }
+
+    low, high = REVIEW_BAND
+    for result in fact_check_sources(((url, contents.get(url, "")) for url in urls), cache=cache):
+        score = result["credibility_score"]
+        if result.get("error") or low <= score < high:
+            decision = "review"
+        elif score >= high:
+            decision = "approved"
+        else:
+            decision = "rejected"
+        verdict[decision].append(result["url"])
+        verdict["sources"].append({
+            "url": result["url"],
+            "score": score,
+            "reputation": result["domain_reputation"],
+            "source_type": result["source_type"],
+            "flags": result["red_flags"] + result["bias_indicators"],
+            "decision": decision,
+        })
+
+    validation = validate_sources(urls, topic, contents=contents)
+    verdict["source_diversity"] = validation["source_diversity"]
+    verdict["consensus_level"] = validation["consensus_level"]
+    if "claim_labels" in validation:
+        verdict["claim_labels"] = validation["claim_labels"]
+    return verdict
+
+
+def needs_llm_review(verdict: Optional[Dict[str, Any]]) -> bool:
+    """Whether the fact-checking agent has to look at any source."""
+    return not verdict or not verdict["sources"] or bool(verdict["review"])
+
+
+def format_verdict(verdict: Dict[str, Any]) -> str:
+    """Render a verdict as a compact block for downstream task context."""
+    compact = {key: verdict[key] for key in ("topic", "source_diversity", "consensus_level", "claim_labels",
+                                             "sources", "unchanged")
+               if key in verdict}
+    return f"{VERDICT_HEADER}\n{json.dumps(compact, separators=(',', ':'))}"
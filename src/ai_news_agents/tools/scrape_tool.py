@@ -0,0 +1,78 @@
+"""
+CrewAI tool that scrapes several websites in one call
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Type, Union
+from urllib.parse import urlparse
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from ..dedup import deduplicate_documents
+from ..fetcher import get_fetcher, html_to_text
+from ..tracing import span
+from .fact_check_cache import get_fact_check_cache
+from .fact_check_functions import fact_check_source
+
+
+logger = logging.getLogger(__name__)
+
+
+class BatchScrapeToolSchema(BaseModel):
+    """Input for BatchScrapeTool."""
+
+    urls: Union[List[str], str] = Field(
+        ..., description="All website URLs to read, as a list (or one string separated by commas or newlines)"
+    )
+
+
+class BatchScrapeTool(BaseTool):
+    name: str = "Read websites content"
+    description: str = (
+        "A tool that reads the content of several websites at once. "
+        "Pass every URL you need in a single call."
+    )
+    args_schema: Type[BaseModel] = BatchScrapeToolSchema
+    deduplicate: bool = True
+
+    def _run(self, urls: Union[List[str], str]) -> str:
+        if isinstance(urls, str):
+            urls = [url for url in re.split(r"[\s,]+", urls) if url]
+        failed = []
+        documents = []
+        for page in get_fetcher().fetch(dict.fromkeys(urls)):
+            logger.info("Fetched %s in %.0f ms%s", page["url"], page["elapsed"] * 1000,
+                        " (cached)" if page["from_cache"] else "")
+            if page.get("error"):
+                failed.append(f"## Source: {page['url']}\nCould not be scraped: {page['error']}")
+                continue
+            documents.append({"url": page["url"], "text": html_to_text(page["text"])})
+
+        if self.deduplicate:
+            cache = get_fact_check_cache()
+            for document in documents:
+                document["score"] = fact_check_source(document["url"], cache=cache)["credibility_score"]
+            with span("scrape.deduplicate", documents=len(documents)) as current:
+                documents = deduplicate_documents(documents)
+                current.set(canonical=len(documents))
+            sections = [_render_document(document) for document in documents]
+        else:
+            sections = [f"## Source: {document['url']}\n{document['text']}" for document in documents]
+
+        return "The following text is scraped website content:\n\n" + "\n\n".join(sections + failed)
+
+
+def _render_document(document: Dict[str, Any]) -> str:
+    lines = [f"## Source: {document['url']}"]
+    if len(document["sources"]) > 1:
+        lines.append("Also reported by: " + ", ".join(document["sources"][1:]))
+    for paragraph in document["paragraphs"]:
+        others = paragraph["sources"][1:]
+        if others:
+            hosts = ", ".join(dict.fromkeys(urlparse(url).netloc for url in others))
+            lines.append(f"{paragraph['text']} [also: {hosts}]")
+        else:
+            lines.append(paragraph["text"])
+    return "\n".join(lines)
@@ -0,0 +1,106 @@
+"""
+Disk-backed cache around the Serper search tool
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+
+from crewai_tools import SerperDevTool
+from pydantic import Field, PrivateAttr
+
+from ..cache import JsonDiskCache, cache_key
+from ..rate_limit import get_rate_limiter
+from ..tracing import span
+
+
+SEARCH_MODE_ENV = "AI_NEWS_SEARCH_MODE"
+SEARCH_TTL_ENV = "AI_NEWS_SEARCH_TTL"
+SEARCH_FIXTURES_ENV = "AI_NEWS_SEARCH_FIXTURES"
+
+# cache:   serve fresh cached results, otherwise call Serper and store the reply
+# refresh: always call Serper and store the reply
+# offline: never call Serper; serve cached results (even stale) or fixtures
+SEARCH_MODES = ("cache", "refresh", "offline")
+
+DEFAULT_SEARCH_TTL = 6 * 3600
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a search query and collapse its whitespace."""
+    return " ".join((query or "").lower().split())
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """
+    SerperDevTool whose API replies are cached on disk.
+
+    Replies are keyed by the normalized query and every request parameter, and
+    reused while younger than ``cache_ttl`` seconds, so repeated or scheduled
+    runs on the same topic skip the network. In ``offline`` mode the tool
+    never calls Serper: it replays cached replies regardless of age, then
+    fixture files named ``<query-slug>.json`` or ``<query-slug>.<type>.json``
+    from ``fixtures_dir``. Requests that do reach Serper share the process-wide
+    ``serper`` rate limiter and are retried after 429 replies.
+    """
+
+    mode: str = Field(default_factory=lambda: os.getenv(SEARCH_MODE_ENV, "cache"))
+    cache_ttl: float = Field(default_factory=lambda: float(os.getenv(SEARCH_TTL_ENV, DEFAULT_SEARCH_TTL)))
+    fixtures_dir: Optional[str] = Field(default_factory=lambda: os.getenv(SEARCH_FIXTURES_ENV))
+
+    _cache: JsonDiskCache = PrivateAttr()
+    _stats: Dict[str, int] = PrivateAttr(default_factory=lambda: {"hits": 0, "misses": 0, "fixtures": 0})
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        if self.mode not in SEARCH_MODES:
+            raise ValueError(f"Invalid search cache mode: {self.mode}. Must be one of: {', '.join(SEARCH_MODES)}")
+        self._cache = JsonDiskCache("search", ttl=self.cache_ttl)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        with span("search.request", "search", query=search_query, type=search_type, mode=self.mode) as current:
+            return self._cached_request(search_query, search_type, current)
+
+    def _cached_request(self, search_query: str, search_type: str, current: Any) -> dict:
+        key = cache_key(
+            "serper", self.base_url, normalize_query(search_query), search_type.lower(),
+            self.n_results, self.country, self.location, self.locale,
+        )
+
+        if self.mode != "refresh":
+            results = self._cache.get(key, allow_stale=self.mode == "offline")
+            if results is not None:
+                self._stats["hits"] += 1
+                current.set(cache="hit")
+                return results
+
+        if self.mode == "offline":
+            results = self._load_fixture(search_query, search_type)
+            if results is None:
+                raise LookupError(f"No cached search results or fixture for query: {search_query!r}")
+            self._stats["fixtures"] += 1
+            current.set(cache="fixture")
+            return results
+
+        self._stats["misses"] += 1
+        current.set(cache="miss")
+        request = super()._make_api_request
+        results = get_rate_limiter("serper").call(lambda: request(search_query, search_type))
+        self._cache.set(key, results)
+        return results
+
+    def _load_fixture(self, search_query: str, search_type: str) -> Optional[dict]:
+        if not self.fixtures_dir:
+            return None
+        slug = re.sub(r"[^a-z0-9]+", "-", normalize_query(search_query)).strip("-")
+        for name in (f"{slug}.{search_type.lower()}.json", f"{slug}.json"):
+            path = os.path.join(self.fixtures_dir, name)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as handle:
+                    return json.load(handle)
+        return None
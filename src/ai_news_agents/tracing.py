@@ -0,0 +1,390 @@
+"""
+Lightweight span tracing for crew runs
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+
+TRACE_ENV = "AI_NEWS_TRACE"
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("ai_news_span", default=None)
+
+
+class Span:
+    """
+    One timed operation. Use as a context manager, or call :meth:`start`
+    and :meth:`end` when the operation is bracketed by separate callbacks.
+    """
+
+    __slots__ = ("tracer", "name", "kind", "span_id", "parent_id", "attributes",
+                 "started_at", "_start", "duration", "status", "error", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, kind: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id: Optional[str] = None
+        self.attributes = attributes
+        self.started_at = 0.0
+        self._start = 0.0
+        self.duration = 0.0
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self._token: Optional[contextvars.Token] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, name: str, value: float = 1) -> None:
+        """Increment a numeric attribute."""
+        self.attributes[name] = self.attributes.get(name, 0) + value
+
+    def start(self) -> "Span":
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self._token = _current_span.set(self)
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        self.duration = time.perf_counter() - self._start
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # Ended from another context than it started in
+                pass
+            self._token = None
+        self.tracer._finish(self)
+
+    def __enter__(self) -> "Span":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end(exc)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            "trace_id": self.tracer.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.started_at, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class _NullSpan:
+    """Stand-in returned while tracing is off; every method is a no-op."""
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def add(self, name: str, value: float = 1) -> None:
+        pass
+
+    def start(self) -> "_NullSpan":
+        return self
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    def __bool__(self) -> bool:
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects finished spans in memory and, when ``path`` is given, appends
+    each one to that file as a JSON line.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.trace_id = uuid.uuid4().hex
+        self.path = path
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._handle = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._handle = open(path, "a", encoding="utf-8")
+
+    def span(self, name: str, kind: str = "internal", **attributes: Any) -> Span:
+        return Span(self, name, kind, attributes)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _finish(self, span: Span) -> None:
+        record = span.to_dict()
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self.spans.append(record)
+            if self._handle is not None:
+                self._handle.write(line + "\n")
+                self._handle.flush()
+
+
+_tracer: Optional[Tracer] = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the active tracer, enabling it from ``AI_NEWS_TRACE`` on first use."""
+    global _configured
+    if not _configured:
+        with _configure_lock:
+            if not _configured:
+                path = os.getenv(TRACE_ENV)
+                if path:
+                    enable_tracing(None if path.lower() in ("1", "true", "yes") else path)
+                _configured = True
+    return _tracer
+
+
+def enable_tracing(path: Optional[str] = None) -> Tracer:
+    """Start a new trace, written to ``path`` as JSON lines if given."""
+    global _tracer, _configured
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = Tracer(path)
+    _configured = True
+    _install_crew_listeners()
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """Stop tracing and return the tracer that was active."""
+    global _tracer, _configured
+    tracer, _tracer, _configured = _tracer, None, True
+    if tracer is not None:
+        tracer.close()
+    return tracer
+
+
+def span(name: str, kind: str = "internal", **attributes: Any):
+    """
+    Context manager timing an operation as a child of the current span.
+    Returns a shared no-op object while tracing is off.
+    """
+    tracer = _tracer if _configured else get_tracer()
+    if tracer is None:
+        return NULL_SPAN
+    return tracer.span(name, kind, **attributes)
+
+
+def event(name: str, kind: str = "internal", **attributes: Any) -> None:
+    """Record an instantaneous span, e.g. counters gathered at the end of a run."""
+    with span(name, kind, **attributes):
+        pass
+
+
+def current_span():
+    """The innermost open span, or the no-op span."""
+    return _current_span.get() or NULL_SPAN
+
+
+_listeners_installed = False
+
+
+def _install_crew_listeners() -> None:
+    """Open task, tool and kickoff spans from crewAI's event bus."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    from crewai.events import (
+        CrewKickoffCompletedEvent, CrewKickoffFailedEvent, CrewKickoffStartedEvent,
+        TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent, ToolUsageErrorEvent,
+        ToolUsageFinishedEvent, ToolUsageStartedEvent, crewai_event_bus,
+    )
+
+    open_spans: Dict[Any, List[Span]] = defaultdict(list)
+
+    def opener(key, name, kind, attributes):
+        def handler(source, event):
+            if _tracer is not None:
+                open_spans[key(source, event)].append(
+                    _tracer.span(name(source, event), kind, **attributes(source, event)).start())
+        return handler
+
+    def closer(key, failed=False):
+        def handler(source, event):
+            name = key(source, event)
+            spans = open_spans.get(name)
+            if spans:
+                current = spans.pop()
+                if not spans:
+                    del open_spans[name]
+                error = getattr(event, "error", None)
+                if hasattr(event, "from_cache"):
+                    current.set(from_cache=bool(event.from_cache))
+                current.end(RuntimeError(error) if failed and error else None)
+        return handler
+
+    # Open spans are keyed by the emitting object (the crew, the task or the
+    # tool usage) and thread, so crews running concurrently in service
+    # workers or batch runs never close each other's spans
+    def crew_key(source, event):
+        return ("crew", id(source), threading.get_ident())
+
+    def task_key(source, event):
+        return ("task", id(source), threading.get_ident())
+
+    def task_name(source, event):
+        return f"task:{getattr(source, 'name', None) or 'task'}"
+
+    def task_attributes(source, event):
+        agent = getattr(source, "agent", None)
+        return {"agent": getattr(agent, "role", None)}
+
+    def tool_key(source, event):
+        return ("tool", id(source), event.agent_id, event.tool_name, threading.get_ident())
+
+    crewai_event_bus.register_handler(
+        CrewKickoffStartedEvent,
+        opener(crew_key, lambda s, e: "crew.kickoff", "crew", lambda s, e: {"crew": e.crew_name}))
+    crewai_event_bus.register_handler(CrewKickoffCompletedEvent, closer(crew_key))
+    crewai_event_bus.register_handler(CrewKickoffFailedEvent, closer(crew_key, failed=True))
+    crewai_event_bus.register_handler(
+        TaskStartedEvent, opener(task_key, task_name, "task", task_attributes))
+    crewai_event_bus.register_handler(TaskCompletedEvent, closer(task_key))
+    crewai_event_bus.register_handler(TaskFailedEvent, closer(task_key, failed=True))
+    crewai_event_bus.register_handler(
+        ToolUsageStartedEvent,
+        opener(tool_key, lambda s, e: f"tool:{e.tool_name}", "tool", lambda s, e: {"agent": e.agent_role}))
+    crewai_event_bus.register_handler(ToolUsageFinishedEvent, closer(tool_key))
+    crewai_event_bus.register_handler(ToolUsageErrorEvent, closer(tool_key, failed=True))
+    _listeners_installed = True
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Read the spans of a JSON lines trace file."""
+    with open(path, "r", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def summarize(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate spans into a profile.
+
+    Returns:
+        Dict with ``wall_ms``, per-name ``totals`` (count, total and max ms,
+        sorted by total), ``hot_path`` (from the root, the slowest child at
+        each level), ``llm`` token counts, ``bytes_scraped`` and ``caches``
+        hit rates
+    """
+    children: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+    span_ids = {record["span_id"] for record in spans}
+    for record in spans:
+        parent = record["parent_id"] if record["parent_id"] in span_ids else None
+        children[parent].append(record)
+
+    roots = children[None]
+    wall_ms = 0.0
+    if roots:
+        start = min(record["start"] for record in roots)
+        end = max(record["start"] + record["duration_ms"] / 1000 for record in roots)
+        wall_ms = (end - start) * 1000
+
+    totals: Dict[str, Dict[str, Any]] = {}
+    for record in spans:
+        entry = totals.setdefault(record["name"], {"kind": record["kind"], "count": 0, "total_ms": 0.0,
+                                                   "max_ms": 0.0, "errors": 0})
+        entry["count"] += 1
+        entry["total_ms"] += record["duration_ms"]
+        entry["max_ms"] = max(entry["max_ms"], record["duration_ms"])
+        entry["errors"] += record["status"] != "ok"
+
+    hot_path = []
+    level = roots
+    while level:
+        slowest = max(level, key=lambda record: record["duration_ms"])
+        hot_path.append({"name": slowest["name"], "duration_ms": slowest["duration_ms"]})
+        level = children.get(slowest["span_id"], [])
+
+    llm = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_ms": 0.0}
+    caches: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "lookups": 0})
+    bytes_scraped = 0
+    for record in spans:
+        attributes = record["attributes"]
+        if record["kind"] == "llm":
+            llm["calls"] += 1
+            llm["latency_ms"] += record["duration_ms"]
+            llm["prompt_tokens"] += attributes.get("prompt_tokens", 0)
+            llm["completion_tokens"] += attributes.get("completion_tokens", 0)
+        if record["kind"] == "http":
+            bytes_scraped += attributes.get("bytes", 0)
+        cache = attributes.get("cache")
+        if cache in ("hit", "miss", "fixture"):
+            caches[record["kind"]]["lookups"] += 1
+            caches[record["kind"]]["hits"] += cache in ("hit", "fixture")
+        for name, stats in attributes.get("cache_stats", {}).items():
+            caches[name]["hits"] += stats.get("hits", 0)
+            caches[name]["lookups"] += stats.get("lookups", 0)
+
+    return {
+        "wall_ms": round(wall_ms, 3),
+        "spans": len(spans),
+        "totals": dict(sorted(totals.items(), key=lambda item: -item[1]["total_ms"])),
+        "hot_path": hot_path,
+        "llm": llm,
+        "bytes_scraped": bytes_scraped,
+        "caches": {name: dict(stats, hit_rate=stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0)
+                   for name, stats in caches.items()},
+    }
+
+
+def format_summary(summary: Dict[str, Any], limit: int = 15) -> str:
+    """Render a profile summary as plain text."""
+    lines = [f"Wall time: {summary['wall_ms'] / 1000:.2f} s across {summary['spans']} spans", "",
+             "Hot path:"]
+    for depth, step in enumerate(summary["hot_path"]):
+        lines.append(f"  {'  ' * depth}{step['name']}  {step['duration_ms']:.0f} ms")
+
+    lines += ["", f"{'span':<40} {'kind':<8} {'count':>6} {'total ms':>10} {'max ms':>10}"]
+    for name, entry in list(summary["totals"].items())[:limit]:
+        lines.append(f"{name[:40]:<40} {entry['kind']:<8} {entry['count']:>6} "
+                     f"{entry['total_ms']:>10.0f} {entry['max_ms']:>10.0f}")
+
+    llm = summary["llm"]
+    lines += ["", f"LLM: {llm['calls']} calls, {llm['latency_ms'] / 1000:.2f} s, "
+                  f"{llm['prompt_tokens']} prompt + {llm['completion_tokens']} completion tokens",
+              f"Scraped: {summary['bytes_scraped'] / 1024:.1f} KiB"]
+    for name, stats in sorted(summary["caches"].items()):
+        lines.append(f"Cache {name}: {stats['hits']}/{stats['lookups']} hits ({stats['hit_rate']:.0%})")
+    return "\n".join(lines)
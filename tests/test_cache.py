@@ -0,0 +1,27 @@
+import os
+import time
+
+from ai_news_agents.cache import JsonDiskCache
+
+
+def test_trim_drops_expired_then_oldest(tmp_path):
+    cache = JsonDiskCache("test", root=str(tmp_path), max_age=3600, max_entries=2)
+    for key in ("aa01", "bb02", "cc03", "dd04"):
+        cache.set(key, key)
+    now = time.time()
+    os.utime(cache.path("aa01"), (now - 7200, now - 7200))
+    os.utime(cache.path("bb02"), (now - 30, now - 30))
+    os.utime(cache.path("cc03"), (now - 20, now - 20))
+    assert cache.trim() == 2
+    assert cache.get("aa01") is None
+    assert cache.get("bb02") is None
+    assert cache.get("cc03") == "cc03"
+    assert cache.get("dd04") == "dd04"
+
+
+def test_unbounded_cache_keeps_everything(tmp_path):
+    cache = JsonDiskCache("test", root=str(tmp_path))
+    for index in range(5):
+        cache.set(f"{index:04d}", index)
+    assert cache.trim() == 0
+    assert [cache.get(f"{index:04d}") for index in range(5)] == list(range(5))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from ai_news_agents.tools.claims import _terms, _tfidf, claim_consensus, similar_pairs
+
+
+CLAIM = "OpenAI released the new model on Tuesday with a larger context window."
+
+
+@pytest.mark.parametrize("sources", [2, 3])
+def test_identical_claims_are_corroborated(sources):
+    result = claim_consensus({f"source{index}": CLAIM for index in range(sources)})
+    assert result["counts"] == {"corroborated": sources, "single_source": 0, "conflicting": 0}
+    assert all(claim["corroborating_sources"] == sources - 1 for claim in result["claims"])
+
+
+def test_conflicting_figures_and_negation():
+    result = claim_consensus({
+        "a": "The company said the model scored 20% higher on coding benchmarks than before.",
+        "b": "According to the company the model scored 35% higher on coding benchmarks than before.",
+        "c": "The weather in London stayed mild and dry throughout the whole week.",
+    })
+    assert [claim["label"] for claim in result["claims"]] == ["conflicting", "conflicting", "single_source"]
+    assert result["conflicts"] == [(0, 1)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("threshold", [0.3, 0.5, 0.7])
+def test_similar_pairs_matches_dense_product(seed, threshold):
+    rng = np.random.default_rng(seed)
+    # A small vocabulary with one very common word, so that pairs match and
+    # frequent terms fall outside the prefixes
+    words = [f"word{chr(97 + index)}" for index in range(12)]
+    claims = [" ".join(rng.choice(words, size=rng.integers(6, 15), p=np.r_[[0.3], np.full(11, 0.7 / 11)]))
+              for _ in range(rng.integers(5, 80))]
+    # Near-copies with one word replaced, for pairs above the higher thresholds
+    for claim in list(claims[:len(claims) // 3]):
+        tokens = claim.split()
+        tokens[rng.integers(len(tokens))] = str(rng.choice(words))
+        claims.append(" ".join(tokens))
+    claim_terms = [_terms(claim) for claim in claims]
+    groups = rng.integers(0, 6, size=len(claims))
+
+    rows, columns, weights, frequency = _tfidf(claim_terms)
+    matrix = np.zeros((len(claims), len(frequency)))
+    matrix[rows, columns] = weights
+    dense = matrix @ matrix.T
+    first, second = np.triu_indices(len(claims), 1)
+    expected = (dense[first, second] >= threshold) & (groups[first] != groups[second])
+
+    found_first, found_second, similarity = similar_pairs(claim_terms, groups, threshold)
+    assert set(zip(found_first.tolist(), found_second.tolist())) == set(
+        zip(first[expected].tolist(), second[expected].tolist()))
+    np.testing.assert_allclose(similarity, dense[found_first, found_second])
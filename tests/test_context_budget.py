@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from ai_news_agents.context_budget import ContextBudget, compress_sources, count_tokens, split_sources
+
+WORDS = "model launch gpu billion parameters training open source benchmark release agents reasoning".split()
+
+
+def scraped(seed, sources=4, passages=10):
+    rng = random.Random(seed)
+    lines = []
+    for source in range(sources):
+        lines.append(f"## Source: https://site{source}.example/article")
+        for _ in range(rng.randint(1, passages)):
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 60))) + ".")
+        lines.append("")
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_compressed_text_stays_within_budget(seed):
+    text = scraped(seed)
+    budget = random.Random(seed).randint(80, 600)
+    compressed, usage = compress_sources(text, budget, topic="GPU models")
+    assert count_tokens(compressed) == usage["output_tokens"] <= budget
+    assert usage["input_tokens"] == count_tokens(text)
+
+
+def test_headers_kept_and_passages_stay_in_order():
+    text = scraped(1, sources=3, passages=12)
+    compressed, usage = compress_sources(text, 150)
+    original = {url: passages for url, _, passages in split_sources(text)}
+    for url, header, passages in split_sources(compressed):
+        assert header == [f"## Source: {url}"]
+        positions = [original[url].index(passage) for passage in passages]
+        assert positions == sorted(positions)
+    assert [source["url"] for source in usage["sources"]] == list(original)
+
+
+def test_text_within_budget_is_unchanged():
+    text = scraped(2, sources=1, passages=2)
+    assert compress_sources(text, count_tokens(text))[0] == text
+
+
+def test_credible_sources_keep_more():
+    text = scraped(3, sources=2, passages=15)
+    scores = {"https://site0.example/article": 95, "https://site1.example/article": 10}
+    _, usage = compress_sources(text, 300, scores)
+    kept = {source["url"]: source["kept"] / source["passages"] for source in usage["sources"]}
+    assert kept["https://site0.example/article"] > kept["https://site1.example/article"]
+
+
+def test_budget_fit_uses_what_other_tasks_left():
+    budget = ContextBudget(budget=400)
+    budget.record("generate_news_task", "word " * 400)
+    compressed = budget.fit("webscraping_task", scraped(4))
+    assert count_tokens(compressed) <= 100
+    assert budget.usage["webscraping_task"]["allowed"] == 100
@@ -0,0 +1,57 @@
+from ai_news_agents.dedup import deduplicate_documents, jaccard, near_duplicate_pairs, shingle_set
+
+STORY = (
+    "OpenAI released a new reasoning model on Tuesday that beats earlier systems on math benchmarks.\n"
+    "The company said the model was trained with large scale reinforcement learning on verified problems.\n"
+    "Researchers outside the company cautioned that benchmark gains do not always carry over to real tasks."
+)
+
+OTHER = (
+    "Nvidia reported record data center revenue as demand for its accelerators kept growing this quarter.\n"
+    "Analysts expect supply constraints on advanced packaging to ease during the second half of next year."
+)
+
+SHARED = "The chip maker said it would invest twenty billion dollars in new fabrication plants across three states."
+
+
+def test_identical_articles_collapse_to_best_scored():
+    documents = [
+        {"url": "https://blog.example/copy", "text": STORY, "score": 40},
+        {"url": "https://news.example/story", "text": STORY, "score": 90},
+        {"url": "https://chips.example/nvidia", "text": OTHER, "score": 70},
+    ]
+    result = deduplicate_documents(documents)
+    assert [doc["url"] for doc in result] == ["https://news.example/story", "https://chips.example/nvidia"]
+    assert result[0]["sources"] == ["https://news.example/story", "https://blog.example/copy"]
+    assert result[0]["text"] == STORY
+    assert result[1]["sources"] == ["https://chips.example/nvidia"]
+
+
+def test_repeated_paragraph_is_dropped_and_attributed():
+    documents = [
+        {"url": "https://a.example/1", "text": f"{STORY}\n{SHARED}"},
+        {"url": "https://b.example/2", "text": f"{OTHER}\n{SHARED}"},
+    ]
+    first, second = deduplicate_documents(documents)
+    assert first["paragraphs"][-1] == {"text": SHARED, "sources": ["https://a.example/1", "https://b.example/2"]}
+    assert first["dropped_paragraphs"] == 0
+    assert second["dropped_paragraphs"] == 1
+    assert SHARED not in second["text"]
+    assert second["text"] == OTHER
+
+
+def test_short_paragraphs_are_kept():
+    documents = [
+        {"url": "https://a.example/1", "text": f"{STORY}\nRead more."},
+        {"url": "https://b.example/2", "text": f"{OTHER}\nRead more."},
+    ]
+    assert [doc["dropped_paragraphs"] for doc in deduplicate_documents(documents)] == [0, 0]
+
+
+def test_near_duplicate_pairs_match_exact_jaccard():
+    texts = [STORY, STORY.replace("Tuesday", "Wednesday"), OTHER, SHARED, ""]
+    shingles = [shingle_set(text) for text in texts]
+    pairs = near_duplicate_pairs(shingles, 0.5)
+    assert (0, 1) in pairs
+    assert all(jaccard(shingles[first], shingles[second]) >= 0.5 for first, second in pairs)
+    assert not any(4 in pair for pair in pairs)
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from ai_news_agents.tools.domain_reputation import (DEFAULT_HIGH_CREDIBILITY_DOMAINS, DomainReputationIndex,
+                                                    get_reputation_index, set_reputation_index)
+
+
+@pytest.fixture
+def index():
+    index = DomainReputationIndex()
+    index.update([
+        ("reuters.com", "high", "established_media"),
+        ("WWW.Example.org.", "medium", "blog"),
+        ("news.example.org", "high", "established_media"),
+    ])
+    return index
+
+
+def test_lookup_matches_whole_label_suffixes(index):
+    assert index.lookup("reuters.com") == ("reuters.com", "high", "established_media")
+    assert index.lookup("www.uk.Reuters.com") == ("reuters.com", "high", "established_media")
+    assert index.lookup("notreuters.com") is None
+    assert index.lookup("reuters.com.evil.io") is None
+    assert index.lookup("example.org") == ("example.org", "medium", "blog")
+
+
+def test_lookup_prefers_most_specific_entry(index):
+    assert index.lookup("live.news.example.org") == ("news.example.org", "high", "established_media")
+    assert index.lookup("blog.example.org") == ("example.org", "medium", "blog")
+
+
+def test_save_load_round_trip(tmp_path, index):
+    path = str(tmp_path / "reputation.idx")
+    index.save(path)
+    loaded = DomainReputationIndex.load(path)
+    assert len(loaded) == len(index)
+    assert loaded.version == index.version
+    for host in ("reuters.com", "a.news.example.org", "example.org", "unknown.net"):
+        assert loaded.lookup(host) == index.lookup(host)
+
+
+def test_version_follows_contents(tmp_path, index):
+    path = str(tmp_path / "reputation.idx")
+    index.save(path)
+    loaded = DomainReputationIndex.load(path)
+    loaded.add("apnews.com", "high", "established_media")
+    index.add("apnews.com", "high", "established_media")
+    assert loaded.version == index.version
+    loaded.add("apnews.com", "low", "blog")
+    assert loaded.version != index.version
+    loaded.add("apnews.com", "high", "established_media")
+    assert loaded.version == index.version
+
+
+def test_load_rejects_malformed_index(tmp_path):
+    path = tmp_path / "bad.idx"
+    path.write_text(json.dumps({"format": "ai-news-reputation/2", "tiers": ["high"], "types": ["blog"],
+                                "domains": ["a.com"], "codes": [1, 0]}))
+    with pytest.raises(ValueError):
+        DomainReputationIndex.load(str(path))
+
+
+def test_compiled_index_keeps_builtin_domains(tmp_path, monkeypatch, index):
+    path = str(tmp_path / "reputation.idx")
+    index.save(path)
+    monkeypatch.setenv("AI_NEWS_REPUTATION_LIST", path)
+    set_reputation_index(None)
+    try:
+        loaded = get_reputation_index()
+        assert loaded.lookup("example.org") == ("example.org", "medium", "blog")
+        assert all(domain in loaded for domain in DEFAULT_HIGH_CREDIBILITY_DOMAINS)
+    finally:
+        set_reputation_index(None)
+
+
+def test_text_list_is_compiled_and_reused(tmp_path):
+    listing = tmp_path / "reputation.txt"
+    listing.write_text("# domain, tier, type\nexample.org medium blog\nshady.biz,low\n")
+    built = DomainReputationIndex.from_file(str(listing))
+    assert (tmp_path / "reputation.txt.idx").exists()
+    reused = DomainReputationIndex.from_file(str(listing))
+    assert reused.version == built.version
+    assert reused.lookup("shady.biz") == ("shady.biz", "low", "established_media")
+    assert "bbc.com" in reused
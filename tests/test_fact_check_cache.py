@@ -0,0 +1,59 @@
+import pytest
+
+from ai_news_agents.tools.fact_check_cache import FactCheckCache, normalize_url
+from ai_news_agents.tools.lexicon import LexiconScanner, set_lexicon_scanner
+
+RESULT = {"url": "https://example.com/a", "domain": "example.com", "credibility_score": 80}
+
+
+@pytest.fixture
+def scanner():
+    set_lexicon_scanner(LexiconScanner({"emotional": ["shocking"]}))
+    yield
+    set_lexicon_scanner(None)
+
+
+@pytest.fixture
+def cache(tmp_path, scanner):
+    cache = FactCheckCache(path=str(tmp_path / "fact_check.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_hit_for_another_spelling_of_the_url(cache):
+    cache.put("https://example.com/a", "text", RESULT)
+    result = cache.get("https://WWW.example.com/a/?utm_source=feed", "text")
+    assert result["credibility_score"] == 80
+    assert result["url"] == "https://WWW.example.com/a/?utm_source=feed"
+    assert result["domain"] == "www.example.com"
+    assert cache.get("https://example.com/a", "other text") is None
+
+
+def test_lexicon_change_invalidates_entries(tmp_path, cache):
+    cache.put("https://example.com/a", "text", RESULT)
+    old_version = cache.version
+    set_lexicon_scanner(LexiconScanner({"emotional": ["shocking", "outrageous"]}))
+    assert cache.get("https://example.com/a", "text") is None
+    assert cache.version != old_version
+
+    # Entries of the old version are gone from disk too
+    set_lexicon_scanner(LexiconScanner({"emotional": ["shocking"]}))
+    reopened = FactCheckCache(path=str(tmp_path / "fact_check.sqlite"))
+    try:
+        assert reopened.get("https://example.com/a", "text") is None
+    finally:
+        reopened.close()
+
+
+def test_entries_survive_reopening_with_same_version(tmp_path, cache):
+    cache.put("https://example.com/a", "text", RESULT)
+    reopened = FactCheckCache(path=str(tmp_path / "fact_check.sqlite"))
+    try:
+        assert reopened.get("https://example.com/a", "text")["credibility_score"] == 80
+        assert reopened.stats["disk_hits"] == 1
+    finally:
+        reopened.close()
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://www.Example.com:443/a/?b=2&utm_medium=x&a=1#top") == "https://example.com/a?a=1&b=2"
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from ai_news_agents.cache import JsonDiskCache
+from ai_news_agents.fetcher import ConcurrentFetcher
+
+
+class _Response:
+    status_code = 200
+    headers = {"Content-Type": "text/html"}
+    encoding = "utf-8"
+    text = "<p>ok</p>"
+
+
+def test_per_host_limit_is_shared_across_calls(tmp_path):
+    fetcher = ConcurrentFetcher(per_host_limit=1, response_cache=JsonDiskCache("http", root=str(tmp_path)))
+    active = peak = 0
+    lock = threading.Lock()
+
+    def get(url, headers, timeout):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return _Response()
+
+    fetcher.session.get = get
+    results = []
+    callers = [threading.Thread(target=lambda n=n: results.extend(fetcher.fetch([f"https://example.com/{n}"])))
+               for n in range(3)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+    fetcher.close()
+    assert peak == 1
+    assert sorted(result["status"] for result in results) == [200, 200, 200]
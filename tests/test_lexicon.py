@@ -0,0 +1,52 @@
+import pytest
+
+from ai_news_agents.tools.lexicon import LexiconScanner
+
+
+@pytest.fixture
+def scanner():
+    return LexiconScanner({
+        "emotional": ["shocking", "critics say"],
+        "attribution": ["according to", "source:"],
+        "balance": ["however", "critics say"],
+    })
+
+
+def test_counts_and_offsets(scanner):
+    text = "Shocking news.  According  to insiders, critics say so. However..."
+    result = scanner.scan(text)
+    assert result["counts"] == {"emotional": 2, "attribution": 1, "balance": 2}
+    start, end, phrase = result["matches"]["attribution"][0]
+    assert phrase == "according to"
+    assert text[start:end] == "According  to"
+
+
+def test_matches_whole_words_only(scanner):
+    assert scanner.scan("unshockingly, howeverish")["counts"] == {"emotional": 0, "attribution": 0, "balance": 0}
+
+
+def test_non_word_phrases_match_anywhere(scanner):
+    assert scanner.scan("Source: Reuters")["counts"]["attribution"] == 1
+
+
+@pytest.mark.parametrize("text", [
+    "İstanbul: crıtics say",
+    "İSTANBUL ſhocking",
+    "İ" * 10,
+])
+def test_length_changing_lowercase_does_not_crash(scanner, text):
+    result = scanner.scan(text)
+    assert result["counts"]["emotional"] == 0
+
+
+def test_offsets_survive_length_changing_lowercase(scanner):
+    text = "İstanbul: Critics say it is SHOCKING"
+    result = scanner.scan(text)
+    assert [text[start:end] for start, end, _ in result["matches"]["emotional"]] == ["Critics say", "SHOCKING"]
+
+
+def test_version_depends_on_phrases(scanner):
+    same = LexiconScanner({"emotional": ["Shocking", "critics  say"], "attribution": ["according to", "source:"],
+                           "balance": ["however", "critics say"]})
+    assert scanner.version == same.version
+    assert scanner.version != LexiconScanner({"emotional": ["shocking"]}).version
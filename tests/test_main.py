@@ -0,0 +1,18 @@
+import pytest
+
+from ai_news_agents.main import command_args
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (["main.py", "batch", "a,b", "--concurrency", "2"], ["a,b", "--concurrency", "2"]),
+    (["/venv/bin/batch", "a,b", "--concurrency", "2"], ["a,b", "--concurrency", "2"]),
+    (["/venv/bin/batch"], []),
+])
+def test_command_args(monkeypatch, argv, expected):
+    monkeypatch.setattr("sys.argv", argv)
+    assert command_args("batch") == expected
+
+
+def test_run_aliases(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["/venv/bin/run_crew", "--stream"])
+    assert command_args("run", "run_crew", "ai_news_agents") == ["--stream"]
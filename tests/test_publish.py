@@ -0,0 +1,47 @@
+import re
+
+import pytest
+
+from ai_news_agents.publish import _Renderer, report_title
+
+
+def render(text):
+    return _Renderer("").document(text, "Report").split("<body>", 1)[1]
+
+
+@pytest.mark.parametrize("url", [
+    "javascript:alert(1)",
+    "JavaScript:alert(1)",
+    "&#106;avascript:alert(1)",
+    "&#106avascript:alert(1)",
+    "&#x6A;avascript:alert(1)",
+    "&#X6a;ava&#x09;script:alert(1)",
+    "java&#10;script:alert(1)",
+    "&Tab;javascript:alert(1)",
+    "jav&#x61;script&colon;alert(1)",
+    "vbscript:msgbox(1)",
+    "file:///etc/passwd",
+    "data:text/html,<script>alert(1)</script>",
+])
+def test_unsafe_link_and_image_urls_are_dropped(url):
+    body = render(f"[link]({url}) ![image]({url})")
+    assert "href=" not in body
+    assert "src=" not in body
+
+
+@pytest.mark.parametrize("url", ["https://example.org/a?b=1&amp;c=2", "http://x.org", "mailto:a@b.org",
+                                 "/relative/path", "#section"])
+def test_safe_urls_are_kept(url):
+    body = render(f"[link]({url})")
+    assert re.search(r'<a href="[^"]+">link</a>', body)
+
+
+def test_raw_html_is_escaped():
+    body = render('<script>alert(1)</script>\n\nText <img src=x onerror=alert(1)> here')
+    assert "<script>" not in body and "<img" not in body
+    assert "&lt;script&gt;" in body
+
+
+def test_report_title():
+    assert report_title("intro\n# **Big** News\n\ntext", "news/x.md") == "Big News"
+    assert report_title("no heading", "news/2026-01-01_ai_news_report.md") == "2026-01-01_ai_news_report"
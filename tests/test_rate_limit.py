@@ -0,0 +1,99 @@
+import pytest
+import requests
+
+from ai_news_agents.http_utils import parse_retry_after
+from ai_news_agents.rate_limit import THROTTLE_FACTOR, ProviderLimiter, TokenBucket, parse_rate_limits
+
+
+def http_error(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return requests.HTTPError(f"HTTP {status}", response=response)
+
+
+def test_token_bucket_refills_at_configured_rate():
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    start = bucket._updated
+    bucket.take(2, now=start)
+    assert bucket.wait_time(1, now=start) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now=start + 0.5) == pytest.approx(0.5)
+    assert bucket.wait_time(1, now=start + 1.0) == pytest.approx(0.0)
+    # Never fills beyond its capacity, and oversized requests wait for a full bucket
+    assert bucket.wait_time(5, now=start + 100.0) == 0.0
+    bucket.take(5, now=start + 100.0)
+    assert bucket.level == 0.0
+
+
+def test_token_bucket_adjust_and_drain():
+    bucket = TokenBucket(per_minute=600, capacity=10)
+    bucket.adjust(4)
+    assert bucket.level == 6
+    bucket.adjust(-20)
+    assert bucket.level == 10
+    bucket.drain(now=bucket._updated)
+    assert bucket.level == 0.0
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("OpenAI=500rpm:200000tpm, serper=300 rpm,,bad") == {
+        "openai": {"requests_per_minute": 500.0, "tokens_per_minute": 200000.0},
+        "serper": {"requests_per_minute": 300.0},
+        "bad": {},
+    }
+    assert parse_rate_limits("") == {}
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("3600") == 30.0
+    assert parse_retry_after("soon", 1.0) == 1.0
+    assert parse_retry_after(None, 4.0) == 4.0
+
+
+def test_call_retries_after_429():
+    limiter = ProviderLimiter("test", requests_per_minute=6000, retries=2)
+    attempts = []
+
+    def flaky():
+        attempts.append(len(attempts))
+        if len(attempts) < 3:
+            raise http_error(429, "0.01")
+        return "ok"
+
+    assert limiter.call(flaky) == "ok"
+    assert len(attempts) == 3
+    assert limiter.stats["throttled"] == 2
+    assert limiter.stats["retries"] == 2
+    assert limiter.stats["failed"] == 0
+    assert limiter.requests.factor == pytest.approx(THROTTLE_FACTOR ** 2 + 0.1)
+
+
+def test_call_gives_up_after_retries():
+    limiter = ProviderLimiter("test", retries=1)
+    calls = []
+
+    def always_throttled():
+        calls.append(1)
+        raise http_error(429, "0.01")
+
+    with pytest.raises(requests.HTTPError):
+        limiter.call(always_throttled)
+    assert len(calls) == 2
+    assert limiter.stats["failed"] == 1
+
+
+def test_call_does_not_retry_other_errors():
+    limiter = ProviderLimiter("test")
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise http_error(500)
+
+    with pytest.raises(requests.HTTPError):
+        limiter.call(broken)
+    assert len(calls) == 1
+    assert limiter.stats["throttled"] == 0
@@ -0,0 +1,75 @@
+import pytest
+
+from ai_news_agents.report_stream import ReportTask
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # crewAI makes output files relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def report_task(output_file, **fields):
+    return ReportTask(condition=lambda output: True, description="Write the report",
+                      expected_output="A report", output_file=output_file, **fields)
+
+
+def test_saved_callback_gets_the_written_file(workdir):
+    saved = []
+    task = report_task("news/template.md", saved_callback=lambda path, report: saved.append((path, report)))
+    run = task.copy([], {})
+    run.output_file = "jobs/1/report.md"
+    run._save_file("# Report")
+    assert saved == [("jobs/1/report.md", "# Report")]
+    assert (workdir / "jobs" / "1" / "report.md").read_text(encoding="utf-8") == "# Report"
+
+
+def test_saved_callback_skipped_when_write_fails(workdir):
+    (workdir / "blocked").write_text("not a directory")
+    saved = []
+    task = report_task("blocked/report.md", saved_callback=lambda path, report: saved.append(path))
+    with pytest.raises(Exception):
+        task._save_file("# Report")
+    assert saved == []
+
+
+def test_dict_result_is_saved_as_json(workdir):
+    task = report_task("news/report.json")
+    task._save_file({"title": "Überblick", "items": [1, 2]})
+    assert (workdir / "news" / "report.json").read_text(encoding="utf-8") == (
+        '{\n  "title": "Überblick",\n  "items": [\n    1,\n    2\n  ]\n}')
+
+
+def test_missing_directory_needs_create_directory(workdir):
+    saved = []
+    task = report_task("news/report.md", create_directory=False, saved_callback=lambda path, report: saved.append(path))
+    with pytest.raises(RuntimeError):
+        task._save_file("# Report")
+    assert not (workdir / "news").exists()
+    assert saved == []
+    (workdir / "news").mkdir()
+    task._save_file("# Report")
+    assert (workdir / "news" / "report.md").read_text(encoding="utf-8") == "# Report"
+
+
+def test_home_directory_is_expanded(workdir, monkeypatch):
+    monkeypatch.setenv("HOME", str(workdir / "home"))
+    task = report_task("report.md")
+    task.output_file = "~/news/report.md"
+    task._save_file("# Report")
+    assert (workdir / "home" / "news" / "report.md").read_text(encoding="utf-8") == "# Report"
+
+
+def test_streamed_report_replaces_partial_file(workdir):
+    chunks = []
+    task = report_task("news/report.md", stream_callback=chunks.append)
+    task.interpolate_inputs_and_add_conversation_history({"topic": "AI"})
+    task.stream_chunk("Thought: done\nFinal Answer: # Rep")
+    task.stream_chunk("ort\nBody")
+    partial = (workdir / "news" / "report.md.partial").read_text(encoding="utf-8")
+    assert partial.endswith("# Report\nBody")
+    task._save_file("# Report\nBody")
+    assert (workdir / "news" / "report.md").read_text(encoding="utf-8") == "# Report\nBody"
+    assert not (workdir / "news" / "report.md.partial").exists()
+    assert "".join(chunks) == "# Report\nBody"
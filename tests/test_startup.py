@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+
+def test_importing_main_does_not_load_crewai():
+    # The CLI only pays for crewAI once a command needs a crew
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")])))
+    code = (
+        "import sys, ai_news_agents.main; "
+        "print(','.join(name for name in ('crewai', 'crewai_tools', 'litellm') if name in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""